@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import chunked
+import cube
+import hll
+import model
+import sections
+import storage
+import synthetic
+import time_index
+
+# Benchmark perhitungan dashboard: load dataset, filter tanggal dan agregasi setiap bagian, dengan waktu
+# (minimum dari beberapa pengulangan) dan puncak alokasi memori (tracemalloc, diukur pada satu putaran terpisah
+# agar tidak memperlambat pengukuran waktu). Hasil disimpan sebagai JSON untuk dibandingkan antar versi.
+
+# Batas rasio waktu terhadap baseline yang dianggap regresi
+DEFAULT_THRESHOLD = 1.2
+
+
+# Menjalankan fungsi `repeat` kali dan mengukur waktunya, lalu sekali lagi dengan tracemalloc
+def measure(func, repeat=3, trace_memory=True):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    del result
+
+    peak_mb = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return {'seconds': min(times), 'mean_seconds': float(np.mean(times)), 'repeat': repeat, 'peak_memory_mb': peak_mb}
+
+
+# Memuat dataset seperti dashboard: kolom dashboard dan model, ID dikodekan dan terurut berdasarkan waktu
+def load_dataset(path):
+    df = storage.read_columns(path, storage.BUILD_COLUMNS)
+    df, _ = storage.encode_ids(df)
+    return time_index.sort_by_time(df)
+
+
+# Rentang tanggal yang di-benchmark: seluruh dataset dan satu kuartal di tengahnya
+def date_ranges(df):
+    first = df['order_purchase_timestamp'].iloc[0].normalize()
+    last = df['order_purchase_timestamp'].iloc[-1].normalize()
+    middle = first + (last - first) / 2
+    return {
+        'full': (first.date(), last.date()),
+        'quarter': (middle.normalize().date(), (middle + pd.Timedelta(days=90)).normalize().date()),
+    }
+
+
+# Menjalankan semua benchmark untuk satu file dataset
+def run(path, repeat=3, trace_memory=True):
+    results = {}
+
+    results['load'] = measure(lambda: load_dataset(path), repeat, trace_memory)
+    df = load_dataset(path)
+    results['model'] = measure(lambda: model.build_model(df), repeat, trace_memory)
+    data_model = model.build_model(df)
+    cube_options = {'hll_precision': hll.precision_for_error(0.01)}
+    results['cube'] = measure(lambda: cube.build_cube(df, data_model, **cube_options), repeat, trace_memory)
+    daily_cube = cube.build_cube(df, data_model, **cube_options)
+
+    for range_name, (start_date, end_date) in date_ranges(df).items():
+        results[f'filter.{range_name}'] = measure(
+            lambda: time_index.slice_range(df, start_date, end_date), repeat, trace_memory
+        )
+        for name, section in sections.SECTIONS.items():
+            results[f'section.{name}.{range_name}'] = measure(
+                lambda: section(df, data_model, daily_cube, start_date, end_date), repeat, trace_memory
+            )
+        results[f'section.distribution_approx.{range_name}'] = measure(
+            lambda: sections.distribution(df, data_model, daily_cube, start_date, end_date, distinct='approx'),
+            repeat, trace_memory
+        )
+
+    return {
+        'meta': metadata(path, df),
+        'results': results,
+    }
+
+
+# Informasi lingkungan dan dataset agar hasil antar versi dapat dibandingkan
+def metadata(path, df):
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=storage.CURRENT_DIR
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'dataset': os.path.abspath(path),
+        'rows': len(df),
+        'orders': int(df['order_id'].nunique()),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'rss_mb': chunked.current_memory_mb(),
+    }
+
+
+# Membandingkan hasil dengan baseline: benchmark yang waktunya lebih dari threshold x baseline dianggap regresi
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    rows = []
+    for name, current in results['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        ratio = current['seconds'] / previous['seconds'] if previous['seconds'] > 0 else float('inf')
+        rows.append({'name': name, 'baseline': previous['seconds'], 'current': current['seconds'],
+                     'ratio': ratio, 'regression': ratio > threshold})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark perhitungan dashboard dengan dataset Olist sintetis")
+    parser.add_argument('--data', default=None, help="Dataset yang di-benchmark (default: dibangkitkan dengan --rows)")
+    parser.add_argument('--rows', type=float, nargs='+', default=[1e5],
+                        help="Ukuran dataset sintetis (mis. 1e5 1e6 1e7)")
+    parser.add_argument('--data-dir', default=os.path.join(storage.CURRENT_DIR, 'build', 'benchmark'),
+                        help="Direktori dataset sintetis (dipakai ulang jika sudah ada)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help="Tanpa pengukuran memori (tracemalloc)")
+    parser.add_argument('--out', default=None, help="Path file JSON hasil benchmark")
+    parser.add_argument('--baseline', default=None, help="File JSON hasil versi sebelumnya untuk perbandingan")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.data:
+        paths = [args.data]
+    else:
+        os.makedirs(args.data_dir, exist_ok=True)
+        paths = []
+        for rows in args.rows:
+            path = os.path.join(args.data_dir, f"synthetic_{int(rows)}_{args.seed}.parquet")
+            if not os.path.exists(path):
+                print(f"Membangkitkan dataset sintetis {int(rows):,} baris ...", file=sys.stderr)
+                synthetic.generate(int(rows), path, seed=args.seed)
+            paths.append(path)
+
+    runs = []
+    for path in paths:
+        print(f"Benchmark {path}", file=sys.stderr)
+        result = run(path, args.repeat, not args.no_memory)
+        for name, timing in result['results'].items():
+            memory = f", memori {timing['peak_memory_mb']:8.1f} MB" if timing['peak_memory_mb'] is not None else ""
+            print(f"{name:40s} {timing['seconds'] * 1000:10.1f} ms{memory}", file=sys.stderr)
+        runs.append(result)
+
+    output = {'runs': runs}
+    text = json.dumps(output, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        # Hasil dibandingkan per ukuran dataset (jumlah baris yang sama)
+        baseline_runs = {run['meta']['rows']: run for run in baseline['runs']}
+        regressions = 0
+        for result in runs:
+            previous = baseline_runs.get(result['meta']['rows'])
+            if previous is None:
+                continue
+            for row in compare(result, previous, args.threshold):
+                marker = " REGRESI" if row['regression'] else ""
+                print(f"{row['name']:40s} {row['baseline'] * 1000:10.1f} -> {row['current'] * 1000:10.1f} ms "
+                      f"({row['ratio']:.2f}x){marker}", file=sys.stderr)
+                regressions += row['regression']
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
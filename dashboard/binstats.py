@@ -0,0 +1,47 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# Statistik per bin (jumlah, rata-rata, varians, standard error dan confidence interval)
+# yang dihitung dengan akumulasi bincount, tanpa groupby/apply per bin.
+# Kode bin dibuat dengan cube.bucket_codes.
+
+
+# Nilai tengah setiap bin
+def bin_midpoints(bins):
+    bins = np.asarray(bins, dtype='float64')
+    return (bins[:-1] + bins[1:]) / 2
+
+
+# Statistik per bin dari kode bin dan nilainya.
+# weights berisi jumlah baris untuk data berbentuk (nilai, jumlah) seperti rollup cube; varians memakai ddof=1.
+# Mengembalikan DataFrame dengan index 0..n_bins-1; bin tanpa data memiliki count 0 dan statistik NaN.
+def binned_stats(codes, values, weights=None, n_bins=None, confidence=0.95):
+    codes = np.asarray(codes, dtype='int64')
+    values = np.asarray(values, dtype='float64')
+    weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype='float64')
+    if n_bins is None:
+        n_bins = int(codes.max()) + 1 if len(codes) else 0
+
+    valid = (codes >= 0) & (codes < n_bins) & ~np.isnan(values)
+    codes, values, weights = codes[valid], values[valid], weights[valid]
+
+    count = np.bincount(codes, weights=weights, minlength=n_bins)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.bincount(codes, weights=weights * values, minlength=n_bins) / count
+        # Varians dihitung dari simpangan terhadap rata-rata bin agar stabil secara numerik
+        squared = np.bincount(codes, weights=weights * (values - mean[codes]) ** 2, minlength=n_bins)
+        var = np.where(count > 1, squared / (count - 1), np.nan)
+        se = np.sqrt(var / count)
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return pd.DataFrame({
+        'count': count.astype('int64'),
+        'mean': mean,
+        'var': var,
+        'std': np.sqrt(var),
+        'se': se,
+        'ci_low': mean - z * se,
+        'ci_high': mean + z * se,
+    }, index=pd.RangeIndex(n_bins, name='bin'))
@@ -0,0 +1,271 @@
+import argparse
+import json
+import os
+import time
+
+import pandas as pd
+
+import storage
+
+# Lokasi default dataset mentah dan tabel staging hasil build
+DATA_DIR = os.path.join(storage.CURRENT_DIR, "..", "data")
+STAGING_DIR = os.path.join(storage.CURRENT_DIR, "build")
+PARAMS_FILE = "build_params.json"
+
+# ===== SKEMA DATASET MENTAH =====
+# Setiap tabel dibaca dengan dtype yang sudah ditentukan dan kunci yang menjadi index staging
+RAW_TABLES = {
+    'orders': {
+        'file': 'orders_dataset.csv',
+        'key': ['order_id'],
+        'dtype': {'order_id': 'str', 'customer_id': 'str', 'order_status': 'category'},
+        'dates': ['order_purchase_timestamp', 'order_approved_at', 'order_delivered_carrier_date',
+                  'order_delivered_customer_date', 'order_estimated_delivery_date'],
+    },
+    'order_items': {
+        'file': 'order_items_dataset.csv',
+        'key': ['order_id', 'order_item_id'],
+        'dtype': {'order_id': 'str', 'order_item_id': 'int16', 'product_id': 'str', 'seller_id': 'str',
+                  'price': 'float64', 'freight_value': 'float64'},
+        'dates': ['shipping_limit_date'],
+    },
+    'customers': {
+        'file': 'customers_dataset.csv',
+        'key': ['customer_id'],
+        'dtype': {'customer_id': 'str', 'customer_unique_id': 'str', 'customer_zip_code_prefix': 'int32',
+                  'customer_city': 'category', 'customer_state': 'category'},
+        'dates': [],
+    },
+    'products': {
+        'file': 'products_dataset.csv',
+        'key': ['product_id'],
+        'dtype': {'product_id': 'str', 'product_category_name': 'str', 'product_name_lenght': 'float32',
+                  'product_description_lenght': 'float32', 'product_photos_qty': 'float32',
+                  'product_weight_g': 'float32', 'product_length_cm': 'float32',
+                  'product_height_cm': 'float32', 'product_width_cm': 'float32'},
+        'dates': [],
+    },
+    'category_translation': {
+        'file': 'product_category_name_translation.csv',
+        'key': ['product_category_name'],
+        'dtype': {'product_category_name': 'str', 'product_category_name_english': 'str'},
+        'dates': [],
+    },
+    'sellers': {
+        'file': 'sellers_dataset.csv',
+        'key': ['seller_id'],
+        'dtype': {'seller_id': 'str', 'seller_zip_code_prefix': 'int32', 'seller_city': 'category',
+                  'seller_state': 'category'},
+        'dates': [],
+    },
+    'payments': {
+        'file': 'order_payments_dataset.csv',
+        'key': ['order_id', 'payment_sequential'],
+        'dtype': {'order_id': 'str', 'payment_sequential': 'int16', 'payment_type': 'category',
+                  'payment_installments': 'int16', 'payment_value': 'float64'},
+        'dates': [],
+    },
+    'reviews': {
+        'file': 'order_reviews_dataset.csv',
+        'key': ['review_id', 'order_id'],
+        'dtype': {'review_id': 'str', 'order_id': 'str', 'review_score': 'float32',
+                  'review_comment_title': 'str', 'review_comment_message': 'str'},
+        'dates': ['review_creation_date', 'review_answer_timestamp'],
+    },
+}
+
+# Tabel yang bisa ditambahkan secara inkremental (berkaitan dengan pesanan)
+ORDER_TABLES = ['orders', 'order_items', 'customers', 'payments', 'reviews']
+
+# Kolom yang dibuang setelah merge (sama seperti di notebook)
+DROP_COLUMNS = ["order_item_id", "customer_id", "review_id"]
+
+# Pasangan kolom tanggal yang diimputasi berurutan: (kolom acuan, kolom yang diimputasi)
+DATE_IMPUTATION = [
+    ('order_purchase_timestamp', 'order_approved_at'),
+    ('order_approved_at', 'order_delivered_carrier_date'),
+    ('order_delivered_carrier_date', 'order_delivered_customer_date'),
+]
+
+# Kolom dimensi yang diimputasi dengan modus
+DIMENSION_COLUMNS = [
+    'product_weight_g', 'product_length_cm', 'product_height_cm', 'product_width_cm',
+    'product_name_lenght', 'product_description_lenght', 'product_photos_qty',
+    'price', 'freight_value',
+    'product_category_name', 'product_category_name_english',
+    'seller_zip_code_prefix', 'seller_city', 'seller_state'
+]
+
+
+# Membaca satu tabel CSV mentah sesuai skemanya
+def read_raw_table(name, path):
+    spec = RAW_TABLES[name]
+    return pd.read_csv(path, dtype=spec['dtype'], parse_dates=spec['dates'])
+
+
+# Membaca seluruh tabel mentah dari direktori data
+def load_raw(data_dir=DATA_DIR):
+    return {name: read_raw_table(name, os.path.join(data_dir, spec['file'])) for name, spec in RAW_TABLES.items()}
+
+
+# Melakukan merge seperti di notebook, tabel dimensi di-join melalui index kuncinya
+def merge_tables(tables):
+    products = tables['products'].join(
+        tables['category_translation'].set_index('product_category_name'),
+        on='product_category_name'
+    )
+
+    order_items = tables['order_items'].join(products.set_index('product_id'), on='product_id')
+    order_items = order_items.join(tables['sellers'].set_index('seller_id'), on='seller_id')
+
+    orders = tables['orders'].join(tables['customers'].set_index('customer_id'), on='customer_id')
+
+    merged = orders.merge(order_items, on='order_id', how='left')
+    merged = merged.merge(tables['reviews'], on='order_id', how='left')
+    merged = merged.merge(tables['payments'], on='order_id', how='left')
+
+    return merged.drop(DROP_COLUMNS, axis=1)
+
+
+# Menghitung parameter imputasi (rata-rata jarak antar tanggal dan modus kolom dimensi)
+def imputation_params(merged):
+    params = {'date_offsets_days': {}, 'modes': {}}
+
+    df = merged.copy()
+    for source, target in DATE_IMPUTATION:
+        mask = df[source].notna() & df[target].notna()
+        time_diff = df.loc[mask, target] - df.loc[mask, source]
+        avg_days = time_diff.dt.total_seconds().mean() / (60 * 60 * 24)
+        params['date_offsets_days'][target] = avg_days
+        # Imputasi berurutan karena kolom berikutnya bergantung pada hasil imputasi sebelumnya
+        missing_mask = df[target].isna() & df[source].notna()
+        df.loc[missing_mask, target] = df.loc[missing_mask, source] + pd.Timedelta(days=avg_days)
+
+    for column in DIMENSION_COLUMNS:
+        mode_value = df[column].mode().iloc[0]
+        params['modes'][column] = mode_value.item() if hasattr(mode_value, 'item') else mode_value
+
+    return params
+
+
+# Mengisi nilai kosong dengan parameter imputasi
+def impute(merged, params):
+    df = merged.copy()
+    for source, target in DATE_IMPUTATION:
+        avg_days = params['date_offsets_days'][target]
+        missing_mask = df[target].isna() & df[source].notna()
+        df.loc[missing_mask, target] = df.loc[missing_mask, source] + pd.Timedelta(days=avg_days)
+
+    for column, mode_value in params['modes'].items():
+        if isinstance(df[column].dtype, pd.CategoricalDtype) and mode_value not in df[column].cat.categories:
+            df[column] = df[column].cat.add_categories([mode_value])
+        df[column] = df[column].fillna(mode_value)
+    return df
+
+
+# Menyimpan tabel mentah ke staging (Parquet) agar update berikutnya tidak membaca CSV lagi
+def write_staging(tables, params, staging_dir=STAGING_DIR):
+    os.makedirs(staging_dir, exist_ok=True)
+    for name, df in tables.items():
+        df.to_parquet(os.path.join(staging_dir, f"{name}.parquet"), index=False)
+    with open(os.path.join(staging_dir, PARAMS_FILE), 'w') as f:
+        json.dump(params, f, indent=2)
+
+
+def read_staging(staging_dir=STAGING_DIR):
+    tables = {name: pd.read_parquet(os.path.join(staging_dir, f"{name}.parquet")) for name in RAW_TABLES}
+    with open(os.path.join(staging_dir, PARAMS_FILE)) as f:
+        params = json.load(f)
+    return tables, params
+
+
+# Membangun dataset dashboard dari awal
+def build(data_dir=DATA_DIR, out_path=storage.PARQUET_PATH, staging_dir=STAGING_DIR, csv_path=None):
+    tables = load_raw(data_dir)
+    merged = merge_tables(tables)
+    params = imputation_params(merged)
+    final_df = impute(merged, params)
+
+    write_staging(tables, params, staging_dir)
+    storage.write_dataset(final_df, out_path)
+    if csv_path:
+        final_df.to_csv(csv_path)
+    return final_df
+
+
+# Mengganti baris lama dengan baris baru berdasarkan kunci tabel
+def upsert(table, delta, key):
+    existing = pd.MultiIndex.from_frame(table[key])
+    incoming = pd.MultiIndex.from_frame(delta[key])
+    kept = table[~existing.isin(incoming)]
+    return pd.concat([kept, delta[table.columns]], ignore_index=True)
+
+
+# Menambahkan data pesanan/pembayaran/review baru tanpa me-merge ulang seluruh tabel
+def update(deltas, out_path=storage.PARQUET_PATH, staging_dir=STAGING_DIR):
+    tables, params = read_staging(staging_dir)
+
+    affected_orders = set()
+    affected_customers = set()
+    for name, delta in deltas.items():
+        tables[name] = upsert(tables[name], delta, RAW_TABLES[name]['key'])
+        if 'order_id' in delta.columns:
+            affected_orders.update(delta['order_id'])
+        if name == 'customers':
+            affected_customers.update(delta['customer_id'])
+
+    # Pesanan milik pelanggan yang datanya berubah juga perlu dibangun ulang
+    if affected_customers:
+        orders = tables['orders']
+        affected_orders.update(orders.loc[orders['customer_id'].isin(affected_customers), 'order_id'])
+
+    # Hanya baris milik pesanan yang terdampak yang di-merge ulang
+    subset = dict(tables)
+    for name in ['orders', 'order_items', 'payments', 'reviews']:
+        subset[name] = tables[name][tables[name]['order_id'].isin(affected_orders)]
+    subset['customers'] = tables['customers'][tables['customers']['customer_id'].isin(subset['orders']['customer_id'])]
+    new_rows = impute(merge_tables(subset), params)
+
+    existing = storage.read_dataset(out_path)
+    existing = existing[~existing['order_id'].isin(affected_orders)]
+    final_df = pd.concat([existing, storage.apply_schema(new_rows)[existing.columns]], ignore_index=True)
+
+    write_staging({name: tables[name] for name in deltas}, params, staging_dir)
+    storage.write_dataset(final_df, out_path)
+    return final_df, len(affected_orders)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build dataset dashboard dari CSV Olist")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    full_parser = subparsers.add_parser('full', help="Merge seluruh tabel dari awal")
+    full_parser.add_argument('--data-dir', default=DATA_DIR, help="Direktori CSV mentah")
+    full_parser.add_argument('--csv', default=None, help="Juga menyimpan hasil sebagai clean_data.csv")
+
+    update_parser = subparsers.add_parser('update', help="Menambahkan baris baru berdasarkan kunci")
+    for name in ORDER_TABLES:
+        update_parser.add_argument(f"--{name.replace('_', '-')}", dest=name, default=None,
+                                   help=f"CSV berisi baris {name} baru/berubah")
+
+    for sub in (full_parser, update_parser):
+        sub.add_argument('--out', default=storage.PARQUET_PATH, help="Path dataset Parquet")
+        sub.add_argument('--staging-dir', default=STAGING_DIR, help="Direktori tabel staging")
+
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+
+    if args.command == 'full':
+        final_df = build(args.data_dir, args.out, args.staging_dir, args.csv)
+        print(f"Build penuh selesai: {len(final_df):,} baris dalam {time.perf_counter() - start:.2f} s")
+    else:
+        deltas = {name: read_raw_table(name, getattr(args, name)) for name in ORDER_TABLES if getattr(args, name)}
+        if not deltas:
+            parser.error("Minimal satu file data baru harus diberikan")
+        final_df, order_count = update(deltas, args.out, args.staging_dir)
+        print(f"Update selesai: {order_count:,} pesanan dibangun ulang, total {len(final_df):,} baris "
+              f"dalam {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+import io
+from contextlib import contextmanager
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+from matplotlib.artist import setp
+from matplotlib.figure import Figure
+from matplotlib.ticker import FormatStrFormatter
+
+import time_buckets
+
+# Semua grafik dashboard dibuat dari data hasil agregasi dan dikembalikan sebagai PNG (bytes).
+# Figure dibuat langsung tanpa state global pyplot sehingga grafik dapat dirender bersamaan dari beberapa
+# thread (sesi Streamlit atau report.py) dan tidak menumpuk di proses server.
+# pyplot tidak diimpor sama sekali dan seaborn (beserta scipy) baru diimpor oleh grafik yang memakainya,
+# sehingga mengimpor modul ini tidak memperlambat start dashboard.
+
+# Pengaturan yang sama dengan st.pyplot
+PNG_DPI = 200
+
+
+# Figure untuk satu grafik; artist-nya dilepas di blok finally (juga saat grafik gagal dirender) sehingga memori
+# figure tidak bergantung pada kapan referensinya dibuang
+@contextmanager
+def figure(*args, figsize=None, **kwargs):
+    fig = Figure(figsize=figsize)
+    try:
+        yield fig, fig.subplots(*args, **kwargs)
+    finally:
+        fig.clear()
+
+
+# Menyimpan figure sebagai PNG
+def to_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=PNG_DPI, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+# ===== METRIK DISTRIBUSI =====
+def bar_chart(series, rotation=0, ha='center'):
+    with figure(figsize=(10, 6)) as (fig, ax):
+        series.plot(kind='bar', ax=ax)
+        setp(ax.get_xticklabels(), rotation=rotation, ha=ha)
+        fig.tight_layout()
+        return to_png(fig)
+
+
+# ===== KATEGORI PRODUK DENGAN PENJUALAN TERTINGGI =====
+def category_sales_chart(top_categories, max_sales):
+    with figure(figsize=(12, 8)) as (fig, ax):
+        # Membuat bar plot horizontal dengan warna gradien
+        bars = ax.barh(top_categories['product_category_name_english'],
+                       top_categories['payment_value'],
+                       color=matplotlib.colormaps['viridis'](np.linspace(0, 0.8, len(top_categories))))
+
+        # Menambahkan anotasi nilai pada setiap bar
+        for i, bar in enumerate(bars):
+            value = top_categories['payment_value'].iloc[i]
+            ax.text(value + (max_sales * 0.01),
+                    bar.get_y() + bar.get_height()/2,
+                    f'$ {value:,.2f}',
+                    va='center',
+                    fontweight='bold')
+
+        ax.set_title('15 Product Categories with Highest Sales', fontsize=16, pad=20)
+        ax.set_xlabel('Total Sales ($)', fontsize=12)
+        ax.set_ylabel('Product Category', fontsize=12)
+        ax.grid(axis='x', linestyle='--', alpha=0.7)
+        fig.tight_layout()
+        return to_png(fig)
+
+
+# ===== TREN PENJUALAN BULANAN =====
+def monthly_trend_chart(pivot_data, top_5_categories, granularity='month'):
+    with figure(figsize=(14, 8)) as (fig, ax):
+        # Plot setiap kategori dengan warna berbeda
+        for category in top_5_categories:
+            if category in pivot_data.columns:
+                ax.plot(pivot_data.index, pivot_data[category],
+                        marker='o', markersize=5,
+                        linewidth=2,
+                        label=category)
+
+        title, axis_label = time_buckets.TITLES[granularity]
+        ax.set_title(f'{title} Sales Trends for Top 5 Product Categories', fontsize=16, pad=20)
+        ax.set_xlabel(axis_label, fontsize=12)
+        ax.set_ylabel('Total Sales ($)', fontsize=12)
+        ax.legend(loc='upper left', bbox_to_anchor=(1, 1))
+        ax.grid(True, alpha=0.3)
+        setp(ax.get_xticklabels(), rotation=45)
+        fig.tight_layout()
+        return to_png(fig)
+
+
+# ===== BERAT PRODUK VS WAKTU PENGIRIMAN =====
+def weight_delivery_chart(weight_stats, overall_mean, correlation):
+    import seaborn as sns
+    with figure(figsize=(12, 8)) as (fig, ax):
+        # Membuat bar chart untuk rata-rata waktu pengiriman per kategori berat
+        sns.barplot(
+            x='weight_category',
+            y='mean_days',
+            data=weight_stats,
+            palette='YlOrRd',  # Palet warna kuning ke merah
+            hue='weight_category',
+            legend=False,
+            ax=ax
+        )
+
+        # Menambahkan error bar untuk menunjukkan variabilitas
+        ax.errorbar(
+            x=weight_stats.index,
+            y=weight_stats['mean_days'],
+            yerr=weight_stats['std_days'] / np.sqrt(weight_stats['count']),  # Standard error
+            fmt='none',
+            color='black',
+            capsize=5
+        )
+
+        # Menambahkan label nilai di atas bar
+        for i, row in enumerate(weight_stats.itertuples()):
+            ax.text(
+                i, row.mean_days + 0.5,
+                f'{row.mean_days:.1f} days',
+                ha='center',
+                fontweight='bold'
+            )
+            # Menambahkan jumlah produk di bawah label kategori
+            ax.text(
+                i, -1.5,
+                f'n = {row.count:,}',
+                ha='center',
+                fontsize=9
+            )
+
+        # Menambahkan referensi rata-rata keseluruhan
+        ax.axhline(y=overall_mean, color='navy', linestyle='--', alpha=0.7)
+        ax.text(
+            len(weight_stats) - 1, overall_mean + 0.7,
+            f'Rata-rata keseluruhan: {overall_mean:.1f} hari',
+            ha='right',
+            color='navy',
+            fontweight='bold',
+            bbox=dict(facecolor='white', alpha=0.8, boxstyle='round,pad=0.5')
+        )
+
+        # Menambahkan judul dan label
+        ax.set_xlabel('Berat Produk (kg)', fontsize=12)
+        ax.set_ylabel('Rata-rata Waktu Pengiriman (hari)', fontsize=12)
+
+        # Menambahkan catatan korelasi
+        fig.text(
+            0.02, 0.01,
+            f"Korelasi antara berat produk dan waktu pengiriman: {correlation:.3f}",
+            fontsize=10,
+            bbox=dict(facecolor='white', alpha=0.8)
+        )
+
+        fig.tight_layout()
+        return to_png(fig)
+
+
+# ===== WAKTU PENGIRIMAN VS SKOR REVIEW =====
+def delivery_review_chart(box_data, category_avg, review_by_delivery, overall_mean, correlation):
+    import seaborn as sns
+    # Membuat subplots dengan dua grafik: boxplot di atas dan line plot di bawah
+    with figure(2, 1, figsize=(14, 12), gridspec_kw={'height_ratios': [1, 1]}) as (fig, (ax1, ax2)):
+        # Membuat boxplot untuk menunjukkan distribusi review score berdasarkan kategori waktu pengiriman
+        boxes = ax1.bxp(
+            box_data,
+            positions=range(len(box_data)),
+            widths=0.8,
+            patch_artist=True,
+            medianprops={'color': 'black'},
+            flierprops={'marker': 'd'}
+        )
+        for box, color in zip(boxes['boxes'], sns.color_palette('viridis', len(box_data))):
+            box.set_facecolor(color)
+
+        # Menambahkan judul dan label pada boxplot
+        ax1.set_title('Distribusi Review Core berdasarkan Kategori Waktu Pengiriman', fontsize=16, pad=20)
+        ax1.set_xlabel('Kategori Waktu Pengiriman', fontsize=12)
+        ax1.set_ylabel('Review Score (1-5)', fontsize=12)
+        ax1.set_ylim(0.5, 5.5)
+        ax1.grid(axis='y', alpha=0.3)
+
+        # Menambahkan label rata-rata review score di atas setiap boxplot
+        for i, category in enumerate(category_avg.index):
+            ax1.text(
+                i,
+                5.3,
+                f'Rata-rata: {category_avg[category]:.2f}',
+                ha='center',
+                fontsize=10,
+                bbox=dict(facecolor='white', alpha=0.8, boxstyle='round,pad=0.5')
+            )
+
+        # Membuat line plot untuk menunjukkan tren review score berdasarkan waktu pengiriman
+        ax2.plot(
+            review_by_delivery['delivery_time_mid'],
+            review_by_delivery['mean'],
+            'o-',  # Gaya plot: garis dengan marker lingkaran
+            color='#3366cc',
+            linewidth=2,
+            markersize=8
+        )
+
+        # Menambahkan interval kepercayaan 95% (±1.96 SE) sebagai area berbayang pada line plot
+        ax2.fill_between(
+            review_by_delivery['delivery_time_mid'],
+            review_by_delivery['mean'] - 1.96 * review_by_delivery['se'],
+            review_by_delivery['mean'] + 1.96 * review_by_delivery['se'],
+            color='#3366cc',
+            alpha=0.2
+        )
+
+        # Menambahkan garis horizontal yang menunjukkan rata-rata keseluruhan review score
+        ax2.axhline(y=overall_mean, color='red', linestyle='--', alpha=0.7, label=f'Rata-rata keseluruhan: {overall_mean:.2f}')
+
+        # Menambahkan judul dan label pada line plot
+        ax2.set_title('Tren Ewview Score berdasarkan Waktu Pengiriman', fontsize=16, pad=20)
+        ax2.set_xlabel('Waktu Pengiriman (hari)', fontsize=12)
+        ax2.set_ylabel('Rata-rata Review Score', fontsize=12)
+        ax2.set_ylim(3.0, 5.0)  # Mengatur batas y-axis untuk fokus pada variasi yang relevan
+        ax2.grid(True, alpha=0.3)
+        ax2.legend()
+
+        # Menambahkan teks yang menunjukkan nilai korelasi di pojok kiri bawah grafik
+        ax2.text(
+            0.02, 0.05,
+            f'Correlation: {correlation:.3f}',
+            transform=ax2.transAxes,
+            fontsize=12,
+            bbox=dict(facecolor='white', alpha=0.8)
+        )
+
+        # Menambahkan scatter plot dengan ukuran titik sesuai jumlah pesanan
+        sizes = review_by_delivery['count'] / review_by_delivery['count'].max() * 100 + 20
+        scatter = ax2.scatter(
+            review_by_delivery['delivery_time_mid'],
+            review_by_delivery['mean'],
+            s=sizes,
+            alpha=0.5,
+            c=review_by_delivery['count'],
+            cmap='viridis',
+            edgecolor='black'
+        )
+
+        # Menambahkan color bar untuk menunjukkan hubungan warna dengan jumlah pesanan
+        cbar = fig.colorbar(scatter, ax=ax2)
+        cbar.set_label('Jumlah Pesanan', fontsize=10)
+
+        fig.tight_layout()
+        return to_png(fig)
+
+
+# ===== PENGARUH TARIF PENGIRIMAN TERHADAP KEPUASAN PELANGGAN =====
+def freight_review_chart(avg_ratings, order_counts, correlation):
+    import seaborn as sns
+    with figure(figsize=(12, 8)) as (fig, ax):
+        # Menyiapkan data untuk visualisasi bar chart
+        categories = list(avg_ratings.index)
+        bar_positions = np.arange(len(categories))
+        bar_width = 0.6
+
+        # Membuat gradasi warna dari merah ke hijau terbalik
+        colors = sns.color_palette("RdYlGn_r", len(categories))
+
+        # Membuat bar chart
+        bars = ax.bar(
+            bar_positions,
+            avg_ratings,
+            bar_width,
+            color=colors,
+            edgecolor='black',
+            linewidth=1.5,
+            alpha=0.8
+        )
+
+        # Menambahkan label nilai rata-rata review score di atas setiap bar
+        for i, bar in enumerate(bars):
+            height = bar.get_height()
+            ax.text(
+                bar.get_x() + bar.get_width()/2.,
+                height + 0.05,
+                f'{avg_ratings.iloc[i]:.1f}',
+                ha='center',
+                va='bottom',
+                fontsize=14,
+                fontweight='bold'
+            )
+
+            # Menambahkan jumlah pesanan di tengah setiap bar
+            ax.text(
+                bar.get_x() + bar.get_width()/2.,
+                height/2,
+                f'{order_counts.iloc[i]} orders',
+                ha='center',
+                va='center',
+                fontsize=12,
+                fontweight='bold',
+                color='black'
+            )
+
+        # Menambahkan judul dan label
+        ax.set_title('Pengaruh Tarif Pengiriman terhadap kepuasan pelanggan', fontsize=16, pad=20)
+        ax.set_xlabel('Tarif Pengiriman (R$)', fontsize=14, labelpad=10)
+        ax.set_ylabel('Rata-rata Review Score (1-5)', fontsize=14, labelpad=10)
+
+        # Mengatur ticks pada sumbu x
+        ax.set_xticks(bar_positions)
+        ax.set_xticklabels(categories, fontsize=12)
+
+        # Mengatur batas sumbu y dari 0 hingga 5 (rentang review score)
+        ax.set_ylim(0, 5)
+        # Mengatur format nilai pada sumbu y dengan 1 desimal
+        ax.yaxis.set_major_formatter(FormatStrFormatter('%.1f'))
+
+        # Menambahkan teks yang menampilkan nilai korelasi di pojok kanan atas
+        ax.text(
+            0.98, 0.98,
+            f'Korelasi: {correlation:.2f}',
+            transform=ax.transAxes,
+            fontsize=12,
+            ha='right',
+            va='top',
+            bbox=dict(facecolor='white', alpha=0.7, boxstyle='round,pad=0.3')
+        )
+
+        fig.tight_layout()
+        return to_png(fig)
+
+
+# ===== RFM ANALYSIS =====
+def rfm_chart(recency_top5, frequency_top5, monetary_top5):
+    import seaborn as sns
+    with figure(nrows=1, ncols=3, figsize=(20, 6)) as (fig, ax):
+        colors = ["#72BCD4", "#72BCD4", "#72BCD4", "#72BCD4", "#72BCD4"]
+        panels = [
+            (recency_top5, "recency", "Days since last purchase", "By Recency (days)"),
+            (frequency_top5, "frequency", "Number of orders", "By Frequency"),
+            (monetary_top5, "monetary", "Total spent ($)", "By Monetary"),
+        ]
+
+        for i, (data, column, ylabel, title) in enumerate(panels):
+            if not data.empty:
+                sns.barplot(
+                    y=column,
+                    x="customer_id",
+                    data=data,
+                    palette=colors,
+                    ax=ax[i]
+                )
+                ax[i].set_ylabel(ylabel)
+                ax[i].set_xlabel(None)
+                ax[i].set_title(title, loc="center", fontsize=14)
+                setp(ax[i].get_xticklabels(), rotation=45, ha='right')
+
+        fig.suptitle("Visualisasi RFM", fontsize=16)
+
+        fig.tight_layout()
+        return to_png(fig)
+
+
+# Jumlah pelanggan dan pendapatan untuk setiap segmen RFM
+def rfm_segments_chart(segments):
+    with figure(nrows=1, ncols=2, figsize=(20, 6)) as (fig, ax):
+        ordered = segments.sort_values('customers', ascending=True)
+        ax[0].barh(ordered.index.astype(str), ordered['customers'], color="#72BCD4")
+        ax[0].set_title("Customers per Segment", loc="center", fontsize=14)
+        ax[0].set_xlabel("Number of customers")
+
+        ordered = segments.sort_values('revenue', ascending=True)
+        ax[1].barh(ordered.index.astype(str), ordered['revenue'], color="#72BCD4")
+        ax[1].set_title("Revenue per Segment", loc="center", fontsize=14)
+        ax[1].set_xlabel("Total spent ($)")
+
+        fig.suptitle("Segmentasi Pelanggan RFM", fontsize=16)
+        fig.tight_layout()
+        return to_png(fig)
+
+
+# Daftar grafik yang dapat dirender oleh dashboard
+CHARTS = {
+    'bar': bar_chart,
+    'category_sales': category_sales_chart,
+    'monthly_trend': monthly_trend_chart,
+    'weight_delivery': weight_delivery_chart,
+    'delivery_review': delivery_review_chart,
+    'freight_review': freight_review_chart,
+    'rfm': rfm_chart,
+    'rfm_segments': rfm_segments_chart,
+}
@@ -0,0 +1,236 @@
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+import cube
+import model
+import moments
+import storage
+
+# Mode out-of-core: dataset dibaca per potongan (chunk) berukuran terbatas, setiap potongan diagregasi
+# menjadi cube dan tabel pesanan parsial, lalu digabung. Dataset lengkap tidak pernah berada di memori.
+
+# Jumlah baris default per potongan jika batas memori tidak diatur
+DEFAULT_CHUNK_ROWS = 1_000_000
+MIN_CHUNK_ROWS = 10_000
+
+# Bagian batas memori yang boleh dipakai satu potongan (potongan + model + cube sementara kira-kira 4-5x ukurannya)
+CHUNK_MEMORY_FRACTION = 0.1
+# Perkiraan memori kerja satu potongan (potongan, model dan cube sementaranya) relatif terhadap ukuran potongan
+CHUNK_WORKING_FACTOR = 5
+
+# Kolom ID yang dikodekan secara global antar potongan (order_id cukup dikodekan per potongan oleh model)
+CHUNK_ID_COLUMNS = ['customer_unique_id', 'seller_id']
+
+
+# Penggunaan memori proses saat ini (resident set size) dalam MB
+def current_memory_mb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# Menghentikan proses load jika penggunaan memori ditambah memori yang akan dipakai (projected_mb) melebihi batas
+# (0 berarti tanpa batas), sehingga potongan yang tidak muat ditolak sebelum dibaca
+def check_memory(limit_mb, context, projected_mb=0):
+    if not limit_mb:
+        return
+    used_mb = current_memory_mb()
+    if used_mb + projected_mb > limit_mb:
+        raise MemoryError(
+            f"Penggunaan memori {used_mb:,.0f} MB ditambah perkiraan {projected_mb:,.0f} MB melebihi batas "
+            f"{limit_mb:,.0f} MB saat {context}"
+        )
+
+
+# Rata-rata ukuran satu baris di memori (byte) dari sampel baris pertama
+def bytes_per_row(path, columns):
+    sample = next(_read_batches(path, columns, MIN_CHUNK_ROWS), None)
+    if sample is None or sample.empty:
+        return 1
+    return sample.memory_usage(deep=True).sum() / len(sample)
+
+
+# Perkiraan memori (MB) jika dataset dimuat seluruhnya
+def estimated_memory_mb(path, columns):
+    if path.endswith('.parquet'):
+        return pq.ParquetFile(path).metadata.num_rows * bytes_per_row(path, columns) / 1e6
+    # Jumlah baris CSV tidak diketahui tanpa membaca seluruh file; string di memori kira-kira 2x ukuran teksnya
+    return os.path.getsize(path) * 2 / 1e6
+
+
+# Menentukan apakah dataset diproses out-of-core: "chunked", "memory" atau "auto" (berdasarkan batas memori)
+def should_chunk(path, mode, limit_mb, columns=storage.DASHBOARD_COLUMNS):
+    if mode == 'chunked':
+        return True
+    if mode == 'memory' or not limit_mb:
+        return False
+    return estimated_memory_mb(path, columns) > limit_mb * 0.5
+
+
+# Jumlah baris per potongan berdasarkan batas memori dan ukuran rata-rata satu baris
+def chunk_rows_for(limit_mb, row_bytes):
+    if not limit_mb:
+        return DEFAULT_CHUNK_ROWS
+    return max(int(limit_mb * 1e6 * CHUNK_MEMORY_FRACTION / max(row_bytes, 1)), MIN_CHUNK_ROWS)
+
+
+# Membaca dataset dalam potongan kecil (batch_rows baris) dengan skema yang sudah diterapkan
+def _read_batches(path, columns, batch_rows):
+    if path.endswith('.parquet'):
+        parquet_file = pq.ParquetFile(path)
+        available = parquet_file.schema_arrow.names
+        columns = [col for col in columns if col in available]
+        for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=columns):
+            yield storage.apply_schema(batch.to_pandas())
+    else:
+        for batch in pd.read_csv(path, usecols=lambda col: col in columns, chunksize=batch_rows):
+            yield storage.apply_schema(batch)
+
+
+# Membaca dataset per potongan berisi pesanan utuh: baris pesanan terakhir setiap potongan
+# (yang mungkin berlanjut di batch berikutnya) ditahan dan digabung ke potongan berikutnya.
+# Baris satu pesanan selalu berurutan, baik pada CSV hasil merge maupun Parquet yang diurutkan secara stabil.
+def iter_chunks(path, columns, chunk_rows):
+    leftover = None
+    for batch in _read_batches(path, columns, chunk_rows):
+        chunk = batch if leftover is None else pd.concat([leftover, batch], ignore_index=True)
+        order_ids = chunk['order_id'].to_numpy()
+        cut = len(chunk)
+        while cut > 0 and order_ids[cut - 1] == order_ids[-1]:
+            cut -= 1
+        if cut == 0:
+            leftover = chunk
+            continue
+        leftover = chunk.iloc[cut:].reset_index(drop=True)
+        yield chunk.iloc[:cut].reset_index(drop=True)
+    if leftover is not None and len(leftover):
+        yield leftover
+
+
+# Mengganti kolom ID dengan kode integer yang konsisten antar potongan; id_lookup diperbarui dengan ID baru
+def encode_ids_incremental(df, id_lookup, columns=CHUNK_ID_COLUMNS):
+    df = df.copy(deep=False)
+    for col in columns:
+        known = id_lookup.get(col, pd.Index([], dtype=object))
+        codes = known.get_indexer(df[col])
+        new_ids = pd.unique(df[col][(codes < 0) & df[col].notna()])
+        if len(new_ids):
+            known = known.append(pd.Index(new_ids, dtype=object))
+            codes = known.get_indexer(df[col])
+        id_lookup[col] = known
+        df[col] = codes.astype('int32')
+    return df
+
+
+# Mengurutkan tabel lookup ID dan mengembalikan pemetaan kode lama -> kode baru,
+# sehingga kode mengikuti urutan ID asli seperti storage.encode_ids
+def sort_id_lookup(known):
+    values = np.asarray(known, dtype=object)
+    order = np.argsort(values, kind='stable')
+    remap = np.empty(len(values), dtype='int32')
+    remap[order] = np.arange(len(values), dtype='int32')
+    return values[order], remap
+
+
+# Cara menggabungkan kolom ukuran rollup dari beberapa potongan
+MEASURES = {
+    'rows': 'sum',
+    'payment_value': 'sum',
+    'price': 'sum',
+    'value_sum': 'sum',
+    'rank': 'max',
+}
+
+
+# Menggabungkan beberapa cube sekaligus: rollup dengan kunci yang sama dijumlahkan (atau diambil maksimumnya
+# untuk sketch HLL, atau digabung sebagai momen untuk record korelasi)
+def merge_cubes(cubes):
+    if len(cubes) == 1:
+        return cubes[0]
+    merged = {}
+    for name, rollup in cubes[0].items():
+        if not isinstance(rollup, pd.DataFrame):
+            merged[name] = rollup
+            continue
+        combined = pd.concat([partial[name] for partial in cubes], ignore_index=True)
+        if set(moments.COLUMNS) <= set(combined.columns):
+            # Record momen digabung dengan rumus paralel, bukan dijumlahkan
+            merged[name] = moments.merge(combined, [col for col in combined.columns if col not in moments.COLUMNS])
+            continue
+        measures = {col: MEASURES[col] for col in combined.columns if col in MEASURES}
+        keys = [col for col in combined.columns if col not in measures]
+        merged_rollup = combined.groupby(keys, observed=True, sort=True).agg(measures).reset_index()
+        # Kolom kategori dengan kategori berbeda antar potongan menjadi object setelah concat
+        for col in keys:
+            if merged_rollup[col].dtype == object:
+                merged_rollup[col] = merged_rollup[col].astype('category')
+        merged[name] = merged_rollup
+    return merged
+
+
+# Menambahkan cube potongan ke tumpukan cube parsial dan menggabungkan cube dengan tingkat yang sama secara
+# berpasangan (pohon biner): setiap baris rollup ikut digabung O(log jumlah potongan) kali, bukan sekali per potongan,
+# dan paling banyak O(log jumlah potongan) cube parsial disimpan
+def push_cube(partials, chunk_cube):
+    level = 0
+    while partials and partials[-1][0] == level:
+        chunk_cube = merge_cubes([partials.pop()[1], chunk_cube])
+        level += 1
+    partials.append((level, chunk_cube))
+
+
+# Memuat dataset secara out-of-core: mengembalikan tabel pesanan (untuk RFM), cube harian dan tabel lookup ID
+def load_dataset(path, columns, memory_limit_mb=0, chunk_rows=None, **cube_options):
+    row_bytes = bytes_per_row(path, columns)
+    if chunk_rows is None:
+        chunk_rows = chunk_rows_for(memory_limit_mb, row_bytes)
+    # Memori kerja satu potongan diperiksa sebelum potongan dibaca
+    chunk_mb = chunk_rows * row_bytes * CHUNK_WORKING_FACTOR / 1e6
+
+    id_lookup = {}
+    partials = []
+    orders = []
+    order_offset = 0
+    chunks = iter_chunks(path, columns, chunk_rows)
+    for i in itertools.count():
+        check_memory(memory_limit_mb, f"membaca potongan ke-{i + 1}", chunk_mb)
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        chunk = encode_ids_incremental(chunk, id_lookup)
+        chunk_model = model.build_model(chunk)
+
+        # order_id diganti dengan order_key global karena kode factorize hanya unik di dalam satu potongan
+        chunk_orders = chunk_model['orders'].copy()
+        chunk_orders['order_key'] += order_offset
+        chunk_orders['order_id'] = chunk_orders['order_key']
+        order_offset += len(chunk_orders)
+        orders.append(chunk_orders)
+
+        push_cube(partials, cube.build_cube(chunk, chunk_model, **cube_options))
+        del chunk, chunk_model
+
+    daily_cube = merge_cubes([partial for _, partial in partials]) if partials else None
+    orders = pd.concat(orders, ignore_index=True) if orders else model.build_model(pd.DataFrame(columns=columns))['orders']
+
+    # Kode pelanggan diurutkan sesuai ID aslinya; sketch HLL tetap valid karena hanya membutuhkan kode yang konsisten
+    lookup = {}
+    for col, known in id_lookup.items():
+        lookup[col], remap = sort_id_lookup(known)
+        if col in orders.columns and len(remap):
+            codes = orders[col].to_numpy()
+            orders[col] = np.where(codes >= 0, remap[np.maximum(codes, 0)], -1).astype('int32')
+
+    orders = orders.sort_values('order_purchase_timestamp', kind='stable').reset_index(drop=True)
+    check_memory(memory_limit_mb, "menggabungkan hasil potongan")
+    return {'model': {'orders': orders}, 'cube': daily_cube, 'id_lookup': lookup}
@@ -0,0 +1,66 @@
+import os
+
+# Pengaturan dashboard yang dapat diubah melalui environment variable
+
+# Jumlah maksimum hasil perhitungan per bagian yang disimpan di cache, dan masa berlakunya (detik)
+CACHE_MAX_ENTRIES = int(os.environ.get("DASHBOARD_CACHE_MAX_ENTRIES", 32))
+CACHE_TTL_SECONDS = int(os.environ.get("DASHBOARD_CACHE_TTL_SECONDS", 3600))
+
+# Jumlah maksimum gambar grafik (PNG) yang disimpan di cache
+CHART_CACHE_MAX_ENTRIES = int(os.environ.get("DASHBOARD_CHART_CACHE_MAX_ENTRIES", 256))
+
+# Batas error relatif sketch HyperLogLog untuk jumlah penjual/pelanggan unik per kota,
+# dan mode default perhitungannya ("exact" atau "approx")
+HLL_ERROR = float(os.environ.get("DASHBOARD_HLL_ERROR", 0.01))
+DISTINCT_MODE = os.environ.get("DASHBOARD_DISTINCT_MODE", "exact")
+
+# Batas outlier persentil ke-99 dihitung dari sketch kuantil harian ("sketch") dengan error relatif
+# paling besar DASHBOARD_QUANTILE_ACCURACY, atau dari histogram lengkap ("exact")
+QUANTILE_ACCURACY = float(os.environ.get("DASHBOARD_QUANTILE_ACCURACY", 0.01))
+QUANTILE_MODE = os.environ.get("DASHBOARD_QUANTILE_MODE", "sketch")
+
+# Granularitas awal tren penjualan kategori unggulan ("day", "week", "month" atau "quarter"), dapat diganti dari sidebar
+TREND_GRANULARITY = os.environ.get("DASHBOARD_TREND_GRANULARITY", "month")
+
+# Backend grafik tren penjualan, waktu pengiriman vs review dan tarif pengiriman: "plotly" (interaktif, dirender
+# di browser dengan WebGL) atau "matplotlib" (PNG dirender di server), serta jumlah titik maksimum per deret Plotly
+CHART_BACKEND = os.environ.get("DASHBOARD_CHART_BACKEND", "plotly")
+CHART_MAX_POINTS = int(os.environ.get("DASHBOARD_CHART_MAX_POINTS", 500))
+
+# Mode load dataset: "memory" (seluruh dataset di memori), "chunked" (out-of-core per potongan)
+# atau "auto" (out-of-core jika perkiraan ukuran dataset melebihi setengah batas memori)
+LOAD_MODE = os.environ.get("DASHBOARD_LOAD_MODE", "auto")
+# Dataset dibuka dari file Arrow IPC yang di-memory map (1) sehingga semua sesi dan proses Streamlit di host yang
+# sama berbagi satu salinan di page cache, atau dibaca ke memori proses sendiri (0)
+SHARED_DATASET = os.environ.get("DASHBOARD_SHARED_DATASET", "1") == "1"
+# Batas memori proses dalam MB (0 = tanpa batas); load dihentikan dengan MemoryError jika terlampaui
+MEMORY_LIMIT_MB = int(os.environ.get("DASHBOARD_MEMORY_LIMIT_MB", 0))
+# Jumlah baris per potongan pada mode out-of-core (0 = dihitung dari batas memori)
+CHUNK_ROWS = int(os.environ.get("DASHBOARD_CHUNK_ROWS", 0))
+
+# Backend query untuk perhitungan bagian dashboard: "pandas" (cube harian di memori) atau
+# "duckdb" (SQL langsung pada file dataset untuk setiap rentang tanggal, membutuhkan paket duckdb)
+QUERY_BACKEND = os.environ.get("DASHBOARD_QUERY_BACKEND", "pandas")
+# Jumlah thread DuckDB (0 = semua core)
+DUCKDB_THREADS = int(os.environ.get("DASHBOARD_DUCKDB_THREADS", 0))
+
+# Jumlah thread untuk menghitung bagian dashboard secara paralel (0 = sebanyak jumlah bagian, maksimal jumlah core;
+# 1 = berurutan)
+SECTION_WORKERS = int(os.environ.get("DASHBOARD_SECTION_WORKERS", 0))
+
+# Hanya bagian dashboard yang dipilih di navigasi yang dihitung dan dirender (1), atau semua bagian sekaligus (0),
+# dan apakah bagian di sebelahnya dihitung lebih dulu di latar belakang
+LAZY_SECTIONS = os.environ.get("DASHBOARD_LAZY_SECTIONS", "1") == "1"
+PREFETCH_SECTIONS = os.environ.get("DASHBOARD_PREFETCH_SECTIONS", "1") == "1"
+# Saat rentang tanggal digeser atau diperlebar, bagian dengan rollup aditif dihitung dari agregat rentang sebelumnya
+# di sesi ditambah/dikurangi hari di tepi rentang (1), atau selalu dari seluruh rentang (0); hanya backend pandas
+INCREMENTAL_SECTIONS = os.environ.get("DASHBOARD_INCREMENTAL_SECTIONS", "1") == "1"
+
+# Instrumentasi performa: checkbox panel performa di sidebar (1/0), log terstruktur JSON per fase bagian
+# ("" = tidak aktif, "-" = stderr, atau path file), pengukuran alokasi memori dengan tracemalloc (lebih lambat;
+# tanpa ini memori diukur sebagai perubahan RSS proses) dan port endpoint Prometheus /metrics (0 = tidak aktif).
+# Kedua ukuran memori mencakup seluruh proses, termasuk bagian lain yang dihitung paralel (SECTION_WORKERS selain 1).
+PERF_PANEL = os.environ.get("DASHBOARD_PERF_PANEL", "1") == "1"
+PERF_LOG = os.environ.get("DASHBOARD_PERF_LOG", "")
+PERF_TRACE_MEMORY = os.environ.get("DASHBOARD_PERF_TRACE_MEMORY", "0") == "1"
+METRICS_PORT = int(os.environ.get("DASHBOARD_METRICS_PORT", 0))
@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+
+import hll
+import moments
+import quantiles
+import time_index
+
+# ===== BUCKET YANG DIGUNAKAN DASHBOARD =====
+# Semua bucket bersifat tertutup di kanan, sama seperti pd.cut
+WEIGHT_BINS = [0, 500, 1000, 2000, 5000, 10000, float('inf')]
+WEIGHT_LABELS = ['< 0.5 kg', '0.5-1 kg', '1-2 kg', '2-5 kg', '5-10 kg', '> 10 kg']
+
+DELIVERY_BINS = [0, 3, 7, 14, 21, float('inf')]
+DELIVERY_LABELS = ['0-3 days', '4-7 days', '8-14 days', '15-21 days', '>21 days']
+
+FREIGHT_BINS = [0, 15, 30, 50, 75, 100, float('inf')]
+FREIGHT_LABELS = ["0-15", "15-30", "30-50", "50-75", "75-100", "100+"]
+
+
+# Mengubah nilai menjadi kode bucket (0..n-1), -1 untuk nilai di luar bin atau kosong
+def bucket_codes(values, bins):
+    values = np.asarray(values, dtype='float64')
+    codes = np.searchsorted(np.asarray(bins, dtype='float64'), values, side='left') - 1
+    invalid = np.isnan(values) | (values <= bins[0]) | (codes >= len(bins) - 1)
+    return np.where(invalid, -1, codes).astype('int16')
+
+
+# Waktu pengiriman dalam hari (dibulatkan ke bawah seperti .dt.days)
+def delivery_days(df):
+    return (df['order_delivered_customer_date'] - df['order_purchase_timestamp']).dt.days
+
+
+# Membuat satu rollup harian: group berdasarkan hari + dimensi lalu jumlahkan ukuran-ukurannya
+def _rollup(day, keys, measures):
+    frame = pd.DataFrame({'day': day, **keys, **measures})
+    rollup = frame.groupby(['day', *keys], observed=True, sort=True).sum().reset_index()
+    return rollup
+
+
+# Membangun cube harian dari dataset dashboard dan model pesanan/item (satu rollup untuk setiap bagian)
+def build_cube(df, data_model, hll_precision=hll.precision_for_error(0.01), quantile_accuracy=0.01):
+    day = df['order_purchase_timestamp'].dt.normalize()
+    days = delivery_days(df)
+    ones = np.ones(len(df), dtype='int64')
+    cube = {}
+
+    # Jumlah baris dataset per hari (rentang tanggal dataset dan jumlah baris hasil filter)
+    cube['rows'] = _rollup(day, {}, {'rows': ones})
+
+    # Persebaran jenis pembayaran dan skor review (jumlah baris)
+    cube['payment'] = _rollup(day, {'payment_type': df['payment_type']}, {'rows': ones})
+    cube['review'] = _rollup(day, {'review_score': df['review_score']}, {'rows': ones})
+
+    # Sketch HyperLogLog per (hari, kota) untuk jumlah penjual dan pelanggan unik (ID berupa kode integer)
+    cube['hll_precision'] = hll_precision
+    for name, id_column, city_column in [('seller_hll', 'seller_id', 'seller_city'),
+                                         ('customer_hll', 'customer_unique_id', 'customer_city')]:
+        known = (df[id_column] >= 0) & df[city_column].notna()
+        cube[name] = hll.build_sketches(
+            day[known].to_numpy(), df.loc[known, city_column], df.loc[known, id_column].to_numpy(),
+            hll_precision, group_name=city_column
+        )
+        # Sketch bulanan (gabungan sketch harian) agar rentang panjang cukup membaca bulan penuh + hari di tepinya
+        month = cube[name]['day'].to_numpy().astype('datetime64[M]').astype('datetime64[ns]')
+        cube[name + '_month'] = cube[name].assign(day=month).groupby(
+            ['day', city_column, 'register'], observed=True, sort=True
+        )['rank'].max().reset_index()
+
+    # Penjualan per kategori dihitung sekali per item (payment_value untuk distribusi, price untuk tren)
+    items = data_model['items']
+    cube['category'] = _rollup(
+        items['order_purchase_timestamp'].dt.normalize().to_numpy(),
+        {'product_category_name_english': items['product_category_name_english']},
+        {
+            'payment_value': items['payment_value'].fillna(0).to_numpy(),
+            'price': (items['price'].fillna(0) * items['quantity']).to_numpy(),
+        }
+    )
+
+    # Berat produk vs waktu pengiriman
+    delivered = days.notna().to_numpy()
+    weight = df['product_weight_g'].to_numpy(dtype='float64')[delivered]
+    weight_bucket = bucket_codes(weight, WEIGHT_BINS)
+    weight_valid = weight_bucket >= 0
+    cube['weight'] = _rollup(
+        day[delivered].to_numpy(),
+        {'delivery_days': days[delivered].astype('int32').to_numpy(), 'weight_bucket': weight_bucket},
+        {'rows': ones[delivered]}
+    )
+    # Momen (berat, waktu pengiriman) per hari dan waktu pengiriman untuk korelasi setelah filter outlier
+    weight_days = days[delivered].to_numpy(dtype='float64')[weight_valid]
+    cube['weight_moments'] = moments.rollup(
+        {'day': day[delivered].to_numpy()[weight_valid], 'delivery_days': weight_days.astype('int32')},
+        weight[weight_valid], weight_days
+    )
+
+    # Waktu pengiriman vs skor review
+    reviewed = (days.notna() & df['review_score'].notna()).to_numpy()
+    cube['delivery_review'] = _rollup(
+        day[reviewed].to_numpy(),
+        {
+            'delivery_days': days[reviewed].astype('int32').to_numpy(),
+            'review_score': df['review_score'].to_numpy()[reviewed],
+        },
+        {'rows': ones[reviewed]}
+    )
+    # Momen (waktu pengiriman, skor review) per hari dan waktu pengiriman
+    review_days = days[reviewed].to_numpy(dtype='float64')
+    cube['delivery_review_moments'] = moments.rollup(
+        {'day': day[reviewed].to_numpy(), 'delivery_days': review_days.astype('int32')},
+        review_days, df['review_score'].to_numpy(dtype='float64')[reviewed]
+    )
+
+    # Tarif pengiriman vs skor review
+    rated = (df['freight_value'].notna() & df['review_score'].notna()).to_numpy()
+    freight = df['freight_value'].to_numpy(dtype='float64')[rated]
+    cube['freight'] = _rollup(
+        day[rated].to_numpy(),
+        {
+            'freight_bucket': bucket_codes(freight, FREIGHT_BINS),
+            'review_score': df['review_score'].to_numpy()[rated],
+        },
+        {'rows': ones[rated]}
+    )
+    # Momen (tarif pengiriman, skor review) per hari
+    cube['freight_moments'] = moments.rollup(
+        {'day': day[rated].to_numpy()}, freight, df['review_score'].to_numpy(dtype='float64')[rated]
+    )
+
+    # Sketch kuantil harian untuk batas outlier (persentil ke-99) tanpa membaca seluruh rollup
+    cube['delivery_sketch'] = quantiles.build_sketches(
+        day[delivered].to_numpy(), days[delivered].to_numpy(dtype='float64'), quantile_accuracy
+    )
+    cube['delivery_review_sketch'] = quantiles.build_sketches(
+        day[reviewed].to_numpy()[review_days > 0], review_days[review_days > 0], quantile_accuracy
+    )
+
+    return cube
+
+
+# Mengambil baris rollup untuk rentang tanggal [start_date, end_date] (rollup terurut berdasarkan hari)
+def slice_days(rollup, start_date, end_date):
+    return time_index.slice_range(rollup, start_date, end_date, column='day')
+
+
+# Mengambil sketch HyperLogLog untuk rentang tanggal: sketch bulanan untuk bulan yang tercakup penuh
+# dan sketch harian untuk sisa hari di awal/akhir rentang
+def slice_sketches(cube, name, start_date, end_date):
+    one_day = pd.Timedelta(days=1)
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize()
+    # Awal bulan penuh pertama dan awal bulan setelah bulan penuh terakhir
+    first_month = (start - one_day).to_period('M').to_timestamp() + pd.offsets.MonthBegin(1)
+    end_month = (end + one_day).to_period('M').to_timestamp()
+    if first_month >= end_month:
+        return slice_days(cube[name], start, end)
+    return pd.concat([
+        slice_days(cube[name], start, first_month - one_day),
+        slice_days(cube[name + '_month'], first_month, end_month - one_day),
+        slice_days(cube[name], end_month, end),
+    ], ignore_index=True)
+
+
+# Menjumlahkan rollup dalam rentang tanggal berdasarkan dimensi tertentu
+def query(cube, name, start_date, end_date, by):
+    sliced = slice_days(cube[name], start_date, end_date)
+    return sliced.drop(columns='day').groupby(by, observed=True).sum()
+
+
+# Kuantil dari data yang disimpan sebagai (nilai, jumlah), sama dengan interpolasi linear pandas
+weighted_quantile = quantiles.weighted_quantile
+
+
+# Rata-rata, simpangan baku (ddof=1) dan jumlah dari data (nilai, jumlah)
+def weighted_stats(values, counts):
+    values = np.asarray(values, dtype='float64')
+    counts = np.asarray(counts, dtype='float64')
+    n = counts.sum()
+    if n == 0:
+        return np.nan, np.nan, 0
+    mean = (values * counts).sum() / n
+    var = ((values - mean) ** 2 * counts).sum() / (n - 1) if n > 1 else np.nan
+    return mean, np.sqrt(var), int(n)
+
+
+# Statistik boxplot (format matplotlib bxp) dari data (nilai, jumlah)
+def box_stats(values, counts, label):
+    values = np.asarray(values, dtype='float64')
+    counts = np.asarray(counts, dtype='int64')
+    q1 = weighted_quantile(values, counts, 0.25)
+    med = weighted_quantile(values, counts, 0.5)
+    q3 = weighted_quantile(values, counts, 0.75)
+    iqr = q3 - q1
+    present = values[counts > 0]
+    inside = present[(present >= q1 - 1.5 * iqr) & (present <= q3 + 1.5 * iqr)]
+    return {
+        'label': label,
+        'q1': q1,
+        'med': med,
+        'q3': q3,
+        'whislo': inside.min() if inside.size else q1,
+        'whishi': inside.max() if inside.size else q3,
+        'fliers': np.unique(present[(present < q1 - 1.5 * iqr) | (present > q3 + 1.5 * iqr)]),
+    }
+
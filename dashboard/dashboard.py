@@ -1,11 +1,24 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-from matplotlib.ticker import FormatStrFormatter
-from scipy import stats
 import os
+import threading
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+import chunked
+import config
+import cube
+import executor
+import hll
+import incremental
+import insights
+import instrumentation
+import model
+import sections
+import shared
+import sql_backend
+import storage
+import time_buckets
+import time_index
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -16,842 +29,474 @@ st.set_page_config(
 # Menambahkan judul dashboard
 st.title("E-Commerce Analysis Dashboard")
 
-# Fungsi untuk memuat data dengan caching
-@st.cache_data
-def load_data():
-    # Get the directory where this script is located
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Construct path to the CSV file
-    file_path = os.path.join(current_dir, "clean_data.csv")
-    
-    # Load the data
-    final_df = pd.read_csv(file_path)
-    
-    # Convert date columns
-    date_columns = ['order_purchase_timestamp', 'order_delivered_customer_date', 'order_estimated_delivery_date']
-    for col in date_columns:
-        if col in final_df.columns and not pd.api.types.is_datetime64_any_dtype(final_df[col]):
-            final_df[col] = pd.to_datetime(final_df[col])
+# Apakah dataset diproses out-of-core (per potongan) berdasarkan DASHBOARD_LOAD_MODE dan batas memori
+@st.cache_data(max_entries=1, show_spinner=False)
+def out_of_core(version):
+    return chunked.should_chunk(storage.dataset_path(), config.LOAD_MODE, config.MEMORY_LIMIT_MB)
+
+# Pengaturan sketch pada cube harian
+CUBE_OPTIONS = {
+    'hll_precision': hll.precision_for_error(config.HLL_ERROR),
+    'quantile_accuracy': config.QUANTILE_ACCURACY,
+}
+
+# Fungsi untuk memuat data dengan caching (hanya versi dataset terbaru yang disimpan).
+# Dataset, model dan cube disimpan sebagai resource bersama (tanpa salinan per pemanggilan) karena
+# dibaca bersamaan oleh thread perhitungan bagian dashboard dan tidak pernah diubah.
+@st.cache_resource(max_entries=1)
+def read_data(version):
+    # Menggunakan dataset Parquet bertipe jika sudah dibuat (python storage.py),
+    # jika belum tersedia membaca clean_data.csv dengan skema yang sama
+    path = storage.dataset_path()
+    if config.SHARED_DATASET:
+        # Dataset yang sudah dikodekan dan diurutkan dibuka dari file Arrow yang di-memory map (dibuat sekali per versi)
+        final_df, id_lookup = shared.load_dataset(path, version)
+        # File versi lama tidak dipakai lagi setelah versi baru terbuka (memory map yang masih terbuka tetap valid)
+        shared.remove_old_versions(version)
+        chunked.check_memory(config.MEMORY_LIMIT_MB, "memuat dataset")
+        return final_df, id_lookup
+
+    if path == storage.PARQUET_PATH:
+        final_df = storage.read_dataset(path, columns=storage.DASHBOARD_COLUMNS)
+    else:
+        final_df = storage.read_csv_dataset(path, columns=storage.DASHBOARD_COLUMNS)
     
-    return final_df
+    # ID heksadesimal diganti kode integer, ID asli disimpan di tabel lookup untuk ditampilkan
+    final_df, id_lookup = storage.encode_ids(final_df)
+    chunked.check_memory(config.MEMORY_LIMIT_MB, "memuat dataset")
+
+    # Dataset disimpan terurut berdasarkan waktu pembelian agar filter tanggal cukup dengan binary search
+    return time_index.sort_by_time(final_df), id_lookup
+
+# Fungsi untuk membangun tabel pesanan, item dan pembayaran (tanpa fan-out merge) dengan caching
+@st.cache_resource(max_entries=1)
+def build_model(version):
+    # Kolom model dibaca dari file dataset hanya saat model dibangun, tidak ikut disimpan di dataset dashboard
+    return model.load_model(storage.dataset_path())
+
+# Fungsi untuk membangun cube agregat harian dengan caching
+@st.cache_resource(max_entries=1)
+def build_cube(version):
+    return cube.build_cube(read_data(version)[0], build_model(version), **CUBE_OPTIONS)
+
+# Fungsi untuk memuat dataset secara out-of-core: hanya tabel pesanan, cube harian dan lookup ID yang disimpan
+@st.cache_resource(max_entries=1)
+def read_chunked(version):
+    return chunked.load_dataset(
+        storage.dataset_path(), storage.BUILD_COLUMNS,
+        memory_limit_mb=config.MEMORY_LIMIT_MB, chunk_rows=config.CHUNK_ROWS or None, **CUBE_OPTIONS
+    )
+
+# Dataset (None pada mode out-of-core) dan tabel lookup ID
+def load_data(version):
+    if out_of_core(version):
+        return None, read_chunked(version)['id_lookup']
+    return read_data(version)
+
+def load_model(version):
+    return read_chunked(version)['model'] if out_of_core(version) else build_model(version)
+
+def load_cube(version):
+    return read_chunked(version)['cube'] if out_of_core(version) else build_cube(version)
+
+# Koneksi DuckDB untuk backend query SQL, dibuat sekali per proses
+@st.cache_resource
+def sql_connection():
+    return sql_backend.connect(config.DUCKDB_THREADS)
+
+# Apakah bagian dashboard dihitung dengan backend SQL langsung dari file dataset
+def use_sql_backend():
+    return config.QUERY_BACKEND == 'duckdb'
+
+# Jumlah baris per hari untuk filter tanggal di sidebar (kecil sehingga murah dimuat setiap rerun)
+@st.cache_data(max_entries=1)
+def load_daily_rows(version):
+    if use_sql_backend():
+        with sql_connection().cursor() as con:
+            return sql_backend.daily_rows(con, storage.dataset_path())
+    return load_cube(version)['rows']
+
+# Fungsi untuk menghitung satu bagian dashboard, hasilnya di-cache berdasarkan
+# (bagian, versi dataset, tanggal awal, tanggal akhir, opsi bagian) dengan jumlah entri dan TTL terbatas.
+# _incremental (tidak ikut di-hash) adalah state inkremental sesi; jika ada, cache miss dihitung dari agregat
+# rentang yang terakhir dihitung sesi tersebut.
+@st.cache_data(
+    max_entries=config.CACHE_MAX_ENTRIES * len(sections.SECTIONS),
+    ttl=config.CACHE_TTL_SECONDS,
+    show_spinner=False
+)
+def compute_section(name, version, start_date, end_date, _incremental=None, **options):
+    if use_sql_backend():
+        # Setiap thread Streamlit memakai cursor sendiri karena koneksi DuckDB tidak thread-safe
+        with sql_connection().cursor() as con:
+            return sql_backend.compute_section(
+                con, storage.dataset_path(), name, start_date, end_date,
+                quantile_accuracy=config.QUANTILE_ACCURACY, **options
+            )
+    if _incremental is not None:
+        return incremental.compute(
+            _incremental, name, load_data(version)[0], load_model(version), load_cube(version),
+            start_date, end_date, **options
+        )
+    return sections.SECTIONS[name](
+        load_data(version)[0], load_model(version), load_cube(version), start_date, end_date, **options
+    )
+
+# Endpoint /metrics (format teks Prometheus) untuk scraper lokal, dijalankan sekali per proses
+@st.cache_resource
+def metrics_server(port):
+    return instrumentation.start_metrics_server(port)
+
+# Thread pool untuk menghitung bagian dashboard secara paralel (None jika berurutan)
+@st.cache_resource
+def section_pool():
+    workers = executor.worker_count(config.SECTION_WORKERS, len(sections.SECTIONS))
+    return executor.create_pool(workers) if workers > 1 else None
+
+# Worker memakai konteks script yang menjadwalkannya agar cache Streamlit dapat dipakai dari thread tersebut
+def with_script_context(compute):
+    ctx = get_script_run_ctx()
+    def run(*args, **kwargs):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return compute(*args, **kwargs)
+    return run
+
+# Fungsi untuk merender grafik menjadi PNG, di-cache berdasarkan data agregasi yang digambar
+# sehingga rentang tanggal yang sama dari pengguna lain memakai gambar yang sama
+@st.cache_data(max_entries=config.CHART_CACHE_MAX_ENTRIES, ttl=config.CACHE_TTL_SECONDS, show_spinner=False)
+def render_chart(name, *data):
+    # matplotlib baru diimpor saat grafik pertama dirender agar start server tidak menunggu
+    import charts
+    return charts.CHARTS[name](*data)
+
+# Grafik interaktif Plotly dengan deret yang sudah di-downsample, di-cache seperti render_chart
+@st.cache_data(max_entries=config.CHART_CACHE_MAX_ENTRIES, ttl=config.CACHE_TTL_SECONDS, show_spinner=False)
+def render_figure(name, *data):
+    import interactive
+    return interactive.FIGURES[name](*data, max_points=config.CHART_MAX_POINTS)
+
+# Grafik yang memiliki versi interaktif (interactive.FIGURES), tanpa mengimpor Plotly saat start
+INTERACTIVE_CHARTS = ('monthly_trend', 'delivery_review', 'freight_review')
+
+# Menampilkan grafik: versi interaktif jika backend grafik "plotly" dan grafik tersebut tersedia, selain itu PNG
+def show_chart(name, *data):
+    if config.CHART_BACKEND == 'plotly' and name in INTERACTIVE_CHARTS:
+        st.plotly_chart(render_figure(name, *data), use_container_width=True)
+    else:
+        st.image(render_chart(name, *data), use_column_width=True)
+
+# Judul setiap bagian dashboard pada navigasi, sesuai urutan tampil
+SECTION_LABELS = {
+    'distribution': "Distribusi",
+    'category_sales': "Kategori Produk",
+    'monthly_trend': "Tren Bulanan",
+    'weight_delivery': "Berat & Pengiriman",
+    'delivery_review': "Pengiriman & Review",
+    'freight_review': "Tarif Pengiriman",
+    'rfm': "RFM",
+}
+
+# Instrumentasi performa: log terstruktur, pelacakan alokasi memori dan endpoint Prometheus (opsional)
+instrumentation.configure(config.PERF_LOG, config.PERF_TRACE_MEMORY)
+if config.METRICS_PORT:
+    try:
+        metrics_server(config.METRICS_PORT)
+    except OSError as e:
+        st.sidebar.warning(f"Endpoint metrics tidak dapat dijalankan pada port {config.METRICS_PORT}: {e}")
+
+# Hasil pengukuran setiap fase bagian dashboard pada rerun ini
+perf_records = []
 
 # Memuat data
 try:
-    final_df = load_data()
+    dataset_version = storage.dataset_version()
+    with instrumentation.measure('load', 'compute', sink=perf_records) as load_record:
+        # Backend SQL tidak memuat dataset; ID pelanggan pada hasilnya sudah berupa ID asli
+        final_df, id_lookup = (None, None) if use_sql_backend() else load_data(dataset_version)
+        daily_rows = load_daily_rows(dataset_version)
+        load_record['rows'] = int(daily_rows['rows'].sum())
     
     # Add date range filter in sidebar
     st.sidebar.header("Filter Date Range")
-    min_date = final_df['order_purchase_timestamp'].min().date()
-    max_date = final_df['order_purchase_timestamp'].max().date()
+    min_date = daily_rows['day'].iloc[0].date()
+    max_date = daily_rows['day'].iloc[-1].date()
     
     start_date = st.sidebar.date_input("Start Date", min_date, min_value=min_date, max_value=max_date)
     end_date = st.sidebar.date_input("End Date", max_date, min_value=min_date, max_value=max_date)
     
-    # Filter the dataframe based on the date range
-    filtered_df = final_df[(final_df['order_purchase_timestamp'].dt.date >= start_date) & 
-                          (final_df['order_purchase_timestamp'].dt.date <= end_date)]
-    
     # Display the number of records after filtering
-    st.sidebar.write(f"Filtered data: {filtered_df.shape[0]} records")
+    filtered_rows = cube.slice_days(daily_rows, start_date, end_date)['rows'].sum()
+    st.sidebar.write(f"Filtered data: {filtered_rows} records")
+    
+    # Mode perhitungan jumlah penjual/pelanggan unik per kota
+    distinct_modes = {"Exact": "exact", "Approximate (HyperLogLog)": "approx"}
+    distinct_label = st.sidebar.radio(
+        "Distinct count mode",
+        list(distinct_modes),
+        index=list(distinct_modes.values()).index(config.DISTINCT_MODE) if config.DISTINCT_MODE in distinct_modes.values() else 0,
+        help=f"Mode aproksimasi memakai sketch HyperLogLog dengan error relatif sekitar "
+             f"{hll.relative_error(hll.precision_for_error(config.HLL_ERROR)) * 100:.1f}%",
+        # Mode out-of-core tidak menyimpan baris dataset sehingga hanya mode aproksimasi yang tersedia
+        disabled=final_df is None
+    )
+    if use_sql_backend():
+        st.sidebar.caption("Backend DuckDB: jumlah unik per kota dihitung exact dengan SQL")
+    elif final_df is None:
+        st.sidebar.caption("Mode out-of-core: jumlah unik per kota dihitung dengan HyperLogLog")
+    distinct_mode = distinct_modes[distinct_label]
+    
+    # Granularitas waktu tren penjualan kategori unggulan
+    trend_granularities = {granularity.capitalize(): granularity for granularity in time_buckets.GRANULARITIES}
+    trend_label = st.sidebar.selectbox(
+        "Trend granularity",
+        list(trend_granularities),
+        index=time_buckets.GRANULARITIES.index(config.TREND_GRANULARITY) if config.TREND_GRANULARITY in time_buckets.GRANULARITIES else 2
+    )
+    trend_granularity = trend_granularities[trend_label]
+    
+    # Opsi perhitungan setiap bagian dashboard
+    dataset_columns = storage.available_columns()
+    category_available = 'product_category_name_english' in dataset_columns and 'payment_value' in dataset_columns
+    section_options = {
+        'distribution': {'distinct': distinct_mode},
+        'category_sales': {},
+        'monthly_trend': {'granularity': trend_granularity},
+        'weight_delivery': {'quantile_mode': config.QUANTILE_MODE},
+        'delivery_review': {'quantile_mode': config.QUANTILE_MODE},
+        'freight_review': {},
+        'rfm': {},
+    }
+    if not category_available:
+        del section_options['category_sales']
+    
+    # Hasil perhitungan per sesi (Future per bagian) untuk rentang tanggal dan opsi yang sedang dipilih;
+    # hasil untuk rentang lain dibuang dari sesi (tetap tersedia di cache compute_section)
+    section_key = (dataset_version, start_date, end_date, distinct_mode, trend_granularity, config.QUANTILE_MODE)
+    if st.session_state.get('section_key') != section_key:
+        st.session_state['section_key'] = section_key
+        st.session_state['section_futures'] = {}
+    section_futures = st.session_state['section_futures']
+    # State inkremental per bagian disimpan di sesi lintas rentang tanggal
+    incremental_state = st.session_state.setdefault('incremental_state', {}) if config.INCREMENTAL_SECTIONS else None
+    
+    # Fase compute diukur di thread yang menghitung bagian (termasuk cache hit), dengan jumlah baris rentang tanggal
+    def measured_compute(name, **options):
+        with instrumentation.measure(name, 'compute', rows=int(filtered_rows), sink=perf_records):
+            return compute_section(name, dataset_version, start_date, end_date, _incremental=incremental_state, **options)
+    
+    # Menjadwalkan perhitungan bagian yang belum ada di sesi (paralel jika thread pool tersedia)
+    def schedule_sections(names):
+        pending = {name: section_options[name] for name in names if name in section_options and name not in section_futures}
+        section_futures.update(executor.submit_all(section_pool(), measured_compute, pending, wrap=with_script_context))
+    
+    # Waktu menunggu hasil dicatat sebagai fase wait sehingga tidak terhitung pada fase render
+    def section_result(name):
+        future = section_futures[name]
+        if future.done() and future.exception() is not None:
+            # Error tidak disimpan di sesi sehingga bagian dihitung ulang pada rerun berikutnya
+            del section_futures[name]
+        with instrumentation.measure(name, 'wait', sink=perf_records):
+            return future.result()
+    
+    # Mengganti kode integer customer_id dengan ID pelanggan asli untuk ditampilkan
+    def with_customer_ids(df):
+        if id_lookup is None:
+            return df
+        return df.assign(customer_id=storage.decode_ids(df['customer_id'], id_lookup['customer_unique_id']))
     
     # Display date range in main area
     st.write(f"Showing data from: **{start_date}** to **{end_date}**")
     
-    # ===== VISUALISASI METRIK DISTRIBUSI =====
-    st.subheader("Metrik Distribusi Data")
-    col1, col2 = st.columns(2)
-    
-    # Visualisasi jumlah penjual berdasarkan kota
-    with col1:
-        st.subheader("Persebaran Penjual Di Setiap Kota")
-        sellers_by_city = filtered_df.groupby(by="seller_city").seller_id.nunique().sort_values(ascending=False).head(10)
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sellers_by_city.plot(kind='bar', ax=ax)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        st.pyplot(fig)
-        
-        # Menampilkan deskripsi insight dinamis
-        top_seller_city = sellers_by_city.index[0] if not sellers_by_city.empty else "N/A"
-        top_seller_count = sellers_by_city.iloc[0] if not sellers_by_city.empty else 0
-        second_seller_count = sellers_by_city.iloc[1] if len(sellers_by_city) > 1 else 0
-        
-        st.markdown(f"""
-        **Insight:**
-        Kota dengan penjual terbanyak adalah {top_seller_city} sebanyak {top_seller_count} yang berbeda cukup jauh dengan kota dibawahnya {second_seller_count}. 
-        Hal ini terlihat bahwa penjual terpusat di kota {top_seller_city}.
-        """)
-    
-    # Visualisasi jumlah pelanggan berdasarkan kota
-    with col2:
-        st.subheader("Persebaran Pembeli Di Setiap Kota")
-        customers_by_city = filtered_df.groupby(by="customer_city").customer_unique_id.nunique().sort_values(ascending=False).head(10)
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        customers_by_city.plot(kind='bar', ax=ax)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        st.pyplot(fig)
-    
-        # Menampilkan deskripsi insight dinamis
-        top_customer_city = customers_by_city.index[0] if not customers_by_city.empty else "N/A"
-        top_customer_count = customers_by_city.iloc[0] if not customers_by_city.empty else 0
-        
-        st.markdown(f"""
-        **Insight:**
-        Kota dengan pembeli paling banyak adalah di kota {top_customer_city} yang {'juga sama dengan' if top_customer_city == top_seller_city else 'berbeda dari'} kota yang memiliki penjual terbanyak.
-        """)
-    
-    col3, col4 = st.columns(2)
-    
-    # Visualisasi distribusi metode pembayaran
-    with col3:
-        st.subheader("Persebaran Penggunaan Jenis Pembayaran")
-        payment_types = filtered_df.payment_type.value_counts()
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        payment_types.plot(kind='bar', ax=ax)
-        plt.xticks(rotation=0)
-        plt.tight_layout()
-        st.pyplot(fig)
-        
-        # Menampilkan deskripsi insight dinamis
-        top_payment = payment_types.index[0] if not payment_types.empty else "N/A"
-        top_payment_count = payment_types.iloc[0] if not payment_types.empty else 0
-        top_payment_pct = (top_payment_count / payment_types.sum() * 100) if not payment_types.empty and payment_types.sum() > 0 else 0
-        
-        st.markdown(f"""
-        **Insight:**
-        Jenis pembayaran yang paling sering digunakan pada aplikasi e-commerce adalah {top_payment} 
-        ({top_payment_count} transaksi, {top_payment_pct:.1f}% dari total)
-        """)
-    
-    # Visualisasi distribusi skor review
-    with col4:
-        st.subheader("Persebaran Skor Review Transaksi Produk")
-        review_scores = filtered_df.review_score.value_counts().sort_index(ascending=False)
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        review_scores.plot(kind='bar', ax=ax)
-        plt.xticks(rotation=0)
-        plt.tight_layout()
-        st.pyplot(fig)
-        
-        # Menampilkan deskripsi insight dinamis
-        total_reviews = review_scores.sum() if not review_scores.empty else 0
-        positive_reviews = review_scores.get(4, 0) + review_scores.get(5, 0)
-        negative_reviews = review_scores.get(1, 0) + review_scores.get(2, 0)
-        positive_pct = (positive_reviews / total_reviews * 100) if total_reviews > 0 else 0
-        negative_pct = (negative_reviews / total_reviews * 100) if total_reviews > 0 else 0
-        
-        st.markdown(f"""
-        **Insight:**
-        {positive_pct:.1f}% pembeli puas dengan barang yang mereka beli (skor 4-5), 
-        sementara {negative_pct:.1f}% pembeli tidak puas (skor 1-2) dalam periode yang dipilih.
-        """)
-        
-    # ===== VISUALISASI KATEGORI PRODUK DENGAN PENJUALAN TERTINGGI =====
-    st.subheader("Distribusi Penjualan Berdasarkan Kategori Produk")
-    
-    # Menghitung penjualan berdasarkan kategori
-    if 'product_category_name_english' in filtered_df.columns and 'payment_value' in filtered_df.columns:
-        # Mengelompokkan data berdasarkan kategori produk
-        sales_by_category = filtered_df.groupby('product_category_name_english').agg({
-            'payment_value': 'sum',  # Menghitung total nilai pembayaran
-            'order_id': 'nunique'    # Menghitung jumlah pesanan unik
-        }).reset_index()
-        
-        # Mengurutkan berdasarkan total penjualan
-        sales_by_category = sales_by_category.sort_values('payment_value', ascending=False)
-        
-        # Mengambil 15 kategori teratas
-        top_categories = sales_by_category.head(15)
-        
-        # Membuat visualisasi
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        # Membuat bar plot horizontal dengan warna gradien
-        bars = ax.barh(top_categories['product_category_name_english'],
-                      top_categories['payment_value'],
-                      color=plt.cm.viridis(np.linspace(0, 0.8, len(top_categories))))
-        
-        # Menambahkan anotasi nilai pada setiap bar
-        for i, bar in enumerate(bars):
-            value = top_categories['payment_value'].iloc[i]
-            ax.text(value + (sales_by_category['payment_value'].max() * 0.01),
-                   bar.get_y() + bar.get_height()/2,
-                   f'$ {value:,.2f}',
-                   va='center',
-                   fontweight='bold')
-        
-        ax.set_title('15 Product Categories with Highest Sales', fontsize=16, pad=20)
-        ax.set_xlabel('Total Sales ($)', fontsize=12)
-        ax.set_ylabel('Product Category', fontsize=12)
-        ax.grid(axis='x', linestyle='--', alpha=0.7)
-        plt.tight_layout()
-        
-        st.pyplot(fig)
-        
-        # Menampilkan deskripsi insight dinamis
-        top_category = top_categories['product_category_name_english'].iloc[0] if not top_categories.empty else "N/A"
-        top_category_sales = top_categories['payment_value'].iloc[0] if not top_categories.empty else 0
-        second_category = top_categories['product_category_name_english'].iloc[1] if len(top_categories) > 1 else "N/A"
-        second_category_sales = top_categories['payment_value'].iloc[1] if len(top_categories) > 1 else 0
-        third_category = top_categories['product_category_name_english'].iloc[2] if len(top_categories) > 2 else "N/A"
-        third_category_sales = top_categories['payment_value'].iloc[2] if len(top_categories) > 2 else 0
-        lowest_category = top_categories['product_category_name_english'].iloc[-1] if len(top_categories) > 0 else "N/A"
-        lowest_category_sales = top_categories['payment_value'].iloc[-1] if len(top_categories) > 0 else 0
-        
-        st.markdown(f"""
-        **Insight:**
-        * Kategori {top_category} memimpin dengan penjualan tertinggi (${top_category_sales:,.2f}), 
-          {'jauh di atas' if top_category_sales > 1.5*second_category_sales else 'diikuti oleh'} kategori lainnya
-        * Produk {second_category} (${second_category_sales:,.2f}) dan {third_category} (${third_category_sales:,.2f}) melengkapi tiga besar.
-        * Terdapat kesenjangan {'besar' if top_category_sales > 3*lowest_category_sales else 'kecil'} antara kategori teratas dan terbawah, 
-          dengan {lowest_category} hanya mencapai sekitar ${lowest_category_sales:,.2f}.
-        * Konsumen lebih banyak membelanjakan uang untuk kategori {top_category} dibanding kategori lainnya dalam periode yang dipilih.
-        """)
-    else:
-        st.warning("Kolom yang diperlukan tidak ditemukan. Pastikan 'product_category_name_english' dan 'payment_value' tersedia.")
-        
-    # ===== VISUALISASI TREN PENJUALAN BULANAN =====
-    st.subheader("Tren Penjualan Kategori Produk Unggulan Seiring Waktu")
-    
-    # Menambahkan kolom bulan-tahun untuk pengelompokan
-    filtered_df['year_month'] = filtered_df['order_purchase_timestamp'].dt.strftime('%Y-%m')
-    
-    # Menghitung total penjualan per kategori
-    total_sales_by_category = filtered_df.groupby('product_category_name_english')['price'].sum().sort_values(ascending=False)
-    
-    # Mengambil 5 kategori teratas
-    top_5_categories = total_sales_by_category.head(5).index.tolist()
-    
-    # Memfilter data untuk 5 kategori teratas
-    top_categories_data = filtered_df[filtered_df['product_category_name_english'].isin(top_5_categories)]
-    
-    # Menghitung penjualan bulanan untuk 5 kategori teratas
-    monthly_sales = top_categories_data.groupby(['year_month', 'product_category_name_english'])['price'].sum().reset_index()
-    
-    # Pivot data untuk plotting
-    pivot_data = monthly_sales.pivot(index='year_month', columns='product_category_name_english', values='price')
-    
-    # Mengurutkan index berdasarkan tanggal
-    pivot_data.index = pd.to_datetime(pivot_data.index, format='%Y-%m')
-    pivot_data = pivot_data.sort_index()
-    
-    # Membuat plot
-    fig, ax = plt.subplots(figsize=(14, 8))
-    
-    # Plot setiap kategori dengan warna berbeda
-    for category in top_5_categories:
-        if category in pivot_data.columns:
-            ax.plot(pivot_data.index, pivot_data[category], 
-                   marker='o', markersize=5, 
-                   linewidth=2, 
-                   label=category)
-    
-    ax.set_title('Monthly Sales Trends for Top 5 Product Categories', fontsize=16, pad=20)
-    ax.set_xlabel('Month', fontsize=12)
-    ax.set_ylabel('Total Sales ($)', fontsize=12)
-    plt.legend(loc='upper left', bbox_to_anchor=(1, 1))
-    plt.grid(True, alpha=0.3)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    
-    st.pyplot(fig)
-    
-    # Menampilkan deskripsi insight dinamis
-    trend_insights = []
-    
-    # Mengidentifikasi kategori dengan pertumbuhan paling konsisten
-    if not pivot_data.empty and len(pivot_data) > 1:
-        # Menghitung rata-rata perubahan untuk setiap kategori
-        category_trends = {}
-        for category in top_5_categories:
-            if category in pivot_data.columns:
-                category_data = pivot_data[category].dropna()
-                if len(category_data) > 1:
-                    pct_changes = category_data.pct_change().dropna()
-                    avg_change = pct_changes.mean()
-                    category_trends[category] = avg_change
-        
-        # Kategori dengan pertumbuhan paling konsisten (positif)
-        consistent_growth = max(category_trends.items(), key=lambda x: x[1]) if category_trends else (None, 0)
-        
-        # Kategori dengan volatilitas tertinggi
-        volatility = {category: pivot_data[category].std() / pivot_data[category].mean() 
-                      for category in top_5_categories if category in pivot_data.columns and not pivot_data[category].isna().all()}
-        most_volatile = max(volatility.items(), key=lambda x: x[1]) if volatility else (None, 0)
-        
-        # Kategori dengan nilai puncak tertinggi
-        peak_values = {category: pivot_data[category].max() 
-                      for category in top_5_categories if category in pivot_data.columns and not pivot_data[category].isna().all()}
-        highest_peak = max(peak_values.items(), key=lambda x: x[1]) if peak_values else (None, 0)
-        
-        # Menambahkan insight berdasarkan analisis
-        if consistent_growth[0]:
-            trend_insights.append(f"* Kategori {consistent_growth[0]} menunjukkan {'pertumbuhan' if consistent_growth[1] > 0 else 'penurunan'} paling konsisten.")
-        
-        if most_volatile[0]:
-            trend_insights.append(f"* {most_volatile[0]} menampilkan volatilitas tinggi.")
-        
-        if highest_peak[0]:
-            month_of_peak = pivot_data[highest_peak[0]].idxmax().strftime('%B %Y')
-            trend_insights.append(f"* {highest_peak[0]} mencapai puncak sekitar {highest_peak[1]:.2f} pada {month_of_peak}.")
-    
-    # Jika tidak bisa menghitung insight spesifik, berikan insight umum
-    if not trend_insights:
-        trend_insights = ["* Data tidak cukup untuk menganalisis tren penjualan dalam periode yang dipilih."]
-    
-    st.markdown("""
-    **Insight:**
-    """ + '\n'.join(trend_insights))
-    
-    # ===== VISUALISASI BERAT PRODUK VS WAKTU PENGIRIMAN =====
-    st.subheader("Pengaruh Karakteristik Produk terhadap Waktu Pengiriman")
-    
-    # Menghitung waktu pengiriman dalam hari
-    filtered_df['delivery_time_days'] = (
-        filtered_df['order_delivered_customer_date'] -
-        filtered_df['order_purchase_timestamp']
-    ).dt.days
-    
-    # Memfilter data yang valid (waktu pengiriman masuk akal dan memiliki data berat produk)
-    valid_data = filtered_df[
-        (filtered_df['delivery_time_days'] > 0) &
-        (filtered_df['delivery_time_days'] <= filtered_df['delivery_time_days'].quantile(0.99)) &
-        (filtered_df['product_weight_g'] > 0)
-    ].copy()
-    
-    # Membuat kategori berat produk yang intuitif
-    valid_data['weight_category'] = pd.cut(
-        valid_data['product_weight_g'],
-        bins=[0, 500, 1000, 2000, 5000, 10000, float('inf')],
-        labels=['< 0.5 kg', '0.5-1 kg', '1-2 kg', '2-5 kg', '5-10 kg', '> 10 kg']
-    )
-    
-    # Membuat figure
-    fig, ax = plt.subplots(figsize=(12, 8))
-    
-    # Menghitung statistik untuk setiap kategori berat
-    weight_stats = valid_data.groupby('weight_category', observed=True).agg({
-        'delivery_time_days': ['mean', 'median', 'count', 'std']
-    })
-    
-    # Merapikan nama kolom
-    weight_stats.columns = ['mean_days', 'median_days', 'count', 'std_days']
-    weight_stats = weight_stats.reset_index()
-    
-    # Membuat bar chart untuk rata-rata waktu pengiriman per kategori berat
-    if not weight_stats.empty:
-        bar_plot = sns.barplot(
-            x='weight_category',
-            y='mean_days',
-            data=weight_stats,
-            palette='YlOrRd',  # Palet warna kuning ke merah
-            hue='weight_category',
-            legend=False,
-            ax=ax
-        )
-        
-        # Menambahkan error bar untuk menunjukkan variabilitas
-        ax.errorbar(
-            x=weight_stats.index,
-            y=weight_stats['mean_days'],
-            yerr=weight_stats['std_days'] / np.sqrt(weight_stats['count']),  # Standard error
-            fmt='none',
-            color='black',
-            capsize=5
+    # Bagian yang ditampilkan: hanya bagian yang dipilih (dihitung saat dibuka) atau semua bagian sekaligus
+    section_names = list(SECTION_LABELS)
+    if config.LAZY_SECTIONS:
+        active_section = st.radio(
+            "Bagian dashboard", section_names, format_func=SECTION_LABELS.get,
+            horizontal=True, label_visibility="collapsed", key="active_section"
         )
-        
-        # Menambahkan label nilai di atas bar
-        for i, row in enumerate(weight_stats.itertuples()):
-            ax.text(
-                i, row.mean_days + 0.5,
-                f'{row.mean_days:.1f} days',
-                ha='center',
-                fontweight='bold'
-            )
-            # Menambahkan jumlah produk di bawah label kategori
-            ax.text(
-                i, -1.5,
-                f'n = {row.count:,}',
-                ha='center',
-                fontsize=9
-            )
-        
-        # Menambahkan referensi rata-rata keseluruhan
-        overall_mean = valid_data['delivery_time_days'].mean()
-        ax.axhline(y=overall_mean, color='navy', linestyle='--', alpha=0.7)
-        ax.text(
-            len(weight_stats) - 1, overall_mean + 0.7,
-            f'Rata-rata keseluruhan: {overall_mean:.1f} hari',
-            ha='right',
-            color='navy',
-            fontweight='bold',
-            bbox=dict(facecolor='white', alpha=0.8, boxstyle='round,pad=0.5')
-        )
-        
-        # Menambahkan judul dan label
-        ax.set_xlabel('Berat Produk (kg)', fontsize=12)
-        ax.set_ylabel('Rata-rata Waktu Pengiriman (hari)', fontsize=12)
-        
-        # Menghitung korelasi antara berat produk dan waktu pengiriman
-        correlation = valid_data[['product_weight_g', 'delivery_time_days']].corr().iloc[0, 1]
-        
-        # Menambahkan catatan korelasi
-        plt.figtext(
-            0.02, 0.01,
-            f"Korelasi antara berat produk dan waktu pengiriman: {correlation:.3f}",
-            fontsize=10,
-            bbox=dict(facecolor='white', alpha=0.8)
-        )
-        
-        plt.tight_layout()
-        st.pyplot(fig)
-        
-        # Menampilkan deskripsi insight dinamis
-        lightest_category = weight_stats['weight_category'].iloc[0] if not weight_stats.empty else "N/A"
-        lightest_delivery_time = weight_stats['mean_days'].iloc[0] if not weight_stats.empty else 0
-        
-        heaviest_category = weight_stats['weight_category'].iloc[-1] if len(weight_stats) > 0 else "N/A"
-        heaviest_delivery_time = weight_stats['mean_days'].iloc[-1] if len(weight_stats) > 0 else 0
-        
-        time_difference = heaviest_delivery_time - lightest_delivery_time
-        
-        # Cari kategori dengan waktu pengiriman tercepat
-        fastest_idx = weight_stats['mean_days'].idxmin() if not weight_stats['mean_days'].empty else None
-        fastest_category = weight_stats['weight_category'].iloc[fastest_idx] if fastest_idx is not None else "N/A"
-        fastest_time = weight_stats['mean_days'].iloc[fastest_idx] if fastest_idx is not None else 0
-        
-        # Cari kategori dengan waktu pengiriman terlama
-        slowest_idx = weight_stats['mean_days'].idxmax() if not weight_stats['mean_days'].empty else None
-        slowest_category = weight_stats['weight_category'].iloc[slowest_idx] if slowest_idx is not None else "N/A"
-        slowest_time = weight_stats['mean_days'].iloc[slowest_idx] if slowest_idx is not None else 0
-        
-        st.markdown(f"""
-        **Insight:**
-        * {'Terdapat' if correlation > 0.05 else 'Tidak terdapat'} tren peningkatan waktu pengiriman seiring bertambahnya berat produk, dengan produk terberat ({heaviest_category}) membutuhkan waktu pengiriman {'terlama' if heaviest_delivery_time == slowest_time else ''} yaitu {heaviest_delivery_time:.1f} hari
-        * Produk {fastest_category} memiliki waktu pengiriman tercepat yaitu {fastest_time:.1f} hari, dengan selisih {abs(slowest_time - fastest_time):.1f} hari dibandingkan produk {slowest_category}
-        * Korelasi antara berat produk dan waktu pengiriman tergolong {'kuat' if abs(correlation) > 0.5 else 'sedang' if abs(correlation) > 0.3 else 'lemah'} ({correlation:.3f}), menunjukkan bahwa berat produk {'adalah' if abs(correlation) > 0.5 else 'bukan'} faktor dominan yang mempengaruhi waktu pengiriman
-        * Rata-rata keseluruhan waktu pengiriman adalah {overall_mean:.1f} hari berdasarkan analisis dari {valid_data.shape[0]:,} pesanan yang telah terkirim dalam periode yang dipilih
-        """)
+        visible_sections = [active_section]
     else:
-        st.write("Tidak cukup data untuk menampilkan visualisasi dalam periode yang dipilih.")
+        visible_sections = section_names
+    schedule_sections(visible_sections)
     
-    # ===== VISUALISASI WAKTU PENGIRIMAN VS SKOR REVIEW =====
-    st.subheader("Pengaruh Waktu Pengiriman terhadap Review Score")
-    
-    # Membuang data pesanan yang tidak memiliki tanggal pengiriman ke pelanggan atau skor review
-    delivered_orders = filtered_df.dropna(subset=['order_delivered_customer_date', 'review_score'])
-    delivery_review = delivered_orders.copy()
-    
-    # Menghitung waktu pengiriman dalam satuan hari
-    delivery_review.loc[:, 'delivery_time'] = (
-        delivery_review['order_delivered_customer_date'] -
-        delivery_review['order_purchase_timestamp']
-    ).dt.days
-    
-    # Memfilter data untuk hanya mengambil waktu pengiriman yang positif
-    mask = (delivery_review['delivery_time'] > 0)
-    valid_review_data = delivery_review[mask].copy()
-    
-    # Mengatasi outlier dengan hanya mengambil data sampai persentil ke-99
-    if not valid_review_data.empty:
-        max_delivery_time = valid_review_data['delivery_time'].quantile(0.99)
-        valid_review_data = valid_review_data[valid_review_data['delivery_time'] <= max_delivery_time].copy()
-        
-        # Membuat kategori waktu pengiriman untuk mempermudah analisis dan visualisasi
-        valid_review_data.loc[:, 'delivery_time_category'] = pd.cut(
-            valid_review_data['delivery_time'],
-            bins=[0, 3, 7, 14, 21, float('inf')],
-            labels=['0-3 days', '4-7 days', '8-14 days', '15-21 days', '>21 days']
-        )
-        
-        # Membuat subplots dengan dua grafik: boxplot di atas dan line plot di bawah
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 12), gridspec_kw={'height_ratios': [1, 1]})
-        
-        # Membuat boxplot untuk menunjukkan distribusi review score berdasarkan kategori waktu pengiriman
-        sns.boxplot(
-            x='delivery_time_category',
-            y='review_score',
-            hue='delivery_time_category',
-            data=valid_review_data,
-            palette='viridis',
-            legend=False,
-            ax=ax1
-        )
-        
-        # Menambahkan judul dan label pada boxplot
-        ax1.set_title('Distribusi Review Core berdasarkan Kategori Waktu Pengiriman', fontsize=16, pad=20)
-        ax1.set_xlabel('Kategori Waktu Pengiriman', fontsize=12)
-        ax1.set_ylabel('Review Score (1-5)', fontsize=12)
-        ax1.set_ylim(0.5, 5.5)
-        ax1.grid(axis='y', alpha=0.3)
-        
-        # Menghitung rata-rata review score untuk setiap kategori waktu pengiriman
-        category_avg = valid_review_data.groupby('delivery_time_category', observed=True)['review_score'].mean()
-        
-        # Menambahkan label rata-rata review score di atas setiap boxplot
-        for i, category in enumerate(category_avg.index):
-            ax1.text(
-                i,
-                5.3,
-                f'Rata-rata: {category_avg[category]:.2f}',
-                ha='center',
-                fontsize=10,
-                bbox=dict(facecolor='white', alpha=0.8, boxstyle='round,pad=0.5')
-            )
-        
-        # Membuat bins untuk waktu pengiriman dengan interval 2 hari untuk analisis tren yang lebih halus
-        delivery_bins = list(range(0, int(max_delivery_time) + 1, 2))
-        
-        # Mengelompokkan data berdasarkan bin waktu pengiriman dan menghitung rata-rata dan jumlah
-        review_by_delivery = valid_review_data.groupby(
-            pd.cut(valid_review_data['delivery_time'], bins=delivery_bins),
-            observed=True
-        )['review_score'].agg(['mean', 'count']).reset_index()
-        
-        # Mengambil nilai tengah dari setiap bin untuk digunakan sebagai nilai x dalam plot
-        review_by_delivery['delivery_time_mid'] = review_by_delivery['delivery_time'].apply(lambda x: x.mid)
-        
-        # Memfilter hanya bin dengan minimal 10 data untuk hasil yang lebih reliabel
-        review_by_delivery = review_by_delivery[review_by_delivery['count'] >= 10]
-        
-        # Membuat line plot untuk menunjukkan tren review score berdasarkan waktu pengiriman
-        if not review_by_delivery.empty:
-            ax2.plot(
-                review_by_delivery['delivery_time_mid'],
-                review_by_delivery['mean'],
-                'o-',  # Gaya plot: garis dengan marker lingkaran
-                color='#3366cc',
-                linewidth=2,
-                markersize=8
-            )
-            
-            # Menghitung standard error untuk setiap bin untuk visualisasi interval kepercayaan
-            review_by_delivery['se'] = valid_review_data.groupby(
-                pd.cut(valid_review_data['delivery_time'], bins=delivery_bins),
-                observed=True
-            )['review_score'].agg(lambda x: x.std() / np.sqrt(len(x))).values
-            
-            # Menambahkan interval kepercayaan 95% (±1.96 SE) sebagai area berbayang pada line plot
-            ax2.fill_between(
-                review_by_delivery['delivery_time_mid'],
-                review_by_delivery['mean'] - 1.96 * review_by_delivery['se'],
-                review_by_delivery['mean'] + 1.96 * review_by_delivery['se'],
-                color='#3366cc',
-                alpha=0.2
-            )
-            
-            # Menambahkan garis horizontal yang menunjukkan rata-rata keseluruhan review score
-            overall_mean = valid_review_data['review_score'].mean()
-            ax2.axhline(y=overall_mean, color='red', linestyle='--', alpha=0.7, label=f'Rata-rata keseluruhan: {overall_mean:.2f}')
-            
-            # Menambahkan judul dan label pada line plot
-            ax2.set_title('Tren Ewview Score berdasarkan Waktu Pengiriman', fontsize=16, pad=20)
-            ax2.set_xlabel('Waktu Pengiriman (hari)', fontsize=12)
-            ax2.set_ylabel('Rata-rata Review Score', fontsize=12)
-            ax2.set_ylim(3.0, 5.0)  # Mengatur batas y-axis untuk fokus pada variasi yang relevan
-            ax2.grid(True, alpha=0.3)
-            ax2.legend()
-            
-            # Menghitung korelasi antara waktu pengiriman dan review score
-            correlation = valid_review_data[['delivery_time', 'review_score']].corr().iloc[0, 1]
-            
-            # Menambahkan teks yang menunjukkan nilai korelasi di pojok kiri bawah grafik
-            ax2.text(
-                0.02, 0.05,
-                f'Correlation: {correlation:.3f}',
-                transform=ax2.transAxes,
-                fontsize=12,
-                bbox=dict(facecolor='white', alpha=0.8)
-            )
+    # Bagian di sebelah bagian yang dibuka dihitung di latar belakang agar langsung tersedia saat dipilih
+    if config.LAZY_SECTIONS and config.PREFETCH_SECTIONS and section_pool() is not None:
+        position = section_names.index(active_section)
+        schedule_sections(section_names[max(position - 1, 0):position + 2])
+    
+    # ===== VISUALISASI METRIK DISTRIBUSI =====
+    if 'distribution' in visible_sections:
+        with instrumentation.measure('distribution', 'render', sink=perf_records):
+            st.subheader("Metrik Distribusi Data")
+            distribution = section_result('distribution')
+            distribution_insights = insights.distribution(distribution)
+            col1, col2 = st.columns(2)
+    
+            # Visualisasi jumlah penjual berdasarkan kota
+            with col1:
+                st.subheader("Persebaran Penjual Di Setiap Kota")
+                show_chart('bar', distribution['sellers_by_city'], 45, 'right')
+                st.markdown(distribution_insights['sellers_by_city'])
+    
+            # Visualisasi jumlah pelanggan berdasarkan kota
+            with col2:
+                st.subheader("Persebaran Pembeli Di Setiap Kota")
+                show_chart('bar', distribution['customers_by_city'], 45, 'right')
+                st.markdown(distribution_insights['customers_by_city'])
+    
+            col3, col4 = st.columns(2)
+    
+            # Visualisasi distribusi metode pembayaran
+            with col3:
+                st.subheader("Persebaran Penggunaan Jenis Pembayaran")
+                show_chart('bar', distribution['payment_types'], 0)
+                st.markdown(distribution_insights['payment_types'])
+    
+            # Visualisasi distribusi skor review
+            with col4:
+                st.subheader("Persebaran Skor Review Transaksi Produk")
+                show_chart('bar', distribution['review_scores'], 0)
+                st.markdown(distribution_insights['review_scores'])
             
-            # Menambahkan scatter plot dengan ukuran titik sesuai jumlah pesanan
-            sizes = review_by_delivery['count'] / review_by_delivery['count'].max() * 100 + 20
-            scatter = ax2.scatter(
-                review_by_delivery['delivery_time_mid'],
-                review_by_delivery['mean'],
-                s=sizes,
-                alpha=0.5,
-                c=review_by_delivery['count'],
-                cmap='viridis',
-                edgecolor='black'
-            )
+    # ===== VISUALISASI KATEGORI PRODUK DENGAN PENJUALAN TERTINGGI =====
+    if 'category_sales' in visible_sections:
+        with instrumentation.measure('category_sales', 'render', sink=perf_records):
+            st.subheader("Distribusi Penjualan Berdasarkan Kategori Produk")
+    
+            # Menghitung penjualan berdasarkan kategori
+            if category_available:
+                category_sales = section_result('category_sales')
+                sales_by_category = category_sales['sales_by_category']
+                top_categories = category_sales['top_categories']
             
-            # Menambahkan color bar untuk menunjukkan hubungan warna dengan jumlah pesanan
-            cbar = fig.colorbar(scatter, ax=ax2)
-            cbar.set_label('Jumlah Pesanan', fontsize=10)
+                # Membuat visualisasi
+                show_chart('category_sales', top_categories, sales_by_category['payment_value'].max())
             
-            plt.tight_layout()
-            st.pyplot(fig)
+                # Menampilkan deskripsi insight dinamis
+                st.markdown(insights.category_sales(category_sales))
+            else:
+                st.warning(insights.EMPTY_MESSAGES['category_sales'])
             
+    # ===== VISUALISASI TREN PENJUALAN BULANAN =====
+    if 'monthly_trend' in visible_sections:
+        with instrumentation.measure('monthly_trend', 'render', sink=perf_records):
+            st.subheader("Tren Penjualan Kategori Produk Unggulan Seiring Waktu")
+    
+            monthly_trend = section_result('monthly_trend')
+            top_5_categories = monthly_trend['top_5_categories']
+            pivot_data = monthly_trend['pivot_data']
+    
+            # Membuat plot
+            show_chart('monthly_trend', pivot_data, top_5_categories, monthly_trend['granularity'])
+    
             # Menampilkan deskripsi insight dinamis
-            fastest_category = category_avg.index[0] if not category_avg.empty else None
-            fastest_rating = category_avg.iloc[0] if not category_avg.empty else 0
-            
-            slowest_category = category_avg.index[-1] if len(category_avg) > 0 else None
-            slowest_rating = category_avg.iloc[-1] if len(category_avg) > 0 else 0
-            
-            # Cari kategori dengan rating tertinggi dan terendah
-            highest_rating_idx = category_avg.idxmax() if not category_avg.empty else None
-            highest_rating_category = highest_rating_idx if highest_rating_idx is not None else None
-            highest_rating = category_avg.loc[highest_rating_category] if highest_rating_category is not None else 0
+            st.markdown(insights.monthly_trend(monthly_trend))
+    
+    # ===== VISUALISASI BERAT PRODUK VS WAKTU PENGIRIMAN =====
+    if 'weight_delivery' in visible_sections:
+        with instrumentation.measure('weight_delivery', 'render', sink=perf_records):
+            st.subheader("Pengaruh Karakteristik Produk terhadap Waktu Pengiriman")
+    
+            weight_delivery = section_result('weight_delivery')
+            weight_stats = weight_delivery['weight_stats']
+    
+            # Membuat bar chart untuk rata-rata waktu pengiriman per kategori berat
+            if not weight_stats.empty:
+                show_chart('weight_delivery', weight_stats, weight_delivery['overall_mean'], weight_delivery['correlation'])
             
-            lowest_rating_idx = category_avg.idxmin() if not category_avg.empty else None
-            lowest_rating_category = lowest_rating_idx if lowest_rating_idx is not None else None
-            lowest_rating = category_avg.loc[lowest_rating_category] if lowest_rating_category is not None else 0
+                # Menampilkan deskripsi insight dinamis
+                st.markdown(insights.weight_delivery(weight_delivery))
+            else:
+                st.write(insights.EMPTY_MESSAGES['weight_delivery'])
+    
+    # ===== VISUALISASI WAKTU PENGIRIMAN VS SKOR REVIEW =====
+    if 'delivery_review' in visible_sections:
+        with instrumentation.measure('delivery_review', 'render', sink=perf_records):
+            st.subheader("Pengaruh Waktu Pengiriman terhadap Review Score")
+    
+            delivery_review = section_result('delivery_review')
+    
+            if delivery_review is not None:
+                review_by_delivery = delivery_review['review_by_delivery']
             
-            st.markdown(f"""
-            **Insight:**
-            * {'Terdapat' if correlation < -0.1 else 'Tidak terdapat'} hubungan negatif yang jelas antara waktu pengiriman dan kepuasan pelanggan. {'Semakin lama waktu pengiriman, semakin rendah rating review yang diberikan' if correlation < -0.1 else ''}
-            * Pengiriman {highest_rating_category} mendapatkan rating tertinggi dengan rata-rata {highest_rating:.2f}, sementara pengiriman {lowest_rating_category} mendapatkan rating terendah dengan rata-rata {lowest_rating:.2f}
-            * Korelasi negatif sebesar {correlation:.3f} {'mengkonfirmasi adanya hubungan yang cukup kuat' if correlation < -0.2 else 'menunjukkan adanya hubungan yang lemah'} antara keterlambatan pengiriman dan penurunan kepuasan pelanggan
-            * Rata-rata keseluruhan review adalah {overall_mean:.2f}, yang menunjukkan bahwa {'mayoritas pelanggan masih memberikan rating positif' if overall_mean > 3.5 else 'pelanggan cenderung memberikan rating netral'} dalam periode yang dipilih
-            """)
-        else:
-            st.write("Tidak cukup data untuk menampilkan tren review dalam periode yang dipilih.")
-    else:
-        st.write("Tidak cukup data pengiriman untuk analisis dalam periode yang dipilih.")
+                # Membuat line plot untuk menunjukkan tren review score berdasarkan waktu pengiriman
+                if not review_by_delivery.empty:
+                    show_chart(
+                        'delivery_review', delivery_review['box_data'], delivery_review['category_avg'], review_by_delivery,
+                        delivery_review['overall_mean'], delivery_review['correlation']
+                    )
+                
+                    # Menampilkan deskripsi insight dinamis
+                    st.markdown(insights.delivery_review(delivery_review))
+                else:
+                    st.write(insights.EMPTY_MESSAGES['delivery_review_trend'])
+            else:
+                st.write(insights.EMPTY_MESSAGES['delivery_review'])
     
     # ===== VISUALISASI PENGARUH TARIF PENGIRIMAN TERHADAP KEPUASAN PELANGGAN =====
-    st.subheader("Pengaruh Tarif Pengiriman terhadap Review Score")
-    
-    # Membersihkan data dengan menghapus baris yang memiliki nilai kosong pada kolom freight_value dan review_score
-    clean_df = filtered_df.dropna(subset=['freight_value', 'review_score']).copy()
-    
-    if not clean_df.empty:
-        # Mendefinisikan rentang nilai untuk kategorisasi tarif pengiriman
-        bins = [0, 15, 30, 50, 75, 100, float('inf')]
-        labels = ["0-15", "15-30", "30-50", "50-75", "75-100", "100+"]
-        
-        # Membuat kategori tarif pengiriman
-        clean_df['freight_category'] = pd.cut(clean_df['freight_value'], bins=bins, labels=labels)
-        
-        # Menghitung rata-rata review score untuk setiap kategori tarif pengiriman
-        avg_ratings = clean_df.groupby('freight_category')['review_score'].mean()
-        
-        # Menghitung jumlah pesanan untuk setiap kategori tarif pengiriman
-        order_counts = clean_df.groupby('freight_category').size()
-        
-        # Menghitung korelasi Pearson antara nilai tarif pengiriman dan review score
-        correlation = stats.pearsonr(clean_df['freight_value'], clean_df['review_score'])[0]
-        
-        # Membuat figure
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        # Menyiapkan data untuk visualisasi bar chart
-        categories = labels
-        bar_positions = np.arange(len(categories))
-        bar_width = 0.6
-        
-        # Membuat gradasi warna dari merah ke hijau terbalik
-        colors = sns.color_palette("RdYlGn_r", len(categories))
-        
-        # Membuat bar chart
-        bars = ax.bar(
-            bar_positions,
-            avg_ratings,
-            bar_width,
-            color=colors,
-            edgecolor='black',
-            linewidth=1.5,
-            alpha=0.8
-        )
-        
-        # Menambahkan label nilai rata-rata review score di atas setiap bar
-        for i, bar in enumerate(bars):
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width()/2.,
-                height + 0.05,
-                f'{avg_ratings[i]:.1f}',
-                ha='center',
-                va='bottom',
-                fontsize=14,
-                fontweight='bold'
-            )
+    if 'freight_review' in visible_sections:
+        with instrumentation.measure('freight_review', 'render', sink=perf_records):
+            st.subheader("Pengaruh Tarif Pengiriman terhadap Review Score")
+    
+            freight_review = section_result('freight_review')
+    
+            if freight_review is not None:
+                # Membuat bar chart rata-rata review score per kategori tarif pengiriman
+                show_chart(
+                    'freight_review', freight_review['avg_ratings'], freight_review['order_counts'], freight_review['correlation']
+                )
             
-            # Menambahkan jumlah pesanan di tengah setiap bar
-            ax.text(
-                bar.get_x() + bar.get_width()/2.,
-                height/2,
-                f'{order_counts[i]} orders',
-                ha='center',
-                va='center',
-                fontsize=12,
-                fontweight='bold',
-                color='black'
-            )
-        
-        # Menambahkan judul dan label
-        ax.set_title('Pengaruh Tarif Pengiriman terhadap kepuasan pelanggan', fontsize=16, pad=20)
-        ax.set_xlabel('Tarif Pengiriman (R$)', fontsize=14, labelpad=10)
-        ax.set_ylabel('Rata-rata Review Score (1-5)', fontsize=14, labelpad=10)
-        
-        # Mengatur ticks pada sumbu x
-        ax.set_xticks(bar_positions)
-        ax.set_xticklabels(categories, fontsize=12)
-        
-        # Mengatur batas sumbu y dari 0 hingga 5 (rentang review score)
-        ax.set_ylim(0, 5)
-        # Mengatur format nilai pada sumbu y dengan 1 desimal
-        ax.yaxis.set_major_formatter(FormatStrFormatter('%.1f'))
-        
-        # Menambahkan teks yang menampilkan nilai korelasi di pojok kanan atas
-        ax.text(
-            0.98, 0.98,
-            f'Korelasi: {correlation:.2f}',
-            transform=ax.transAxes,
-            fontsize=12,
-            ha='right',
-            va='top',
-            bbox=dict(facecolor='white', alpha=0.7, boxstyle='round,pad=0.3')
-        )
-        
-        plt.tight_layout()
-        st.pyplot(fig)
-        
-        # Menampilkan deskripsi insight dinamis
-        # Cari kategori dengan rating tertinggi dan terendah
-        highest_rating_idx = avg_ratings.idxmax() if not avg_ratings.empty else None
-        highest_rating_category = highest_rating_idx if highest_rating_idx is not None else None
-        highest_rating = avg_ratings.loc[highest_rating_category] if highest_rating_category is not None else 0
-        
-        lowest_rating_idx = avg_ratings.idxmin() if not avg_ratings.empty else None
-        lowest_rating_category = lowest_rating_idx if lowest_rating_idx is not None else None
-        lowest_rating = avg_ratings.loc[lowest_rating_category] if lowest_rating_category is not None else 0
-        
-        # Menghitung persentase pesanan di bawah tarif 50
-        below_50_count = order_counts.get("0-15", 0) + order_counts.get("15-30", 0) + order_counts.get("30-50", 0)
-        total_orders = order_counts.sum()
-        below_50_pct = (below_50_count / total_orders * 100) if total_orders > 0 else 0
-        
-        st.markdown(f"""
-        **Insight:**
-        * {'Terdapat trend bahwa semakin tinggi tarif pengiriman, semakin rendah tingkat kepuasan pelanggan' if correlation < -0.1 else 'Tidak ada tren yang jelas antara tarif pengiriman dan kepuasan pelanggan'} dalam periode yang dipilih
-        * Pesanan dengan tarif {highest_rating_category} memiliki rating tertinggi (rata-rata {highest_rating:.1f})
-        * {'Tarif ' + lowest_rating_category + ' menyebabkan penurunan signifikan pada kepuasan (rata-rata ' + str(lowest_rating) + ')' if lowest_rating < 3.8 else 'Semua kategori tarif mendapatkan rating yang relatif tinggi'}
-        * Mayoritas pesanan ({below_50_pct:.1f}%) menggunakan tarif pengiriman di bawah 50 dalam periode yang dipilih
-        """)
-    else:
-        st.write("Tidak cukup data untuk analisis pengaruh tarif pengiriman dalam periode yang dipilih.")
+                # Menampilkan deskripsi insight dinamis
+                st.markdown(insights.freight_review(freight_review))
+            else:
+                st.write(insights.EMPTY_MESSAGES['freight_review'])
     
     # ===== RFM ANALYSIS =====
-    st.subheader("RFM Analysis")
+    if 'rfm' in visible_sections:
+        with instrumentation.measure('rfm', 'render', sink=perf_records):
+            st.subheader("RFM Analysis")
 
-    try:
-        st.markdown("""
-        **RFM Analysis** adalah teknik segmentasi pelanggan yang ampuh untuk mengidentifikasi pelanggan yang paling berharga berdasarkan tiga metrik utama:
-
-        * Recency: Seberapa baru pelanggan melakukan pembelian (kebaruan transaksi)
-        * Frequency: Seberapa sering pelanggan melakukan pembelian (frekuensi transaksi)
-        * Monetary: Seberapa banyak uang yang dibelanjakan oleh pelanggan (nilai moneter)
-        Analisis ini membantu bisnis mengembangkan strategi pemasaran yang ditargetkan untuk berbagai segmen pelanggan yang berbeda. Dengan memahami perilaku pembelian pelanggan, bisnis dapat meningkatkan retensi pelanggan, meningkatkan loyalitas, dan mengoptimalkan pengalaman pelanggan.
-        """)
-        
-        with st.spinner("Calculating RFM metrics..."):
-            rfm_df = filtered_df.groupby(by="customer_unique_id", as_index=False).agg({
-                "order_purchase_timestamp": "max",
-                "order_id": "nunique",
-                "payment_value": "sum"
-            })
-            
-            rfm_df.columns = ["customer_id", "max_order_timestamp", "frequency", "monetary"]
-            rfm_df["max_order_timestamp"] = pd.to_datetime(rfm_df["max_order_timestamp"]).dt.date
-            recent_date = pd.to_datetime(filtered_df["order_purchase_timestamp"]).dt.date.max()
-            rfm_df["recency"] = rfm_df["max_order_timestamp"].apply(lambda x: (recent_date - x).days)
-            rfm_df.drop("max_order_timestamp", axis=1, inplace=True)
-            st.write("Sampel data RFM (5 baris pertama):")
-            st.dataframe(rfm_df.head())
-        
-        if not rfm_df.empty:
-            fig, ax = plt.subplots(nrows=1, ncols=3, figsize=(20, 6))
-            colors = ["#72BCD4", "#72BCD4", "#72BCD4", "#72BCD4", "#72BCD4"]
-            
-            # Recency plot
-            recency_top5 = rfm_df.sort_values(by="recency", ascending=True).head(5)
-            if not recency_top5.empty:
-                sns.barplot(
-                    y="recency", 
-                    x="customer_id",
-                    data=recency_top5,
-                    palette=colors, 
-                    ax=ax[0]
-                )
-                ax[0].set_ylabel("Days since last purchase")
-                ax[0].set_xlabel(None)
-                ax[0].set_title("By Recency (days)", loc="center", fontsize=14)
-                plt.setp(ax[0].get_xticklabels(), rotation=45, ha='right')
-            
-            # Frequency plot
-            frequency_top5 = rfm_df.sort_values(by="frequency", ascending=False).head(5)
-            if not frequency_top5.empty:
-                sns.barplot(
-                    y="frequency", 
-                    x="customer_id",
-                    data=frequency_top5,
-                    palette=colors, 
-                    ax=ax[1]
-                )
-                ax[1].set_ylabel("Number of orders")
-                ax[1].set_xlabel(None)
-                ax[1].set_title("By Frequency", loc="center", fontsize=14)
-                plt.setp(ax[1].get_xticklabels(), rotation=45, ha='right')
-            
-            # Monetary plot
-            monetary_top5 = rfm_df.sort_values(by="monetary", ascending=False).head(5)
-            if not monetary_top5.empty:
-                sns.barplot(
-                    y="monetary", 
-                    x="customer_id",
-                    data=monetary_top5,
-                    palette=colors, 
-                    ax=ax[2]
-                )
-                ax[2].set_ylabel("Total spent ($)")
-                ax[2].set_xlabel(None)
-                ax[2].set_title("By Monetary", loc="center", fontsize=14)
-                plt.setp(ax[2].get_xticklabels(), rotation=45, ha='right')
-            
-            plt.suptitle("Visualisasi RFM", fontsize=16)
-            
-            plt.tight_layout()
-            st.pyplot(fig)
+            try:
+                st.markdown(insights.RFM_INTRO)
             
-            # Dynamic insights
-            recency_top_id = recency_top5['customer_id'].iloc[0] if not recency_top5.empty else "N/A"
-            recency_top_val = recency_top5['recency'].iloc[0] if not recency_top5.empty else 0
-            recency_diff = recency_top5['recency'].iloc[-1] - recency_top5['recency'].iloc[0] if len(recency_top5) > 1 else 0
+                with st.spinner("Calculating RFM metrics..."):
+                    rfm_result = section_result('rfm')
+                    rfm_df = rfm_result['rfm_df']
+                    st.write("Sampel data RFM (5 baris pertama):")
+                    st.dataframe(with_customer_ids(rfm_df.head()))
             
-            frequency_top_id = frequency_top5['customer_id'].iloc[0] if not frequency_top5.empty else "N/A"
-            frequency_top_val = frequency_top5['frequency'].iloc[0] if not frequency_top5.empty else 0
-            frequency_next_val = frequency_top5['frequency'].iloc[1] if len(frequency_top5) > 1 else 0
-            
-            monetary_top_id = monetary_top5['customer_id'].iloc[0] if not monetary_top5.empty else "N/A"
-            monetary_top_val = monetary_top5['monetary'].iloc[0] if not monetary_top5.empty else 0
-            monetary_next_val = monetary_top5['monetary'].iloc[1] if len(monetary_top5) > 1 else 0
-            monetary_ratio = monetary_top_val / monetary_next_val if monetary_next_val > 0 else 0
-            
-            st.markdown(f"""
-            **Insight RFM untuk periode {start_date} hingga {end_date}:**
-            * **Recency**: Pelanggan teratas ({recency_top_id}) baru saja berbelanja ({recency_top_val} hari yang lalu)
-              {f'Terdapat perbedaan sebesar {recency_diff} hari antara pelanggan teratas dengan pelanggan lainnya' if recency_diff > 5 else ''}
-            * **Frequency**: Pelanggan dengan frekuensi tertinggi ({frequency_top_id}) melakukan sekitar {frequency_top_val} pembelian
-              {f'yang jauh lebih tinggi dibandingkan pelanggan berikutnya ({frequency_next_val} pembelian)' if frequency_top_val > frequency_next_val*1.5 else ''}
-            * **Monetary**: Pelanggan dengan nilai belanja tertinggi ({monetary_top_id}) menghabiskan sekitar ${monetary_top_val:,.2f}
-              {f'(sekitar {monetary_ratio:.1f}x lipat dari pelanggan berikutnya)' if monetary_ratio > 1.5 else ''}
-            * {'Tidak ada pelanggan yang unggul di semua dimensi RFM, menunjukkan segmentasi pelanggan yang berbeda berdasarkan perilaku pembelian mereka.' if recency_top_id != frequency_top_id or frequency_top_id != monetary_top_id else 'Ada pelanggan yang unggul di beberapa dimensi RFM, menunjukkan adanya pelanggan high-value yang konsisten.'}
-            """)
-        else:
-            st.write("Tidak cukup data untuk analisis RFM dalam periode yang dipilih.")
-            
-    except Exception as e:
-        st.error(f"Error in RFM analysis: {e}")
-        st.info("Please ensure your dataset contains the required columns for RFM analysis: customer_unique_id, order_purchase_timestamp, order_id, and payment_value.")
+                if not rfm_df.empty:
+                    recency_top5, frequency_top5, monetary_top5 = [with_customer_ids(top) for top in insights.rfm_top5(rfm_df)]
+                    show_chart('rfm', recency_top5, frequency_top5, monetary_top5)
+                
+                    # Dynamic insights
+                    st.markdown(insights.rfm(recency_top5, frequency_top5, monetary_top5, start_date, end_date))
+
+                    # Segmentasi pelanggan berdasarkan skor Recency dan Frequency (1-5)
+                    segments = rfm_result['segments']
+                    st.write("Segmentasi pelanggan berdasarkan skor RFM:")
+                    show_chart('rfm_segments', segments)
+                    st.dataframe(segments.rename(columns=insights.RFM_SEGMENT_COLUMNS))
+                else:
+                    st.write(insights.EMPTY_MESSAGES['rfm'])
+                
+            except Exception as e:
+                st.error(f"Error in RFM analysis: {e}")
+                st.info("Please ensure your dataset contains the required columns for RFM analysis: customer_unique_id, order_purchase_timestamp, order_id, and payment_value.")
 except Exception as e:
     st.error(f"Error loading or processing data: {e}")
-    st.info("Pastikan semua file CSV yang diperlukan berada di direktori yang sama dengan script ini.")
\ No newline at end of file
+    st.info("Pastikan semua file CSV yang diperlukan berada di direktori yang sama dengan script ini.")
+
+# Panel performa: waktu wall dan CPU, baris yang dipindai dan perubahan memori setiap fase pada rerun ini
+if config.PERF_PANEL and st.sidebar.checkbox("Show performance panel", key="performance_panel"):
+    st.sidebar.header("Performance")
+    perf_summary = instrumentation.summary(perf_records)
+    st.sidebar.dataframe(perf_summary, hide_index=True, column_config={
+        'wall_ms': st.column_config.NumberColumn(format="%.1f"),
+        'cpu_ms': st.column_config.NumberColumn(format="%.1f"),
+        'memory_mb': st.column_config.NumberColumn(format="%.1f"),
+    })
+    st.sidebar.caption(
+        f"Total wall {perf_summary['wall_ms'].sum():.0f} ms, CPU {perf_summary['cpu_ms'].sum():.0f} ms. "
+        "Fase compute yang dihitung di thread pool tercatat di thread worker."
+    )
@@ -0,0 +1,52 @@
+import numpy as np
+
+# Downsampling deret waktu/garis dengan Largest-Triangle-Three-Buckets (LTTB): titik pertama dan terakhir
+# dipertahankan, sisanya dibagi ke dalam bucket dan dari setiap bucket dipilih titik yang membentuk segitiga
+# terbesar dengan titik terpilih sebelumnya dan rata-rata bucket berikutnya. Bentuk garis (puncak dan lembah)
+# tetap terlihat walaupun jumlah titik yang dikirim ke browser dibatasi.
+
+
+# Indeks titik yang dipilih LTTB dari x (terurut naik) dan y, paling banyak n_out titik
+def lttb_indices(x, y, n_out):
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Batas bucket untuk titik di antara titik pertama dan terakhir
+    edges = np.linspace(1, n - 1, n_out - 1).astype('int64')
+    selected = np.empty(n_out, dtype='int64')
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Rata-rata bucket berikutnya (titik terakhir untuk bucket terakhir)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        next_x, next_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        # Luas (x2) segitiga titik sebelumnya, kandidat di bucket ini dan rata-rata bucket berikutnya
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+# Menurunkan jumlah titik satu deret (x, y) menjadi paling banyak max_points; nilai NaN dibuang lebih dulu
+def series(x, y, max_points):
+    x = np.asarray(x)
+    y = np.asarray(y, dtype='float64')
+    valid = ~np.isnan(y)
+    x, y = x[valid], y[valid]
+    numeric_x = x.astype('datetime64[ns]').astype('int64') if np.issubdtype(x.dtype, np.datetime64) else x
+    index = lttb_indices(numeric_x, y, max_points)
+    return x[index], y[index]
+
+
+# Baris DataFrame (terurut berdasarkan kolom x) yang dipilih LTTB dengan kolom y sebagai acuan bentuk garis
+def frame(df, x, y, max_points):
+    if len(df) <= max_points:
+        return df
+    return df.iloc[lttb_indices(df[x].to_numpy(), df[y].to_numpy(), max_points)]
@@ -0,0 +1,91 @@
+import argparse
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Eksekusi paralel bagian-bagian dashboard. Setiap bagian hanya membaca dataset, model dan cube yang sama,
+# sehingga semua bagian dapat dihitung bersamaan di thread pool dengan berbagi array numpy/pandas di memori
+# proses (tanpa menyalin atau mem-pickle DataFrame seperti pada process pool). Agregasi numpy, pandas dan
+# DuckDB melepaskan GIL selama berjalan. Hasil diambil sesuai urutan render dengan Future.result().
+
+
+# Jumlah worker: 0 berarti sebanyak jumlah bagian, paling banyak jumlah core
+def worker_count(workers, n_tasks):
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, n_tasks))
+
+
+# Thread pool untuk menghitung bagian dashboard (dipakai bersama oleh semua rerun)
+def create_pool(workers):
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='section')
+
+
+# Menjalankan fungsi secara langsung dan membungkus hasil/error-nya sebagai Future yang sudah selesai
+def _run_inline(compute, name, options):
+    future = Future()
+    try:
+        future.set_result(compute(name, **options))
+    except Exception as error:
+        future.set_exception(error)
+    return future
+
+
+# Menjadwalkan perhitungan semua bagian: tasks berisi {nama bagian: opsi}. Mengembalikan {nama bagian: Future}.
+# wrap (opsional) membungkus fungsi yang dijalankan di worker, mis. untuk memasang konteks Streamlit.
+# Tanpa pool, bagian dihitung berurutan saat dijadwalkan.
+def submit_all(pool, compute, tasks, wrap=None):
+    if pool is None:
+        return {name: _run_inline(compute, name, options) for name, options in tasks.items()}
+    task = wrap(compute) if wrap else compute
+    return {name: pool.submit(task, name, **options) for name, options in tasks.items()}
+
+
+# Membandingkan waktu menghitung semua bagian secara berurutan dan paralel serta waktu bagian paling lambat
+def measure(compute, tasks, workers=0):
+    timings = {}
+    start = time.perf_counter()
+    for name, options in tasks.items():
+        begin = time.perf_counter()
+        compute(name, **options)
+        timings[name] = time.perf_counter() - begin
+    sequential = time.perf_counter() - start
+
+    with create_pool(worker_count(workers, len(tasks))) as pool:
+        start = time.perf_counter()
+        for future in submit_all(pool, compute, tasks).values():
+            future.result()
+        parallel = time.perf_counter() - start
+
+    return {'sections': timings, 'sequential': sequential, 'parallel': parallel, 'slowest': max(timings.values())}
+
+
+def main(argv=None):
+    import sections
+    import sql_backend
+    import storage
+
+    parser = argparse.ArgumentParser(description="Perbandingan waktu perhitungan bagian dashboard berurutan vs paralel")
+    parser.add_argument('--data', default=None, help="Path dataset (default: dataset dashboard)")
+    parser.add_argument('--start', required=True, help="Tanggal awal (YYYY-MM-DD)")
+    parser.add_argument('--end', required=True, help="Tanggal akhir (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Backend SQL menghitung setiap bagian langsung dari file dataset, satu cursor DuckDB per thread
+    path = args.data or storage.dataset_path()
+    con = sql_backend.connect()
+
+    def compute(name):
+        with con.cursor() as cursor:
+            return sql_backend.compute_section(cursor, path, name, args.start, args.end)
+
+    result = measure(compute, {name: {} for name in sections.SECTIONS}, args.workers)
+    for name, seconds in result['sections'].items():
+        print(f"{name:16s} {seconds * 1000:8.1f} ms")
+    print(f"berurutan {result['sequential'] * 1000:.1f} ms, paralel {result['parallel'] * 1000:.1f} ms, "
+          f"bagian paling lambat {result['slowest'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# HyperLogLog untuk menghitung jumlah nilai unik (distinct count) secara aproksimasi.
+# Sketch disimpan jarang (sparse): satu baris untuk setiap register yang terisi, berisi rank maksimumnya,
+# sehingga sketch per (hari, kota) dapat digabung untuk rentang tanggal mana pun dengan mengambil nilai maksimum.
+
+MIN_PRECISION = 4
+MAX_PRECISION = 16
+
+
+# Presisi (jumlah bit indeks register) terkecil yang memenuhi batas error relatif (standar error 1.04 / sqrt(m))
+def precision_for_error(error):
+    precision = math.ceil(math.log2((1.04 / error) ** 2))
+    return min(max(precision, MIN_PRECISION), MAX_PRECISION)
+
+
+# Standar error relatif untuk presisi tertentu
+def relative_error(precision):
+    return 1.04 / math.sqrt(1 << precision)
+
+
+# Hash 64-bit (splitmix64) untuk nilai integer, misalnya kode ID hasil storage.encode_ids
+def hash64(values):
+    x = np.asarray(values).astype('uint64')
+    with np.errstate(over='ignore'):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+# Jumlah bit efektif setiap nilai uint64 (0 untuk nilai 0)
+def _bit_length(x):
+    length = np.zeros(x.shape, dtype='int64')
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = x >= (np.uint64(1) << np.uint64(shift))
+        length += np.where(high, shift, 0)
+        x = np.where(high, x >> np.uint64(shift), x)
+    return length + (x > 0)
+
+
+# Indeks register dan rank (posisi bit 1 pertama) dari setiap hash
+def registers(hashes, precision):
+    width = 64 - precision
+    index = (hashes >> np.uint64(width)).astype('uint16')
+    remainder = hashes & np.uint64((1 << width) - 1)
+    rank = (width - _bit_length(remainder) + 1).astype('uint8')
+    return index, rank
+
+
+# Membangun sketch harian per grup: baris (day, group, register, rank) dengan rank maksimum per register
+def build_sketches(day, groups, values, precision, group_name='group'):
+    index, rank = registers(hash64(values), precision)
+    frame = pd.DataFrame({'day': day, group_name: groups, 'register': index, 'rank': rank})
+    return frame.groupby(['day', group_name, 'register'], observed=True, sort=True)['rank'].max().reset_index()
+
+
+# Estimasi jumlah nilai unik per grup dari gabungan sketch (mis. hasil slice beberapa hari)
+def estimate(sketches, precision, group_name='group'):
+    m = 1 << precision
+    if sketches.empty:
+        return pd.Series(dtype='float64')
+
+    # Menggabungkan sketch: rank maksimum untuk setiap (grup, register)
+    group_codes, group_values = pd.factorize(sketches[group_name])
+    key = group_codes.astype('int64') * m + sketches['register'].to_numpy().astype('int64')
+    merged = pd.Series(sketches['rank'].to_numpy()).groupby(key).max()
+    merged_group = (merged.index.to_numpy() // m).astype('int64')
+    merged_rank = merged.to_numpy().astype('float64')
+
+    # Rata-rata harmonik 2^-rank; register kosong (rank 0) masing-masing bernilai 1
+    n_groups = len(group_values)
+    filled = np.bincount(merged_group, minlength=n_groups)
+    harmonic = np.bincount(merged_group, weights=np.exp2(-merged_rank), minlength=n_groups) + (m - filled)
+    raw = _alpha(m) * m * m / harmonic
+
+    # Koreksi untuk kardinalitas kecil (linear counting)
+    empty = m - filled
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(empty, 1))
+    result = np.where((raw <= 2.5 * m) & (empty > 0), linear, raw)
+    return pd.Series(result, index=pd.Index(group_values, name=group_name))
+
+
+def _alpha(m):
+    if m == 16:
+        return 0.673
+    if m == 32:
+        return 0.697
+    if m == 64:
+        return 0.709
+    return 0.7213 / (1 + 1.079 / m)
@@ -0,0 +1,210 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import chunked
+import moments
+import sections
+import time_buckets
+import time_index
+
+# Evaluasi inkremental bagian dashboard saat rentang tanggal digeser atau diperlebar. Untuk setiap bagian
+# disimpan agregat rollup aditif cube atas rentang sebelumnya sebagai array per kombinasi dimensi (tanpa day):
+# baris rollup harian diberi kode kombinasi sekali, lalu agregat rentang baru dihitung dengan menambahkan
+# np.bincount baris hari yang masuk dan mengurangkan baris hari yang keluar. Menggeser rentang satu minggu
+# hanya membaca rollup satu minggu di setiap tepinya. Record momen dikurangkan dengan menggabungkan record
+# ber-n negatif (rumus paralel tetap berlaku).
+# Agregat rentang dipakai fungsi bagian di sections.py apa adanya: setiap rollup aditif diganti agregatnya
+# dengan day = tanggal awal rentang. Metrik non-aditif (jumlah unik per kota, kuantil exact dari dataset,
+# RFM) tetap dihitung penuh oleh fungsi bagian dari dataset atau cube harian.
+
+# Rollup aditif yang dibaca setiap bagian; bagian yang tidak terdaftar selalu dihitung penuh
+SECTION_ROLLUPS = {
+    'distribution': ['payment', 'review'],
+    'category_sales': ['category'],
+    'monthly_trend': ['category'],
+    'weight_delivery': ['weight', 'weight_moments', 'delivery_sketch'],
+    'delivery_review': ['delivery_review', 'delivery_review_moments', 'delivery_review_sketch'],
+    'freight_review': ['freight', 'freight_moments'],
+}
+
+# Bagian yang membaca rollup per bucket waktu (opsi granularity), agregatnya disimpan per bucket
+TIME_BUCKET_SECTIONS = {'monthly_trend'}
+
+ONE_DAY = pd.Timedelta(days=1)
+
+
+# Kode kombinasi dimensi setiap baris rollup harian (granularity menambahkan bucket waktu sebagai dimensi
+# pertama) beserta tabel kombinasinya, dihitung sekali per rollup
+def _index(rollup, granularity=None):
+    days = rollup['day'].to_numpy()
+    measures = [col for col in rollup.columns if col in chunked.MEASURES or col in moments.COLUMNS]
+    keys = rollup.drop(columns=['day', *measures])
+    if granularity is not None:
+        keys.insert(0, 'bucket', time_buckets.bucket_codes(days, granularity))
+    index = {'days': days, 'measures': measures}
+    if keys.columns.empty:
+        # Rollup tanpa dimensi selain day (mis. momen tarif pengiriman): satu kombinasi untuk seluruh rentang
+        return {**index, 'codes': np.zeros(len(rollup), dtype='intp'), 'keys': {}, 'n_groups': 1}
+    grouped = keys.groupby(list(keys.columns), observed=True, sort=True)
+    table = grouped.size().index.to_frame(index=False)
+    return {**index, 'codes': grouped.ngroup().to_numpy(), 'n_groups': len(table),
+            'keys': {col: table[col].array for col in table.columns}}
+
+
+# Agregat baris rollup hari [start, end] per kombinasi dimensi; sign -1 untuk mengurangkan
+def _slice_aggregate(rollup, index, start, end, sign=1):
+    lo, hi = time_index.range_bounds(index['days'], start, end)
+    codes, n_groups = index['codes'][lo:hi], index['n_groups']
+    aggregate = {'records': sign * np.bincount(codes, minlength=n_groups)}
+    if 'n' in index['measures']:
+        values = [rollup[col].to_numpy(dtype='float64')[lo:hi] for col in moments.COLUMNS]
+        for position in (0, 3, 4, 5):
+            values[position] = sign * values[position]
+        aggregate.update(moments.merge_arrays(codes, n_groups, *values))
+    else:
+        for col in index['measures']:
+            aggregate[col] = sign * np.bincount(codes, weights=rollup[col].to_numpy(dtype='float64')[lo:hi],
+                                                minlength=n_groups)
+    return aggregate
+
+
+# Menggabungkan dua agregat dengan kombinasi dimensi yang sama
+def _combine(left, right):
+    combined = {'records': left['records'] + right['records']}
+    if 'n' in left:
+        n_groups = len(left['n'])
+        group = np.concatenate([np.arange(n_groups), np.arange(n_groups)])
+        combined.update(moments.merge_arrays(
+            group, n_groups, *(np.concatenate([left[col], right[col]]) for col in moments.COLUMNS)
+        ))
+    else:
+        for col in left.keys() - {'records'}:
+            combined[col] = left[col] + right[col]
+    return combined
+
+
+# Potongan rentang [start, end] yang tidak tercakup rentang [other_start, other_end] (paling banyak dua)
+def _difference(start, end, other_start, other_end):
+    pieces = []
+    if start < other_start:
+        pieces.append((start, min(end, other_start - ONE_DAY)))
+    if end > other_end:
+        pieces.append((max(start, other_end + ONE_DAY), end))
+    return pieces
+
+
+# Agregat rentang baru dari state rentang sebelumnya (atau dihitung penuh jika tidak ada state yang cocok
+# atau jumlah hari yang berubah tidak lebih sedikit dari panjang rentang baru). Kode kombinasi dipakai ulang
+# selama rollup di cube harian masih objek yang sama.
+def update(state, daily_cube, name, start_date, end_date, granularity=None):
+    start, end = pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize()
+    same_cube = (state is not None and state['granularity'] == granularity
+                 and all(state['rollups'][rollup] is daily_cube[rollup] for rollup in SECTION_ROLLUPS[name]))
+    if same_cube and state['start'] <= end and start <= state['end']:
+        added = _difference(start, end, state['start'], state['end'])
+        removed = _difference(state['start'], state['end'], start, end)
+        changed_days = sum((last - first).days + 1 for first, last in added + removed)
+        if changed_days < (end - start).days + 1:
+            aggregates = {}
+            for rollup, aggregate in state['aggregates'].items():
+                for sign, pieces in ((1, added), (-1, removed)):
+                    for first, last in pieces:
+                        delta = _slice_aggregate(daily_cube[rollup], state['indexes'][rollup], first, last, sign)
+                        aggregate = _combine(aggregate, delta)
+                aggregates[rollup] = aggregate
+            return {**state, 'start': start, 'end': end, 'aggregates': aggregates, 'delta_days': changed_days}
+
+    rollups = {rollup: daily_cube[rollup] for rollup in SECTION_ROLLUPS[name]}
+    indexes = state['indexes'] if same_cube else {
+        rollup: _index(frame, granularity) for rollup, frame in rollups.items()
+    }
+    aggregates = {
+        rollup: _slice_aggregate(frame, indexes[rollup], start, end) for rollup, frame in rollups.items()
+    }
+    return {'start': start, 'end': end, 'granularity': granularity, 'rollups': rollups, 'indexes': indexes,
+            'aggregates': aggregates, 'delta_days': None}
+
+
+# Cube untuk fungsi bagian: rollup aditif diganti agregat rentang untuk kombinasi dimensi yang memiliki data
+# (day = awal rentang, atau awal bucket waktu yang dipotong ke awal rentang untuk tren), rollup lain tetap
+# dari cube harian. Ukuran dikembalikan ke tipe kolom rollup harian.
+def range_cube(daily_cube, state):
+    result = dict(daily_cube)
+    for rollup, aggregate in state['aggregates'].items():
+        index = state['indexes'][rollup]
+        present = aggregate['records'] > 0
+        columns = {col: values[present] for col, values in index['keys'].items()}
+        if state['granularity'] is not None:
+            starts = time_buckets.bucket_starts(np.asarray(columns.pop('bucket')), state['granularity'])
+            day = np.maximum(starts, state['start'].to_datetime64())
+        else:
+            day = np.full(present.sum(), state['start'].to_datetime64())
+        frame = pd.DataFrame({'day': day, **columns, **{
+            col: aggregate[col][present].astype(daily_cube[rollup][col].dtype) for col in index['measures']
+        }})
+        result[rollup] = frame
+    return result
+
+
+# Menghitung satu bagian dashboard; store (dict per sesi) menyimpan state inkremental setiap bagian
+def compute(store, name, final_df, data_model, daily_cube, start_date, end_date, **options):
+    if name not in SECTION_ROLLUPS:
+        return sections.SECTIONS[name](final_df, data_model, daily_cube, start_date, end_date, **options)
+    granularity = options.get('granularity', 'month') if name in TIME_BUCKET_SECTIONS else None
+    state = update(store.get(name), daily_cube, name, start_date, end_date, granularity)
+    store[name] = state
+    return sections.SECTIONS[name](final_df, data_model, range_cube(daily_cube, state), start_date, end_date, **options)
+
+
+# Waktu rata-rata per langkah saat jendela tanggal digeser `step` hari: dihitung penuh vs inkremental
+def measure(final_df, data_model, daily_cube, start_date, window_days, step_days, steps, options):
+    timings = {}
+    for name in SECTION_ROLLUPS:
+        full = incremental = 0.0
+        store = {}
+        start = pd.Timestamp(start_date)
+        compute(store, name, final_df, data_model, daily_cube, start, start + pd.Timedelta(days=window_days - 1),
+                **options.get(name, {}))
+        for _ in range(steps):
+            start += pd.Timedelta(days=step_days)
+            end = start + pd.Timedelta(days=window_days - 1)
+            begin = time.perf_counter()
+            sections.SECTIONS[name](final_df, data_model, daily_cube, start, end, **options.get(name, {}))
+            full += time.perf_counter() - begin
+            begin = time.perf_counter()
+            compute(store, name, final_df, data_model, daily_cube, start, end, **options.get(name, {}))
+            incremental += time.perf_counter() - begin
+        timings[name] = {'full': full / steps, 'incremental': incremental / steps}
+    return timings
+
+
+def main(argv=None):
+    import cube
+    import model
+    import storage
+
+    parser = argparse.ArgumentParser(description="Waktu perhitungan bagian dashboard saat rentang tanggal digeser")
+    parser.add_argument('--data', default=None, help="Path dataset (default: dataset dashboard)")
+    parser.add_argument('--start', required=True, help="Tanggal awal jendela pertama (YYYY-MM-DD)")
+    parser.add_argument('--window', type=int, default=365, help="Panjang jendela (hari)")
+    parser.add_argument('--step', type=int, default=7, help="Pergeseran per langkah (hari)")
+    parser.add_argument('--steps', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    path = args.data or storage.dataset_path()
+    df = storage.read_columns(path, storage.BUILD_COLUMNS)
+    df = time_index.sort_by_time(storage.encode_ids(df)[0])
+    data_model = model.build_model(df)
+    daily_cube = cube.build_cube(df, data_model)
+
+    options = {'distribution': {'distinct': 'approx'}}
+    timings = measure(df, data_model, daily_cube, args.start, args.window, args.step, args.steps, options)
+    for name, timing in timings.items():
+        print(f"{name:16s} penuh {timing['full'] * 1000:8.1f} ms, inkremental {timing['incremental'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+from textwrap import dedent
+
+import time_buckets
+
+# Teks insight dinamis setiap bagian dashboard (Markdown) yang dibuat dari hasil perhitungan di sections.py.
+# Dipakai oleh dashboard Streamlit dan report.py agar teks laporan sama dengan yang tampil di dashboard.
+
+# Pesan jika data pada rentang tanggal yang dipilih tidak cukup
+EMPTY_MESSAGES = {
+    'category_sales': "Kolom yang diperlukan tidak ditemukan. Pastikan 'product_category_name_english' dan 'payment_value' tersedia.",
+    'weight_delivery': "Tidak cukup data untuk menampilkan visualisasi dalam periode yang dipilih.",
+    'delivery_review': "Tidak cukup data pengiriman untuk analisis dalam periode yang dipilih.",
+    'delivery_review_trend': "Tidak cukup data untuk menampilkan tren review dalam periode yang dipilih.",
+    'freight_review': "Tidak cukup data untuk analisis pengaruh tarif pengiriman dalam periode yang dipilih.",
+    'rfm': "Tidak cukup data untuk analisis RFM dalam periode yang dipilih.",
+}
+
+RFM_INTRO = dedent("""
+    **RFM Analysis** adalah teknik segmentasi pelanggan yang ampuh untuk mengidentifikasi pelanggan yang paling berharga berdasarkan tiga metrik utama:
+
+    * Recency: Seberapa baru pelanggan melakukan pembelian (kebaruan transaksi)
+    * Frequency: Seberapa sering pelanggan melakukan pembelian (frekuensi transaksi)
+    * Monetary: Seberapa banyak uang yang dibelanjakan oleh pelanggan (nilai moneter)
+    Analisis ini membantu bisnis mengembangkan strategi pemasaran yang ditargetkan untuk berbagai segmen pelanggan yang berbeda. Dengan memahami perilaku pembelian pelanggan, bisnis dapat meningkatkan retensi pelanggan, meningkatkan loyalitas, dan mengoptimalkan pengalaman pelanggan.
+    """)
+
+# Nama kolom tabel segmentasi RFM yang ditampilkan
+RFM_SEGMENT_COLUMNS = {
+    'customers': 'Jumlah Pelanggan',
+    'revenue': 'Total Pendapatan ($)',
+    'revenue_share': 'Porsi Pendapatan (%)',
+}
+
+
+# ===== METRIK DISTRIBUSI =====
+# Insight untuk setiap grafik distribusi: {'sellers_by_city', 'customers_by_city', 'payment_types', 'review_scores'}
+def distribution(result):
+    sellers_by_city = result['sellers_by_city']
+    top_seller_city = sellers_by_city.index[0] if not sellers_by_city.empty else "N/A"
+    top_seller_count = sellers_by_city.iloc[0] if not sellers_by_city.empty else 0
+    second_seller_count = sellers_by_city.iloc[1] if len(sellers_by_city) > 1 else 0
+
+    customers_by_city = result['customers_by_city']
+    top_customer_city = customers_by_city.index[0] if not customers_by_city.empty else "N/A"
+
+    payment_types = result['payment_types']
+    top_payment = payment_types.index[0] if not payment_types.empty else "N/A"
+    top_payment_count = payment_types.iloc[0] if not payment_types.empty else 0
+    top_payment_pct = (top_payment_count / payment_types.sum() * 100) if not payment_types.empty and payment_types.sum() > 0 else 0
+
+    review_scores = result['review_scores']
+    total_reviews = review_scores.sum() if not review_scores.empty else 0
+    positive_reviews = review_scores.get(4, 0) + review_scores.get(5, 0)
+    negative_reviews = review_scores.get(1, 0) + review_scores.get(2, 0)
+    positive_pct = (positive_reviews / total_reviews * 100) if total_reviews > 0 else 0
+    negative_pct = (negative_reviews / total_reviews * 100) if total_reviews > 0 else 0
+
+    return {
+        'sellers_by_city': dedent(f"""
+            **Insight:**
+            Kota dengan penjual terbanyak adalah {top_seller_city} sebanyak {top_seller_count} yang berbeda cukup jauh dengan kota dibawahnya {second_seller_count}.
+            Hal ini terlihat bahwa penjual terpusat di kota {top_seller_city}.
+            """),
+        'customers_by_city': dedent(f"""
+            **Insight:**
+            Kota dengan pembeli paling banyak adalah di kota {top_customer_city} yang {'juga sama dengan' if top_customer_city == top_seller_city else 'berbeda dari'} kota yang memiliki penjual terbanyak.
+            """),
+        'payment_types': dedent(f"""
+            **Insight:**
+            Jenis pembayaran yang paling sering digunakan pada aplikasi e-commerce adalah {top_payment}
+            ({top_payment_count} transaksi, {top_payment_pct:.1f}% dari total)
+            """),
+        'review_scores': dedent(f"""
+            **Insight:**
+            {positive_pct:.1f}% pembeli puas dengan barang yang mereka beli (skor 4-5),
+            sementara {negative_pct:.1f}% pembeli tidak puas (skor 1-2) dalam periode yang dipilih.
+            """),
+    }
+
+
+# ===== KATEGORI PRODUK DENGAN PENJUALAN TERTINGGI =====
+def category_sales(result):
+    top_categories = result['top_categories']
+    top_category = top_categories['product_category_name_english'].iloc[0] if not top_categories.empty else "N/A"
+    top_category_sales = top_categories['payment_value'].iloc[0] if not top_categories.empty else 0
+    second_category = top_categories['product_category_name_english'].iloc[1] if len(top_categories) > 1 else "N/A"
+    second_category_sales = top_categories['payment_value'].iloc[1] if len(top_categories) > 1 else 0
+    third_category = top_categories['product_category_name_english'].iloc[2] if len(top_categories) > 2 else "N/A"
+    third_category_sales = top_categories['payment_value'].iloc[2] if len(top_categories) > 2 else 0
+    lowest_category = top_categories['product_category_name_english'].iloc[-1] if len(top_categories) > 0 else "N/A"
+    lowest_category_sales = top_categories['payment_value'].iloc[-1] if len(top_categories) > 0 else 0
+
+    return dedent(f"""
+        **Insight:**
+        * Kategori {top_category} memimpin dengan penjualan tertinggi (${top_category_sales:,.2f}),
+          {'jauh di atas' if top_category_sales > 1.5*second_category_sales else 'diikuti oleh'} kategori lainnya
+        * Produk {second_category} (${second_category_sales:,.2f}) dan {third_category} (${third_category_sales:,.2f}) melengkapi tiga besar.
+        * Terdapat kesenjangan {'besar' if top_category_sales > 3*lowest_category_sales else 'kecil'} antara kategori teratas dan terbawah,
+          dengan {lowest_category} hanya mencapai sekitar ${lowest_category_sales:,.2f}.
+        * Konsumen lebih banyak membelanjakan uang untuk kategori {top_category} dibanding kategori lainnya dalam periode yang dipilih.
+        """)
+
+
+# ===== TREN PENJUALAN BULANAN =====
+def monthly_trend(result):
+    top_5_categories = result['top_5_categories']
+    pivot_data = result['pivot_data']
+    trend_insights = []
+
+    # Mengidentifikasi kategori dengan pertumbuhan paling konsisten
+    if not pivot_data.empty and len(pivot_data) > 1:
+        # Menghitung rata-rata perubahan untuk setiap kategori
+        category_trends = {}
+        for category in top_5_categories:
+            if category in pivot_data.columns:
+                category_data = pivot_data[category].dropna()
+                if len(category_data) > 1:
+                    pct_changes = category_data.pct_change().dropna()
+                    avg_change = pct_changes.mean()
+                    category_trends[category] = avg_change
+
+        # Kategori dengan pertumbuhan paling konsisten (positif)
+        consistent_growth = max(category_trends.items(), key=lambda x: x[1]) if category_trends else (None, 0)
+
+        # Kategori dengan volatilitas tertinggi
+        volatility = {category: pivot_data[category].std() / pivot_data[category].mean()
+                      for category in top_5_categories if category in pivot_data.columns and not pivot_data[category].isna().all()}
+        most_volatile = max(volatility.items(), key=lambda x: x[1]) if volatility else (None, 0)
+
+        # Kategori dengan nilai puncak tertinggi
+        peak_values = {category: pivot_data[category].max()
+                      for category in top_5_categories if category in pivot_data.columns and not pivot_data[category].isna().all()}
+        highest_peak = max(peak_values.items(), key=lambda x: x[1]) if peak_values else (None, 0)
+
+        # Menambahkan insight berdasarkan analisis
+        if consistent_growth[0]:
+            trend_insights.append(f"* Kategori {consistent_growth[0]} menunjukkan {'pertumbuhan' if consistent_growth[1] > 0 else 'penurunan'} paling konsisten.")
+
+        if most_volatile[0]:
+            trend_insights.append(f"* {most_volatile[0]} menampilkan volatilitas tinggi.")
+
+        if highest_peak[0]:
+            month_of_peak = time_buckets.label(pivot_data[highest_peak[0]].idxmax(), result.get('granularity', 'month'))
+            trend_insights.append(f"* {highest_peak[0]} mencapai puncak sekitar {highest_peak[1]:.2f} pada {month_of_peak}.")
+
+    # Jika tidak bisa menghitung insight spesifik, berikan insight umum
+    if not trend_insights:
+        trend_insights = ["* Data tidak cukup untuk menganalisis tren penjualan dalam periode yang dipilih."]
+
+    return "\n**Insight:**\n" + '\n'.join(trend_insights)
+
+
+# ===== BERAT PRODUK VS WAKTU PENGIRIMAN =====
+def weight_delivery(result):
+    weight_stats = result['weight_stats']
+    overall_mean = result['overall_mean']
+    valid_count = result['valid_count']
+    correlation = result['correlation']
+
+    heaviest_category = weight_stats['weight_category'].iloc[-1] if len(weight_stats) > 0 else "N/A"
+    heaviest_delivery_time = weight_stats['mean_days'].iloc[-1] if len(weight_stats) > 0 else 0
+
+    # Cari kategori dengan waktu pengiriman tercepat
+    fastest_idx = weight_stats['mean_days'].idxmin() if not weight_stats['mean_days'].empty else None
+    fastest_category = weight_stats['weight_category'].iloc[fastest_idx] if fastest_idx is not None else "N/A"
+    fastest_time = weight_stats['mean_days'].iloc[fastest_idx] if fastest_idx is not None else 0
+
+    # Cari kategori dengan waktu pengiriman terlama
+    slowest_idx = weight_stats['mean_days'].idxmax() if not weight_stats['mean_days'].empty else None
+    slowest_category = weight_stats['weight_category'].iloc[slowest_idx] if slowest_idx is not None else "N/A"
+    slowest_time = weight_stats['mean_days'].iloc[slowest_idx] if slowest_idx is not None else 0
+
+    return dedent(f"""
+        **Insight:**
+        * {'Terdapat' if correlation > 0.05 else 'Tidak terdapat'} tren peningkatan waktu pengiriman seiring bertambahnya berat produk, dengan produk terberat ({heaviest_category}) membutuhkan waktu pengiriman {'terlama' if heaviest_delivery_time == slowest_time else ''} yaitu {heaviest_delivery_time:.1f} hari
+        * Produk {fastest_category} memiliki waktu pengiriman tercepat yaitu {fastest_time:.1f} hari, dengan selisih {abs(slowest_time - fastest_time):.1f} hari dibandingkan produk {slowest_category}
+        * Korelasi antara berat produk dan waktu pengiriman tergolong {'kuat' if abs(correlation) > 0.5 else 'sedang' if abs(correlation) > 0.3 else 'lemah'} ({correlation:.3f}), menunjukkan bahwa berat produk {'adalah' if abs(correlation) > 0.5 else 'bukan'} faktor dominan yang mempengaruhi waktu pengiriman; berdasarkan regresi linear, setiap tambahan 1 kg berat produk mengubah waktu pengiriman sebesar {result['days_per_kg']:+.2f} hari
+        * Rata-rata keseluruhan waktu pengiriman adalah {overall_mean:.1f} hari berdasarkan analisis dari {valid_count:,} pesanan yang telah terkirim dalam periode yang dipilih
+        """)
+
+
+# ===== WAKTU PENGIRIMAN VS SKOR REVIEW =====
+def delivery_review(result):
+    category_avg = result['category_avg']
+    overall_mean = result['overall_mean']
+    correlation = result['correlation']
+
+    # Cari kategori dengan rating tertinggi dan terendah
+    highest_rating_category = category_avg.idxmax() if not category_avg.empty else None
+    highest_rating = category_avg.loc[highest_rating_category] if highest_rating_category is not None else 0
+
+    lowest_rating_category = category_avg.idxmin() if not category_avg.empty else None
+    lowest_rating = category_avg.loc[lowest_rating_category] if lowest_rating_category is not None else 0
+
+    return dedent(f"""
+        **Insight:**
+        * {'Terdapat' if correlation < -0.1 else 'Tidak terdapat'} hubungan negatif yang jelas antara waktu pengiriman dan kepuasan pelanggan. {'Semakin lama waktu pengiriman, semakin rendah rating review yang diberikan' if correlation < -0.1 else ''}
+        * Pengiriman {highest_rating_category} mendapatkan rating tertinggi dengan rata-rata {highest_rating:.2f}, sementara pengiriman {lowest_rating_category} mendapatkan rating terendah dengan rata-rata {lowest_rating:.2f}
+        * Korelasi negatif sebesar {correlation:.3f} {'mengkonfirmasi adanya hubungan yang cukup kuat' if correlation < -0.2 else 'menunjukkan adanya hubungan yang lemah'} antara keterlambatan pengiriman dan penurunan kepuasan pelanggan; setiap tambahan satu minggu waktu pengiriman mengubah rata-rata review sebesar {result['score_per_week']:+.2f}
+        * Rata-rata keseluruhan review adalah {overall_mean:.2f}, yang menunjukkan bahwa {'mayoritas pelanggan masih memberikan rating positif' if overall_mean > 3.5 else 'pelanggan cenderung memberikan rating netral'} dalam periode yang dipilih
+        """)
+
+
+# ===== PENGARUH TARIF PENGIRIMAN TERHADAP KEPUASAN PELANGGAN =====
+def freight_review(result):
+    avg_ratings = result['avg_ratings']
+    order_counts = result['order_counts']
+    correlation = result['correlation']
+
+    # Cari kategori dengan rating tertinggi dan terendah
+    highest_rating_category = avg_ratings.idxmax() if not avg_ratings.empty else None
+    highest_rating = avg_ratings.loc[highest_rating_category] if highest_rating_category is not None else 0
+
+    lowest_rating_category = avg_ratings.idxmin() if not avg_ratings.empty else None
+    lowest_rating = avg_ratings.loc[lowest_rating_category] if lowest_rating_category is not None else 0
+
+    # Menghitung persentase pesanan di bawah tarif 50
+    below_50_count = order_counts.get("0-15", 0) + order_counts.get("15-30", 0) + order_counts.get("30-50", 0)
+    total_orders = order_counts.sum()
+    below_50_pct = (below_50_count / total_orders * 100) if total_orders > 0 else 0
+
+    return dedent(f"""
+        **Insight:**
+        * {'Terdapat trend bahwa semakin tinggi tarif pengiriman, semakin rendah tingkat kepuasan pelanggan' if correlation < -0.1 else 'Tidak ada tren yang jelas antara tarif pengiriman dan kepuasan pelanggan'} dalam periode yang dipilih (korelasi {correlation:.3f}, review berubah {result['score_per_10_freight']:+.3f} untuk setiap tambahan tarif 10)
+        * Pesanan dengan tarif {highest_rating_category} memiliki rating tertinggi (rata-rata {highest_rating:.1f})
+        * {'Tarif ' + lowest_rating_category + ' menyebabkan penurunan signifikan pada kepuasan (rata-rata ' + str(lowest_rating) + ')' if lowest_rating < 3.8 else 'Semua kategori tarif mendapatkan rating yang relatif tinggi'}
+        * Mayoritas pesanan ({below_50_pct:.1f}%) menggunakan tarif pengiriman di bawah 50 dalam periode yang dipilih
+        """)
+
+
+# ===== RFM ANALYSIS =====
+# Lima pelanggan teratas untuk setiap dimensi RFM (grafik RFM dan insight-nya)
+def rfm_top5(rfm_df):
+    return (
+        rfm_df.sort_values(by="recency", ascending=True).head(5),
+        rfm_df.sort_values(by="frequency", ascending=False).head(5),
+        rfm_df.sort_values(by="monetary", ascending=False).head(5),
+    )
+
+
+def rfm(recency_top5, frequency_top5, monetary_top5, start_date, end_date):
+    recency_top_id = recency_top5['customer_id'].iloc[0] if not recency_top5.empty else "N/A"
+    recency_top_val = recency_top5['recency'].iloc[0] if not recency_top5.empty else 0
+    recency_diff = recency_top5['recency'].iloc[-1] - recency_top5['recency'].iloc[0] if len(recency_top5) > 1 else 0
+
+    frequency_top_id = frequency_top5['customer_id'].iloc[0] if not frequency_top5.empty else "N/A"
+    frequency_top_val = frequency_top5['frequency'].iloc[0] if not frequency_top5.empty else 0
+    frequency_next_val = frequency_top5['frequency'].iloc[1] if len(frequency_top5) > 1 else 0
+
+    monetary_top_id = monetary_top5['customer_id'].iloc[0] if not monetary_top5.empty else "N/A"
+    monetary_top_val = monetary_top5['monetary'].iloc[0] if not monetary_top5.empty else 0
+    monetary_next_val = monetary_top5['monetary'].iloc[1] if len(monetary_top5) > 1 else 0
+    monetary_ratio = monetary_top_val / monetary_next_val if monetary_next_val > 0 else 0
+
+    return dedent(f"""
+        **Insight RFM untuk periode {start_date} hingga {end_date}:**
+        * **Recency**: Pelanggan teratas ({recency_top_id}) baru saja berbelanja ({recency_top_val} hari yang lalu)
+          {f'Terdapat perbedaan sebesar {recency_diff} hari antara pelanggan teratas dengan pelanggan lainnya' if recency_diff > 5 else ''}
+        * **Frequency**: Pelanggan dengan frekuensi tertinggi ({frequency_top_id}) melakukan sekitar {frequency_top_val} pembelian
+          {f'yang jauh lebih tinggi dibandingkan pelanggan berikutnya ({frequency_next_val} pembelian)' if frequency_top_val > frequency_next_val*1.5 else ''}
+        * **Monetary**: Pelanggan dengan nilai belanja tertinggi ({monetary_top_id}) menghabiskan sekitar ${monetary_top_val:,.2f}
+          {f'(sekitar {monetary_ratio:.1f}x lipat dari pelanggan berikutnya)' if monetary_ratio > 1.5 else ''}
+        * {'Tidak ada pelanggan yang unggul di semua dimensi RFM, menunjukkan segmentasi pelanggan yang berbeda berdasarkan perilaku pembelian mereka.' if recency_top_id != frequency_top_id or frequency_top_id != monetary_top_id else 'Ada pelanggan yang unggul di beberapa dimensi RFM, menunjukkan adanya pelanggan high-value yang konsisten.'}
+        """)
@@ -0,0 +1,149 @@
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+import chunked
+
+# Instrumentasi performa setiap bagian dashboard: waktu (wall dan CPU thread), jumlah baris yang dipindai
+# dan perubahan memori untuk setiap fase (compute, wait, render). Setiap pengukuran dikirim ke daftar milik
+# satu rerun (panel performa), ke log terstruktur (JSON per baris) dan ke total kumulatif yang dapat dibaca
+# scraper Prometheus melalui endpoint HTTP /metrics.
+# Perubahan memori diukur untuk seluruh proses (RSS atau alokasi tracemalloc), bukan per thread: jika bagian
+# dihitung paralel (SECTION_WORKERS selain 1) nilainya ikut memuat alokasi bagian lain dan dapat negatif.
+
+logger = logging.getLogger('dashboard.perf')
+
+# Total kumulatif (dan perubahan memori terakhir) per (bagian, fase) untuk endpoint Prometheus
+_totals = {}
+_totals_lock = threading.Lock()
+
+# Pengukuran yang sedang berjalan di thread ini; waktu pengukuran bertingkat tidak dihitung pada induknya
+_active = threading.local()
+
+# Perubahan memori dapat negatif sehingga diekspor sebagai gauge berisi nilai pengukuran terakhir
+METRICS = [
+    ('runs', 'dashboard_section_runs_total', 'counter', 'Jumlah pengukuran'),
+    ('wall_seconds', 'dashboard_section_wall_seconds_total', 'counter', 'Total waktu wall (detik)'),
+    ('cpu_seconds', 'dashboard_section_cpu_seconds_total', 'counter', 'Total waktu CPU thread (detik)'),
+    ('rows', 'dashboard_section_rows_scanned_total', 'counter', 'Total baris dataset yang dipindai'),
+    ('memory_mb', 'dashboard_section_memory_mb', 'gauge',
+     'Perubahan memori proses pada pengukuran terakhir (MB, termasuk thread lain)'),
+]
+
+
+# Memori saat ini dalam MB: alokasi Python/numpy jika tracemalloc aktif, jika tidak resident set size proses
+def _memory_mb():
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0] / 1e6
+    return chunked.current_memory_mb()
+
+
+# Mengukur satu fase bagian dashboard. rows adalah jumlah baris dataset yang dicakup fase tersebut,
+# sink (opsional) adalah list tempat hasil pengukuran ditambahkan.
+@contextmanager
+def measure(section, phase, rows=None, sink=None):
+    stack = getattr(_active, 'stack', None)
+    if stack is None:
+        stack = _active.stack = []
+    record = {'section': section, 'phase': phase, 'rows': rows, 'excluded_wall': 0.0, 'excluded_cpu': 0.0}
+    stack.append(record)
+    start_wall, start_cpu, start_memory = time.perf_counter(), time.thread_time(), _memory_mb()
+    try:
+        yield record
+    finally:
+        wall = time.perf_counter() - start_wall
+        cpu = time.thread_time() - start_cpu
+        stack.pop()
+        if stack:
+            stack[-1]['excluded_wall'] += wall
+            stack[-1]['excluded_cpu'] += cpu
+        record['wall_seconds'] = wall - record.pop('excluded_wall')
+        record['cpu_seconds'] = cpu - record.pop('excluded_cpu')
+        record['memory_mb'] = _memory_mb() - start_memory
+        record['thread'] = threading.current_thread().name
+        _publish(record, sink)
+
+
+def _publish(record, sink):
+    if sink is not None:
+        sink.append(record)
+    with _totals_lock:
+        totals = _totals.setdefault((record['section'], record['phase']), dict.fromkeys(
+            ['runs', 'wall_seconds', 'cpu_seconds', 'rows', 'memory_mb'], 0
+        ))
+        totals['runs'] += 1
+        totals['wall_seconds'] += record['wall_seconds']
+        totals['cpu_seconds'] += record['cpu_seconds']
+        totals['rows'] += record['rows'] or 0
+        totals['memory_mb'] = record['memory_mb']
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({'event': 'section_phase', **record}, default=str))
+
+
+# Tabel hasil pengukuran satu rerun untuk panel performa
+def summary(records):
+    columns = ['section', 'phase', 'wall_ms', 'cpu_ms', 'rows', 'memory_mb', 'thread']
+    if not records:
+        return pd.DataFrame(columns=columns)
+    frame = pd.DataFrame(list(records))
+    frame['wall_ms'] = frame['wall_seconds'] * 1000
+    frame['cpu_ms'] = frame['cpu_seconds'] * 1000
+    return frame[columns]
+
+
+# Total kumulatif dalam format teks eksposisi Prometheus
+def prometheus_text():
+    with _totals_lock:
+        totals = {key: dict(values) for key, values in _totals.items()}
+    lines = []
+    for field, name, kind, description in METRICS:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (section, phase), values in sorted(totals.items()):
+            lines.append(f'{name}{{section="{section}",phase="{phase}"}} {values[field]:.6g}')
+    lines.append("# HELP dashboard_process_memory_mb Resident set size proses (MB)")
+    lines.append("# TYPE dashboard_process_memory_mb gauge")
+    lines.append(f"dashboard_process_memory_mb {chunked.current_memory_mb():.6g}")
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Menjalankan endpoint /metrics di thread latar belakang (hanya untuk scraper lokal)
+def start_metrics_server(port, host='127.0.0.1'):
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    return server
+
+
+# Mengaktifkan log terstruktur ("-" untuk stderr, atau path file) dan pelacakan alokasi memori dengan tracemalloc
+def configure(log_target=None, trace_memory=False):
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if not log_target or logger.handlers:
+        return
+    handler = logging.StreamHandler() if log_target == '-' else logging.FileHandler(log_target)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
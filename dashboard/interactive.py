@@ -0,0 +1,133 @@
+import numpy as np
+import plotly.graph_objects as go
+from plotly.colors import sample_colorscale
+from plotly.subplots import make_subplots
+
+import downsample
+import time_buckets
+
+# Versi interaktif (Plotly) untuk grafik dengan garis/titik: tren penjualan, waktu pengiriman vs review dan
+# tarif pengiriman vs review. Grafik dirender di browser (trace garis/titik memakai WebGL) dari data yang sudah
+# diagregasi; setiap deret diturunkan dengan LTTB menjadi paling banyak max_points titik sehingga ukuran
+# payload terbatas berapa pun panjang rentang tanggalnya. Argumen sama dengan grafik di charts.py.
+
+# Jumlah titik maksimum per deret
+DEFAULT_MAX_POINTS = 500
+
+
+# ===== TREN PENJUALAN BULANAN =====
+def monthly_trend_figure(pivot_data, top_5_categories, granularity='month', max_points=DEFAULT_MAX_POINTS):
+    title, axis_label = time_buckets.TITLES[granularity]
+    fig = go.Figure()
+    for category in top_5_categories:
+        if category in pivot_data.columns:
+            x, y = downsample.series(pivot_data.index.to_numpy(), pivot_data[category].to_numpy(), max_points)
+            fig.add_trace(go.Scattergl(x=x, y=y, mode='lines+markers', name=str(category), marker={'size': 5}))
+    fig.update_layout(
+        title=f'{title} Sales Trends for Top 5 Product Categories',
+        xaxis_title=axis_label,
+        yaxis_title='Total Sales ($)',
+        height=550,
+    )
+    return fig
+
+
+# ===== WAKTU PENGIRIMAN VS SKOR REVIEW =====
+def delivery_review_figure(box_data, category_avg, review_by_delivery, overall_mean, correlation,
+                           max_points=DEFAULT_MAX_POINTS):
+    fig = make_subplots(rows=2, cols=1, vertical_spacing=0.12, subplot_titles=(
+        'Distribusi Review Core berdasarkan Kategori Waktu Pengiriman',
+        'Tren Ewview Score berdasarkan Waktu Pengiriman',
+    ))
+
+    # Boxplot dari statistik yang sudah dihitung (kuartil, whisker dan outlier unik per kategori)
+    colors = sample_colorscale('Viridis', np.linspace(0, 1, len(box_data))) if box_data else []
+    for stats, color in zip(box_data, colors):
+        fig.add_trace(go.Box(
+            x=[stats['label']], q1=[stats['q1']], median=[stats['med']], q3=[stats['q3']],
+            lowerfence=[stats['whislo']], upperfence=[stats['whishi']],
+            name=stats['label'], fillcolor=color, line={'color': 'black'}, showlegend=False
+        ), row=1, col=1)
+        fliers = np.unique(stats['fliers'])
+        if len(fliers):
+            fig.add_trace(go.Scattergl(
+                x=[stats['label']] * len(fliers), y=fliers, mode='markers',
+                marker={'symbol': 'diamond', 'color': color}, showlegend=False, hoverinfo='y'
+            ), row=1, col=1)
+    for category in category_avg.index:
+        fig.add_annotation(
+            x=category, y=5.3, text=f'Rata-rata: {category_avg[category]:.2f}',
+            showarrow=False, bgcolor='white', row=1, col=1
+        )
+
+    # Rata-rata review per waktu pengiriman dengan interval kepercayaan 95% (±1.96 SE)
+    trend = downsample.frame(review_by_delivery, 'delivery_time_mid', 'mean', max_points)
+    x = trend['delivery_time_mid'].to_numpy()
+    fig.add_trace(go.Scattergl(
+        x=x, y=(trend['mean'] + 1.96 * trend['se']).to_numpy(), mode='lines', line={'width': 0},
+        showlegend=False, hoverinfo='skip'
+    ), row=2, col=1)
+    fig.add_trace(go.Scattergl(
+        x=x, y=(trend['mean'] - 1.96 * trend['se']).to_numpy(), mode='lines', line={'width': 0},
+        fill='tonexty', fillcolor='rgba(51, 102, 204, 0.2)', showlegend=False, hoverinfo='skip'
+    ), row=2, col=1)
+    fig.add_trace(go.Scattergl(
+        x=x, y=trend['mean'].to_numpy(), mode='lines+markers', name='Rata-rata review',
+        line={'color': '#3366cc', 'width': 2},
+        marker={
+            'size': (trend['count'] / review_by_delivery['count'].max() * 20 + 6).to_numpy(),
+            'color': trend['count'].to_numpy(), 'colorscale': 'Viridis', 'line': {'color': 'black', 'width': 1},
+            'colorbar': {'title': 'Jumlah Pesanan', 'y': 0.22, 'len': 0.45},
+        },
+        customdata=trend['count'].to_numpy(),
+        hovertemplate='%{x} hari: %{y:.2f} (%{customdata} pesanan)<extra></extra>'
+    ), row=2, col=1)
+    fig.add_hline(
+        y=overall_mean, line={'color': 'red', 'dash': 'dash'}, opacity=0.7, row=2, col=1,
+        annotation_text=f'Rata-rata keseluruhan: {overall_mean:.2f}'
+    )
+    fig.add_annotation(
+        x=0.02, y=0.05, xref='x2 domain', yref='y2 domain', text=f'Correlation: {correlation:.3f}',
+        showarrow=False, bgcolor='white'
+    )
+
+    fig.update_yaxes(title_text='Review Score (1-5)', range=[0.5, 5.5], row=1, col=1)
+    fig.update_xaxes(title_text='Kategori Waktu Pengiriman', row=1, col=1)
+    fig.update_yaxes(title_text='Rata-rata Review Score', range=[3.0, 5.0], row=2, col=1)
+    fig.update_xaxes(title_text='Waktu Pengiriman (hari)', row=2, col=1)
+    fig.update_layout(height=900, showlegend=False)
+    return fig
+
+
+# ===== PENGARUH TARIF PENGIRIMAN TERHADAP KEPUASAN PELANGGAN =====
+# Jumlah batang sudah terbatas (kategori tarif) sehingga max_points tidak dipakai
+def freight_review_figure(avg_ratings, order_counts, correlation, max_points=DEFAULT_MAX_POINTS):
+    categories = [str(category) for category in avg_ratings.index]
+    # Gradasi warna dari hijau ke merah sesuai urutan tarif
+    colors = sample_colorscale('RdYlGn', np.linspace(1, 0, len(categories))) if categories else []
+    fig = go.Figure(go.Bar(
+        x=categories, y=avg_ratings.to_numpy(), marker={'color': colors, 'line': {'color': 'black', 'width': 1.5}},
+        opacity=0.8, text=[f'{rating:.1f}' for rating in avg_ratings], textposition='outside',
+        customdata=order_counts.to_numpy(),
+        hovertemplate='Tarif %{x}: %{y:.2f} (%{customdata} orders)<extra></extra>'
+    ))
+    for category, count in zip(categories, order_counts):
+        fig.add_annotation(x=category, y=0.5, text=f'{count} orders', showarrow=False, font={'size': 12})
+    fig.add_annotation(
+        x=0.98, y=0.98, xref='paper', yref='paper', text=f'Korelasi: {correlation:.2f}',
+        showarrow=False, bgcolor='white', xanchor='right', yanchor='top'
+    )
+    fig.update_layout(
+        title='Pengaruh Tarif Pengiriman terhadap kepuasan pelanggan',
+        xaxis_title='Tarif Pengiriman (R$)',
+        yaxis={'title': 'Rata-rata Review Score (1-5)', 'range': [0, 5], 'tickformat': '.1f'},
+        height=550,
+    )
+    return fig
+
+
+FIGURES = {
+    'monthly_trend': monthly_trend_figure,
+    'delivery_review': delivery_review_figure,
+    'freight_review': freight_review_figure,
+}
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+import storage
+import time_index
+
+# Dataset hasil merge berisi satu baris untuk setiap kombinasi (item x pembayaran x review) dalam satu pesanan,
+# sehingga menjumlahkan payment_value atau price langsung dari dataset menghitung nilai yang sama berulang kali.
+# Modul ini memecah dataset kembali menjadi tabel pesanan, item dan pembayaran yang dihubungkan dengan order_key.
+
+# Kolom tingkat pesanan (sama untuk semua baris satu pesanan)
+ORDER_COLUMNS = ['order_id', 'customer_unique_id', 'order_purchase_timestamp']
+
+# Kolom yang mengidentifikasi satu item, pembayaran dan review dalam satu pesanan
+# (order_item_id dan review_id dibuang saat merge, sehingga item identik dihitung dari kelipatan barisnya)
+ITEM_COLUMNS = ['product_id', 'seller_id', 'shipping_limit_date', 'price', 'freight_value']
+PAYMENT_COLUMNS = ['payment_sequential', 'payment_type', 'payment_installments', 'payment_value']
+REVIEW_COLUMNS = ['review_score', 'review_creation_date', 'review_answer_timestamp']
+
+# Kolom dataset yang dibutuhkan untuk membangun model
+MODEL_COLUMNS = storage.columns_for('filter', 'model')
+
+
+# Jumlah kombinasi unik kolom tertentu untuk setiap pesanan
+def _distinct_per_order(df, order_key, columns):
+    keys = df[columns].assign(order_key=order_key).drop_duplicates()
+    counts = np.bincount(keys['order_key'].to_numpy(), minlength=order_key.max() + 1)
+    return keys, counts
+
+
+# Membangun tabel pesanan, item dan pembayaran dari dataset hasil merge.
+# Dataset yang terurut berdasarkan waktu menghasilkan tabel pesanan yang juga terurut berdasarkan waktu.
+def build_model(df):
+    if df.empty:
+        return {
+            'orders': pd.DataFrame(columns=['order_key', *ORDER_COLUMNS, 'payment_value']),
+            'items': pd.DataFrame(columns=['order_key', 'order_purchase_timestamp', *ITEM_COLUMNS,
+                                           'product_category_name_english', 'quantity', 'payment_value']),
+            'payments': pd.DataFrame(columns=['order_key', 'order_purchase_timestamp', *PAYMENT_COLUMNS]),
+        }
+
+    codes, _ = pd.factorize(df['order_id'])
+    order_key = codes.astype('int32')
+
+    # ===== TABEL PESANAN =====
+    first_rows = pd.Series(order_key).drop_duplicates().index.to_numpy()
+    orders = df[ORDER_COLUMNS].iloc[first_rows].reset_index(drop=True)
+    orders.insert(0, 'order_key', np.arange(len(orders), dtype='int32'))
+
+    # ===== TABEL PEMBAYARAN =====
+    payments, payment_counts = _distinct_per_order(df, order_key, PAYMENT_COLUMNS)
+    payments = payments[payments['payment_value'].notna()]
+    payment_total = np.bincount(payments['order_key'].to_numpy(), weights=payments['payment_value'].to_numpy(),
+                                minlength=len(orders))
+    has_payment = np.bincount(payments['order_key'].to_numpy(), minlength=len(orders)) > 0
+    orders['payment_value'] = np.where(has_payment, payment_total, np.nan)
+    payments = payments.reset_index(drop=True)[['order_key', *PAYMENT_COLUMNS]]
+    payments.insert(1, 'order_purchase_timestamp', orders['order_purchase_timestamp'].to_numpy()[payments['order_key']])
+
+    # ===== TABEL ITEM =====
+    _, review_counts = _distinct_per_order(df, order_key, REVIEW_COLUMNS)
+    # Setiap item muncul sebanyak (jumlah pembayaran x jumlah review) kali untuk setiap unitnya
+    fanout = np.maximum(payment_counts, 1) * np.maximum(review_counts, 1)
+    item_rows = df[ITEM_COLUMNS + ['product_category_name_english']].assign(order_key=order_key)
+    items = item_rows.groupby(['order_key', *ITEM_COLUMNS], dropna=False, observed=True, sort=False).agg(
+        product_category_name_english=('product_category_name_english', 'first'),
+        rows=('order_key', 'size'),
+    ).reset_index()
+    # Pesanan tanpa item tetap muncul satu baris dengan harga kosong pada dataset hasil merge
+    items = items[items['price'].notna()]
+    items['quantity'] = np.maximum(items['rows'].to_numpy() // fanout[items['order_key'].to_numpy()], 1).astype('int16')
+    items = items.drop(columns='rows').sort_values('order_key', kind='stable').reset_index(drop=True)
+    items.insert(1, 'order_purchase_timestamp', orders['order_purchase_timestamp'].to_numpy()[items['order_key']])
+
+    # Total pembayaran pesanan dialokasikan ke item secara proporsional terhadap (price + freight_value)
+    item_value = (items['price'].fillna(0) + items['freight_value'].fillna(0)).to_numpy() * items['quantity'].to_numpy()
+    item_key = items['order_key'].to_numpy()
+    order_value = np.bincount(item_key, weights=item_value, minlength=len(orders))
+    share = np.divide(item_value, order_value[item_key], out=np.zeros_like(item_value), where=order_value[item_key] > 0)
+    items['payment_value'] = share * np.nan_to_num(orders['payment_value'].to_numpy())[item_key]
+
+    return {'orders': orders, 'items': items, 'payments': payments}
+
+
+# Membangun model langsung dari file dataset: hanya MODEL_COLUMNS yang dibaca (dan dilepas setelahnya).
+# ID dikodekan dan baris diurutkan seperti dataset dashboard sehingga kode ID sama dengan tabel lookup-nya.
+def load_model(path):
+    df, _ = storage.encode_ids(storage.read_columns(path, MODEL_COLUMNS))
+    return build_model(time_index.sort_by_time(df))
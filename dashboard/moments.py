@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+# Statistik cukup bivariat (x, y) yang dapat digabungkan: jumlah data n, rata-rata x dan y, jumlah kuadrat
+# simpangan M2x = Σ(x - x̄)², M2y = Σ(y - ȳ)² dan co-moment Cxy = Σ(x - x̄)(y - ȳ). Cube menyimpan satu record
+# per hari (dan dimensi filter) sehingga korelasi Pearson dan slope regresi untuk rentang tanggal mana pun
+# cukup menggabungkan beberapa record harian, tanpa membaca baris dataset.
+# Momen disimpan terpusat (bukan Σx², Σxy) agar tidak terjadi cancellation pada nilai besar, dan digabung dengan
+# rumus paralel Chan dkk.: M2 = Σ M2ᵢ + Σ nᵢ(x̄ᵢ - x̄)², C = Σ Cᵢ + Σ nᵢ(x̄ᵢ - x̄)(ȳᵢ - ȳ).
+
+COLUMNS = ['n', 'mean_x', 'mean_y', 'm2_x', 'm2_y', 'c_xy']
+
+
+# Menggabungkan record momen (array) ke dalam n_groups grup sesuai kode grupnya: rata-rata gabungan dihitung lebih
+# dulu, lalu simpangan rata-rata setiap record terhadapnya ditambahkan ke M2 dan co-moment. Record dengan n negatif
+# mengurangkan data dari grupnya; grup yang kosong (n = 0) memiliki rata-rata 0.
+def merge_arrays(group, n_groups, n, mean_x, mean_y, m2_x, m2_y, c_xy):
+    n = np.asarray(n, dtype='float64')
+    total = np.bincount(group, weights=n, minlength=n_groups)
+    merged_x = np.divide(np.bincount(group, weights=n * mean_x, minlength=n_groups), total,
+                         out=np.zeros(n_groups), where=total != 0)
+    merged_y = np.divide(np.bincount(group, weights=n * mean_y, minlength=n_groups), total,
+                         out=np.zeros(n_groups), where=total != 0)
+    dx = mean_x - merged_x[group]
+    dy = mean_y - merged_y[group]
+    return {
+        'n': total.astype('int64'),
+        'mean_x': merged_x,
+        'mean_y': merged_y,
+        'm2_x': np.bincount(group, weights=m2_x + n * dx * dx, minlength=n_groups),
+        'm2_y': np.bincount(group, weights=m2_y + n * dy * dy, minlength=n_groups),
+        'c_xy': np.bincount(group, weights=c_xy + n * dx * dy, minlength=n_groups),
+    }
+
+
+# Menggabungkan record dengan kunci yang sama (mis. record harian beberapa potongan dataset)
+def merge(records, by):
+    grouped = records.groupby(by, observed=True, sort=True)
+    merged = merge_arrays(
+        grouped.ngroup().to_numpy(), grouped.ngroups,
+        *(records[col].to_numpy(dtype='float64') for col in COLUMNS)
+    )
+    return pd.concat([grouped.size().index.to_frame(index=False), pd.DataFrame(merged)], axis=1)
+
+
+# Record momen per kombinasi kunci dari nilai mentah x dan y (keys: {nama kolom: array}), terurut berdasarkan kunci.
+# Setiap baris adalah record dengan n = 1 dan momen terpusat 0.
+def rollup(keys, x, y):
+    zeros = np.zeros(len(x))
+    return merge(pd.DataFrame({
+        **keys, 'n': 1, 'mean_x': np.asarray(x, dtype='float64'), 'mean_y': np.asarray(y, dtype='float64'),
+        'm2_x': zeros, 'm2_y': zeros, 'c_xy': zeros,
+    }), list(keys))
+
+
+# Menggabungkan semua record menjadi satu record (dict)
+def combine(records):
+    if records.empty:
+        return {'n': 0, 'mean_x': np.nan, 'mean_y': np.nan, 'm2_x': 0.0, 'm2_y': 0.0, 'c_xy': 0.0}
+    merged = merge_arrays(np.zeros(len(records), dtype='intp'), 1,
+                          *(records[col].to_numpy(dtype='float64') for col in COLUMNS))
+    return {col: merged[col][0] for col in COLUMNS}
+
+
+# Korelasi Pearson dari record momen
+def correlation(record):
+    if record['n'] < 2 or record['m2_x'] <= 0 or record['m2_y'] <= 0:
+        return np.nan
+    return record['c_xy'] / np.sqrt(record['m2_x'] * record['m2_y'])
+
+
+# Slope regresi linear y terhadap x (perubahan y untuk setiap kenaikan satu satuan x)
+def slope(record):
+    if record['n'] < 2 or record['m2_x'] <= 0:
+        return np.nan
+    return record['c_xy'] / record['m2_x']
@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Sketch kuantil dengan bucket logaritmik (seperti DDSketch): setiap nilai positif x masuk ke bucket
+# ceil(log_gamma(x)), sehingga kuantil yang dibaca dari sketch memiliki error relatif paling besar `accuracy`.
+# Sketch per hari disimpan sebagai rollup (day, key, rows, value_sum) dan digabung dengan menjumlahkan per key.
+
+# Kunci khusus untuk nilai nol atau negatif (tidak memiliki logaritma)
+ZERO_KEY = np.iinfo('int32').min
+
+
+def gamma_for(accuracy):
+    return (1 + accuracy) / (1 - accuracy)
+
+
+# Kunci bucket untuk setiap nilai
+def sketch_keys(values, accuracy):
+    values = np.asarray(values, dtype='float64')
+    positive = values > 0
+    keys = np.full(len(values), ZERO_KEY, dtype='int32')
+    keys[positive] = np.ceil(np.log(values[positive]) / math.log(gamma_for(accuracy))).astype('int32')
+    return keys
+
+
+# Membangun sketch harian: jumlah baris dan total nilai per (day, key).
+# Nilai perwakilan bucket adalah rata-ratanya, sehingga bucket yang hanya berisi satu nilai
+# (mis. waktu pengiriman dalam hari) menghasilkan kuantil yang sama persis dengan perhitungan exact.
+def build_sketches(day, values, accuracy):
+    values = np.asarray(values, dtype='float64')
+    known = ~np.isnan(values)
+    frame = pd.DataFrame({
+        'day': np.asarray(day)[known],
+        'key': sketch_keys(values[known], accuracy),
+        'rows': np.ones(known.sum(), dtype='int64'),
+        'value_sum': values[known],
+    })
+    return frame.groupby(['day', 'key'], sort=True)[['rows', 'value_sum']].sum().reset_index()
+
+
+# Kuantil dari data yang disimpan sebagai (nilai, jumlah), sama dengan interpolasi linear pandas
+def weighted_quantile(values, counts, q):
+    order = np.argsort(values, kind='stable')
+    values = np.asarray(values, dtype='float64')[order]
+    counts = np.asarray(counts, dtype='int64')[order]
+    total = counts.sum()
+    if total == 0:
+        return np.nan
+    cumulative = np.cumsum(counts)
+    position = (total - 1) * q
+    lower = int(np.floor(position))
+    upper = int(np.ceil(position))
+    lower_value = values[np.searchsorted(cumulative, lower, side='right')]
+    upper_value = values[np.searchsorted(cumulative, upper, side='right')]
+    return lower_value + (position - lower) * (upper_value - lower_value)
+
+
+# Kuantil q dari gabungan sketch (mis. hasil slice beberapa hari)
+def quantile(sketches, q):
+    merged = sketches.groupby('key', sort=True)[['rows', 'value_sum']].sum()
+    merged = merged[merged['rows'] > 0]
+    return weighted_quantile(merged['value_sum'] / merged['rows'], merged['rows'], q)
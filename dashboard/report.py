@@ -0,0 +1,316 @@
+import argparse
+import os
+import sys
+import time
+from textwrap import dedent
+
+import pandas as pd
+
+import charts
+import chunked
+import config
+import cube
+import executor
+import hll
+import insights
+import model
+import sections
+import shared
+import sql_backend
+import storage
+import time_buckets
+
+# Pembuatan laporan tanpa Streamlit: untuk setiap rentang tanggal semua grafik dan teks insight dashboard ditulis
+# sebagai file Markdown dengan gambar PNG. Dataset, model dan cube harian dimuat sekali lalu dipakai bersama oleh
+# semua rentang, sehingga setiap rentang hanya mengiris cube (tanpa memindai ulang dataset). Rentang dihitung dan
+# dirender bersamaan di thread pool.
+
+# Periode laporan berulang (--every) dan kode frekuensi pandas-nya
+PERIODS = {'day': 'D', 'week': 'W', 'month': 'M', 'quarter': 'Q', 'year': 'Y'}
+
+# Teks pengganti grafik jika data grafik kosong (mis. hari atau minggu tanpa pesanan)
+EMPTY_CHART_MESSAGE = "Tidak ada data untuk grafik ini dalam periode yang dipilih."
+
+
+# Pengaturan sketch pada cube harian, sama dengan dashboard
+CUBE_OPTIONS = {
+    'hll_precision': hll.precision_for_error(config.HLL_ERROR),
+    'quantile_accuracy': config.QUANTILE_ACCURACY,
+}
+
+
+# Memuat dataset dengan mode yang sama dengan dashboard (config.py): backend DuckDB tanpa memuat dataset,
+# out-of-core per potongan (hanya tabel pesanan dan cube harian), atau seluruh dataset di memori (dataset
+# bersama yang di-memory map untuk dataset dashboard). daily_rows adalah jumlah baris dataset per hari.
+def load_dataset(path):
+    data = {'path': path, 'columns': storage.available_columns(path), 'df': None, 'id_lookup': None,
+            'model': None, 'cube': None, 'sql': None}
+    if config.QUERY_BACKEND == 'duckdb':
+        # Setiap bagian dihitung dengan SQL dari file dataset; ID pelanggan pada hasilnya sudah berupa ID asli
+        data['sql'] = sql_backend.connect(config.DUCKDB_THREADS)
+        with data['sql'].cursor() as con:
+            data['daily_rows'] = sql_backend.daily_rows(con, path)
+        return data
+
+    if chunked.should_chunk(path, config.LOAD_MODE, config.MEMORY_LIMIT_MB):
+        loaded = chunked.load_dataset(
+            path, storage.BUILD_COLUMNS,
+            memory_limit_mb=config.MEMORY_LIMIT_MB, chunk_rows=config.CHUNK_ROWS or None, **CUBE_OPTIONS
+        )
+        data.update(model=loaded['model'], cube=loaded['cube'], id_lookup=loaded['id_lookup'])
+    else:
+        if config.SHARED_DATASET and path == storage.dataset_path():
+            version = storage.dataset_version(path)
+            data['df'], data['id_lookup'] = shared.load_dataset(path, version)
+            shared.remove_old_versions(version)
+        else:
+            data['df'], data['id_lookup'] = shared.build_dataset(path)
+        chunked.check_memory(config.MEMORY_LIMIT_MB, "memuat dataset")
+        data['model'] = model.load_model(path)
+        data['cube'] = cube.build_cube(data['df'], data['model'], **CUBE_OPTIONS)
+    data['daily_rows'] = data['cube']['rows']
+    return data
+
+
+# Rentang tanggal laporan: satu rentang [start, end], atau dipecah per periode (minggu, bulan, ...)
+def report_ranges(start_date, end_date, every=None):
+    if every is None:
+        return [(start_date, end_date)]
+    ranges = []
+    for period in pd.period_range(start_date, end_date, freq=PERIODS[every]):
+        first = max(period.start_time.date(), start_date)
+        last = min(period.end_time.date(), end_date)
+        ranges.append((first, last))
+    return ranges
+
+
+# Menghitung semua bagian dashboard untuk satu rentang tanggal
+def compute_sections(data, start_date, end_date, options):
+    results = {}
+    for name, section in sections.SECTIONS.items():
+        if name == 'category_sales' and not category_available(data):
+            continue
+        if data['sql'] is not None:
+            # Setiap thread memakai cursor sendiri karena koneksi DuckDB tidak thread-safe
+            with data['sql'].cursor() as con:
+                results[name] = sql_backend.compute_section(
+                    con, data['path'], name, start_date, end_date,
+                    quantile_accuracy=config.QUANTILE_ACCURACY, **options.get(name, {})
+                )
+        else:
+            results[name] = section(
+                data['df'], data['model'], data['cube'], start_date, end_date, **options.get(name, {})
+            )
+    return results
+
+
+def category_available(data):
+    return 'product_category_name_english' in data['columns'] and 'payment_value' in data['columns']
+
+
+# Tabel Markdown sederhana dari DataFrame
+def markdown_table(df):
+    df = df.reset_index() if df.index.name else df
+    lines = ['| ' + ' | '.join(str(column) for column in df.columns) + ' |',
+             '| ' + ' | '.join('---' for _ in df.columns) + ' |']
+    for row in df.itertuples(index=False):
+        lines.append('| ' + ' | '.join(f"{value:,.2f}" if isinstance(value, float) else str(value) for value in row) + ' |')
+    return '\n'.join(lines)
+
+
+# Menyusun laporan satu rentang (urutan dan judul sama dengan dashboard); grafik disimpan di out_dir.
+# Tanpa grafik (with_charts=False) laporan hanya berisi teks insight dan tabel.
+def render_report(data, results, start_date, end_date, out_dir, with_charts=True):
+    os.makedirs(out_dir, exist_ok=True)
+    blocks = []
+
+    def heading(level, text):
+        blocks.append('#' * level + ' ' + text)
+
+    def chart(file_name, name, *args):
+        if not with_charts:
+            return
+        if any(isinstance(arg, (pd.Series, pd.DataFrame)) and arg.empty for arg in args):
+            blocks.append(EMPTY_CHART_MESSAGE)
+            return
+        with open(os.path.join(out_dir, file_name + '.png'), 'wb') as f:
+            f.write(charts.CHARTS[name](*args))
+        blocks.append(f"![{file_name}]({file_name}.png)")
+
+    def text(markdown):
+        blocks.append(dedent(markdown).strip())
+
+    def with_customer_ids(df):
+        if data['id_lookup'] is None:
+            return df
+        return df.assign(customer_id=storage.decode_ids(df['customer_id'], data['id_lookup']['customer_unique_id']))
+
+    rows = cube.slice_days(data['daily_rows'], start_date, end_date)['rows'].sum()
+    heading(1, f"E-Commerce Analysis Report: {start_date} - {end_date}")
+    text(f"Showing data from: **{start_date}** to **{end_date}** ({rows} records)")
+
+    distribution = results['distribution']
+    distribution_insights = insights.distribution(distribution)
+    heading(2, "Metrik Distribusi Data")
+    heading(3, "Persebaran Penjual Di Setiap Kota")
+    chart('sellers_by_city', 'bar', distribution['sellers_by_city'], 45, 'right')
+    text(distribution_insights['sellers_by_city'])
+    heading(3, "Persebaran Pembeli Di Setiap Kota")
+    chart('customers_by_city', 'bar', distribution['customers_by_city'], 45, 'right')
+    text(distribution_insights['customers_by_city'])
+    heading(3, "Persebaran Penggunaan Jenis Pembayaran")
+    chart('payment_types', 'bar', distribution['payment_types'], 0)
+    text(distribution_insights['payment_types'])
+    heading(3, "Persebaran Skor Review Transaksi Produk")
+    chart('review_scores', 'bar', distribution['review_scores'], 0)
+    text(distribution_insights['review_scores'])
+
+    heading(2, "Distribusi Penjualan Berdasarkan Kategori Produk")
+    if 'category_sales' in results:
+        category_sales = results['category_sales']
+        chart('category_sales', 'category_sales', category_sales['top_categories'],
+              category_sales['sales_by_category']['payment_value'].max())
+        text(insights.category_sales(category_sales))
+    else:
+        text(insights.EMPTY_MESSAGES['category_sales'])
+
+    monthly_trend = results['monthly_trend']
+    heading(2, "Tren Penjualan Kategori Produk Unggulan Seiring Waktu")
+    chart('monthly_trend', 'monthly_trend', monthly_trend['pivot_data'], monthly_trend['top_5_categories'],
+          monthly_trend['granularity'])
+    text(insights.monthly_trend(monthly_trend))
+
+    weight_delivery = results['weight_delivery']
+    heading(2, "Pengaruh Karakteristik Produk terhadap Waktu Pengiriman")
+    if not weight_delivery['weight_stats'].empty:
+        chart('weight_delivery', 'weight_delivery', weight_delivery['weight_stats'],
+              weight_delivery['overall_mean'], weight_delivery['correlation'])
+        text(insights.weight_delivery(weight_delivery))
+    else:
+        text(insights.EMPTY_MESSAGES['weight_delivery'])
+
+    delivery_review = results['delivery_review']
+    heading(2, "Pengaruh Waktu Pengiriman terhadap Review Score")
+    if delivery_review is None:
+        text(insights.EMPTY_MESSAGES['delivery_review'])
+    elif delivery_review['review_by_delivery'].empty:
+        text(insights.EMPTY_MESSAGES['delivery_review_trend'])
+    else:
+        chart('delivery_review', 'delivery_review', delivery_review['box_data'], delivery_review['category_avg'],
+              delivery_review['review_by_delivery'], delivery_review['overall_mean'], delivery_review['correlation'])
+        text(insights.delivery_review(delivery_review))
+
+    freight_review = results['freight_review']
+    heading(2, "Pengaruh Tarif Pengiriman terhadap Review Score")
+    if freight_review is not None:
+        chart('freight_review', 'freight_review', freight_review['avg_ratings'], freight_review['order_counts'],
+              freight_review['correlation'])
+        text(insights.freight_review(freight_review))
+    else:
+        text(insights.EMPTY_MESSAGES['freight_review'])
+
+    rfm_result = results['rfm']
+    rfm_df = rfm_result['rfm_df']
+    heading(2, "RFM Analysis")
+    text(insights.RFM_INTRO)
+    text("Sampel data RFM (5 baris pertama):")
+    text(markdown_table(with_customer_ids(rfm_df.head())))
+    if not rfm_df.empty:
+        top5 = [with_customer_ids(top) for top in insights.rfm_top5(rfm_df)]
+        chart('rfm', 'rfm', *top5)
+        text(insights.rfm(*top5, start_date, end_date))
+        text("Segmentasi pelanggan berdasarkan skor RFM:")
+        chart('rfm_segments', 'rfm_segments', rfm_result['segments'])
+        text(markdown_table(rfm_result['segments'].rename(columns=insights.RFM_SEGMENT_COLUMNS)))
+    else:
+        text(insights.EMPTY_MESSAGES['rfm'])
+
+    path = os.path.join(out_dir, 'report.md')
+    with open(path, 'w') as f:
+        f.write('\n\n'.join(blocks) + '\n')
+    return path
+
+
+# Menghitung dan menulis laporan untuk satu rentang tanggal
+def generate_report(data, start_date, end_date, out_dir, options, with_charts=True):
+    results = compute_sections(data, start_date, end_date, options)
+    return render_report(
+        data, results, start_date, end_date, os.path.join(out_dir, f"{start_date}_{end_date}"), with_charts
+    )
+
+
+# Menulis laporan untuk semua rentang (paralel di thread pool) beserta index.md yang menautkan setiap laporan.
+# Rentang yang gagal tidak menghentikan rentang lain: error-nya dicatat di index.md dan dikembalikan terpisah.
+def generate(data, ranges, out_dir, options, workers=0, with_charts=True):
+    os.makedirs(out_dir, exist_ok=True)
+    pool = executor.create_pool(executor.worker_count(workers, len(ranges))) if workers != 1 else None
+    try:
+        futures = executor.submit_all(
+            pool,
+            lambda name, start_date, end_date: generate_report(data, start_date, end_date, out_dir, options, with_charts),
+            {f"{start_date}_{end_date}": {'start_date': start_date, 'end_date': end_date} for start_date, end_date in ranges}
+        )
+        paths, failures = {}, {}
+        for name, future in futures.items():
+            try:
+                paths[name] = future.result()
+            except Exception as e:
+                failures[name] = f"{type(e).__name__}: {e}"
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    with open(os.path.join(out_dir, 'index.md'), 'w') as f:
+        f.write("# E-Commerce Analysis Reports\n\n")
+        for name, future in futures.items():
+            if name in paths:
+                f.write(f"* [{name}]({os.path.relpath(paths[name], out_dir)})\n")
+            else:
+                f.write(f"* {name}: gagal ({failures[name]})\n")
+    return paths, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Membuat laporan dashboard (grafik dan insight) tanpa Streamlit")
+    parser.add_argument('--data', default=None, help="Path dataset (default: dataset dashboard)")
+    parser.add_argument('--start', default=None, help="Tanggal awal (YYYY-MM-DD, default: awal dataset)")
+    parser.add_argument('--end', default=None, help="Tanggal akhir (YYYY-MM-DD, default: akhir dataset)")
+    parser.add_argument('--every', choices=list(PERIODS), default=None,
+                        help="Satu laporan per periode di antara --start dan --end")
+    parser.add_argument('--out', default=os.path.join(storage.CURRENT_DIR, 'build', 'reports'))
+    parser.add_argument('--workers', type=int, default=0, help="Jumlah thread (0 = semua core, 1 = berurutan)")
+    parser.add_argument('--distinct', choices=['exact', 'approx'], default=config.DISTINCT_MODE)
+    parser.add_argument('--granularity', choices=time_buckets.GRANULARITIES, default=config.TREND_GRANULARITY,
+                        help="Granularitas waktu tren penjualan kategori unggulan")
+    parser.add_argument('--dpi', type=int, default=charts.PNG_DPI, help="Resolusi gambar grafik")
+    parser.add_argument('--no-charts', action='store_true', help="Hanya teks insight dan tabel, tanpa gambar grafik")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    data = load_dataset(args.data or storage.dataset_path())
+    print(f"Load dataset {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+    days = data['daily_rows']['day']
+    start_date = pd.Timestamp(args.start).date() if args.start else days.iloc[0].date()
+    end_date = pd.Timestamp(args.end).date() if args.end else days.iloc[-1].date()
+    options = {
+        'distribution': {'distinct': args.distinct},
+        'monthly_trend': {'granularity': args.granularity},
+        'weight_delivery': {'quantile_mode': config.QUANTILE_MODE},
+        'delivery_review': {'quantile_mode': config.QUANTILE_MODE},
+        'freight_review': {},
+    }
+    charts.PNG_DPI = args.dpi
+
+    ranges = report_ranges(start_date, end_date, args.every)
+    start = time.perf_counter()
+    paths, failures = generate(data, ranges, args.out, options, args.workers, not args.no_charts)
+    print(f"{len(paths)} laporan ditulis ke {args.out} dalam {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    for name, error in failures.items():
+        print(f"{name}: gagal ({error})", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import storage
+
+RFM_COLUMNS = ['customer_unique_id', 'order_id', 'order_purchase_timestamp', 'payment_value']
+
+# Skor 1-5 untuk setiap dimensi (5 = terbaik)
+SCORE_LABELS = [1, 2, 3, 4, 5]
+
+# Segmen pelanggan berdasarkan kombinasi skor Recency (baris) dan Frequency (kolom)
+SEGMENT_GRID = [
+    # F=1            F=2                    F=3                    F=4                F=5
+    ['Hibernating',    'Hibernating',         'At Risk',             'At Risk',         "Can't Lose Them"],  # R=1
+    ['Hibernating',    'Hibernating',         'At Risk',             'At Risk',         "Can't Lose Them"],  # R=2
+    ['About To Sleep', 'About To Sleep',      'Need Attention',      'Loyal Customers', 'Loyal Customers'],  # R=3
+    ['Promising',      'Potential Loyalists', 'Potential Loyalists', 'Loyal Customers', 'Loyal Customers'],  # R=4
+    ['New Customers',  'Potential Loyalists', 'Potential Loyalists', 'Champions',       'Champions'],        # R=5
+]
+SEGMENTS = list(dict.fromkeys(segment for row in SEGMENT_GRID for segment in row))
+
+
+# Agregasi parsial per pesanan untuk satu potongan data (satu pesanan selalu milik satu pelanggan).
+# Hasil dari beberapa potongan dapat digabung dengan combine_partials.
+def rfm_partials(chunk):
+    codes, order_ids = pd.factorize(chunk['order_id'])
+    grouped = pd.DataFrame({
+        'last_purchase': chunk['order_purchase_timestamp'].to_numpy(),
+        'monetary': chunk['payment_value'].to_numpy(),
+    }).groupby(codes, sort=False)
+    # Kode factorize berurutan sesuai kemunculan pertama, sehingga baris pertama setiap pesanan sejajar dengan order_ids
+    first_rows = pd.Series(codes).drop_duplicates().index.to_numpy()
+    return pd.DataFrame({
+        'customer_unique_id': chunk['customer_unique_id'].to_numpy()[first_rows],
+        'order_id': np.asarray(order_ids),
+        'last_purchase': grouped['last_purchase'].max().to_numpy(),
+        'monetary': grouped['monetary'].sum().to_numpy(),
+    })
+
+
+# Menggabungkan agregasi parsial menjadi tabel RFM per pelanggan
+def combine_partials(partials, reference_date=None):
+    partials = [partial for partial in partials if not partial.empty]
+    if not partials:
+        return pd.DataFrame(columns=['customer_id', 'frequency', 'monetary', 'recency'])
+
+    orders = pd.concat(partials, ignore_index=True)
+    # Pesanan yang terpotong di beberapa chunk digabung kembali
+    if len(partials) > 1:
+        orders = orders.groupby('order_id', sort=False).agg(
+            customer_unique_id=('customer_unique_id', 'first'),
+            last_purchase=('last_purchase', 'max'),
+            monetary=('monetary', 'sum'),
+        )
+
+    customers = orders.groupby('customer_unique_id', sort=True).agg(
+        last_purchase=('last_purchase', 'max'),
+        frequency=('monetary', 'size'),
+        monetary=('monetary', 'sum'),
+    )
+
+    # Recency dihitung dalam hari kalender terhadap tanggal pembelian terakhir dalam data
+    last_day = customers['last_purchase'].to_numpy().astype('datetime64[D]')
+    if reference_date is None:
+        reference_day = last_day.max()
+    else:
+        reference_day = np.datetime64(pd.Timestamp(reference_date), 'D')
+
+    return pd.DataFrame({
+        'customer_id': customers.index.to_numpy(),
+        'frequency': customers['frequency'].to_numpy(),
+        'monetary': customers['monetary'].to_numpy(),
+        'recency': (reference_day - last_day).astype('int64'),
+    })
+
+
+# Tabel RFM untuk data yang muat di memori
+def compute_rfm(df, reference_date=None):
+    return combine_partials([rfm_partials(df[RFM_COLUMNS])], reference_date)
+
+
+# Tabel RFM dari potongan-potongan data (misalnya row group Parquet)
+def compute_rfm_chunked(chunks, reference_date=None):
+    return combine_partials([rfm_partials(chunk[RFM_COLUMNS]) for chunk in chunks], reference_date)
+
+
+# Skor kuantil 1-5 berdasarkan nilai: skor ditentukan oleh bagian pelanggan yang nilainya lebih buruk
+# (peringkat 'min'), sehingga pelanggan dengan nilai sama selalu mendapat skor yang sama apa pun urutan barisnya
+# dan nilai kembar yang mendominasi (mis. frekuensi 1) berada di skor terendah. Untuk nilai yang semuanya
+# berbeda hasilnya sama dengan kuintil peringkat.
+def quantile_score(values, ascending=True):
+    count = len(values)
+    if count == 0:
+        return np.array([], dtype='int8')
+    ranks = pd.Series(values).rank(method='min', ascending=ascending).to_numpy(dtype='int64')
+    bins = min(len(SCORE_LABELS), count)
+    # Batas kuintil seperti pd.qcut pada peringkat 1..count: peringkat r masuk bin ceil(bins * (r - 1) / (count - 1))
+    bin_index = np.maximum(-(-bins * (ranks - 1) // max(count - 1, 1)), 1)
+    return (bin_index + len(SCORE_LABELS) - bins).astype('int8')
+
+
+# Menambahkan skor R/F/M dan nama segmen ke tabel RFM
+def score_rfm(rfm_df):
+    rfm_df = rfm_df.copy()
+    # Recency kecil lebih baik, sehingga diurutkan menurun sebelum diberi skor
+    rfm_df['r_score'] = quantile_score(rfm_df['recency'].to_numpy(), ascending=False)
+    rfm_df['f_score'] = quantile_score(rfm_df['frequency'].to_numpy())
+    rfm_df['m_score'] = quantile_score(rfm_df['monetary'].to_numpy())
+
+    grid = np.array(SEGMENT_GRID, dtype=object)
+    segments = grid[rfm_df['r_score'].to_numpy() - 1, rfm_df['f_score'].to_numpy() - 1]
+    rfm_df['segment'] = pd.Categorical(segments, categories=SEGMENTS)
+    return rfm_df
+
+
+# Jumlah pelanggan dan total pendapatan per segmen
+def segment_summary(scored_df):
+    summary = scored_df.groupby('segment', observed=True).agg(
+        customers=('customer_id', 'size'),
+        revenue=('monetary', 'sum'),
+    )
+    summary['revenue_share'] = summary['revenue'] / summary['revenue'].sum() * 100
+    return summary.sort_values('revenue', ascending=False)
+
+
+# Implementasi RFM sebelumnya (groupby + lambda per baris), dipakai sebagai pembanding benchmark
+def legacy_rfm(df):
+    rfm_df = df.groupby(by="customer_unique_id", as_index=False).agg({
+        "order_purchase_timestamp": "max",
+        "order_id": "nunique",
+        "payment_value": "sum"
+    })
+    rfm_df.columns = ["customer_id", "max_order_timestamp", "frequency", "monetary"]
+    rfm_df["max_order_timestamp"] = pd.to_datetime(rfm_df["max_order_timestamp"]).dt.date
+    recent_date = pd.to_datetime(df["order_purchase_timestamp"]).dt.date.max()
+    rfm_df["recency"] = rfm_df["max_order_timestamp"].apply(lambda x: (recent_date - x).days)
+    rfm_df.drop("max_order_timestamp", axis=1, inplace=True)
+    return rfm_df
+
+
+# Memperbesar dataset dengan menyalin baris dan membuat ID pelanggan/pesanan baru untuk setiap salinan
+def replicate(df, factor):
+    copies = []
+    for i in range(factor):
+        copy = df.copy()
+        copy['customer_unique_id'] = copy['customer_unique_id'].astype(str) + f"-{i}"
+        copy['order_id'] = copy['order_id'].astype(str) + f"-{i}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def benchmark(df, repeat=3, chunk_rows=1_000_000):
+    def best_of(func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        return min(timings), result
+
+    legacy_seconds, legacy_result = best_of(lambda: legacy_rfm(df))
+    vector_seconds, vector_result = best_of(lambda: score_rfm(compute_rfm(df)))
+    chunked_seconds, chunked_result = best_of(lambda: compute_rfm_chunked(
+        df.iloc[i:i + chunk_rows] for i in range(0, len(df), chunk_rows)
+    ))
+    # ID pelanggan dan pesanan sebagai kode integer seperti yang dimuat dashboard
+    encoded_df, id_lookup = storage.encode_ids(df)
+    encoded_seconds, encoded_result = best_of(lambda: score_rfm(compute_rfm(encoded_df)))
+    encoded_result['customer_id'] = storage.decode_ids(encoded_result['customer_id'], id_lookup['customer_unique_id'])
+
+    # Memastikan hasil sama dengan implementasi sebelumnya
+    columns = ['customer_id', 'frequency', 'monetary', 'recency']
+    pd.testing.assert_frame_equal(legacy_result[columns], vector_result[columns], check_dtype=False)
+    pd.testing.assert_frame_equal(legacy_result[columns], chunked_result[columns], check_dtype=False)
+    pd.testing.assert_frame_equal(legacy_result[columns], encoded_result[columns], check_dtype=False)
+
+    return {'rows': len(df), 'legacy': legacy_seconds, 'vectorized': vector_seconds, 'chunked': chunked_seconds,
+            'encoded': encoded_seconds}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark RFM vektorisasi dibandingkan implementasi sebelumnya")
+    parser.add_argument('--data', default=None, help="Path dataset (default: dataset dashboard)")
+    parser.add_argument('--scale', type=int, default=1, help="Faktor perbesaran dataset")
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000, help="Jumlah baris per chunk")
+    args = parser.parse_args(argv)
+
+    path = args.data or storage.dataset_path()
+    if path.endswith('.parquet'):
+        df = storage.read_dataset(path, columns=RFM_COLUMNS)
+    else:
+        df = storage.read_csv_dataset(path, columns=RFM_COLUMNS)
+    if args.scale > 1:
+        df = replicate(df, args.scale)
+
+    result = benchmark(df, chunk_rows=args.chunk_rows)
+    print(f"{result['rows']:,} baris")
+    for name in ['legacy', 'vectorized', 'chunked', 'encoded']:
+        print(f"{name:10s} {result[name]:.3f} s ({result['legacy'] / result[name]:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import numpy as np
+import pandas as pd
+
+import binstats
+import cube
+import hll
+import moments
+import quantiles
+import rfm as rfm_engine
+import time_buckets
+import time_index
+
+# Perhitungan setiap bagian dashboard. Semua fungsi menerima (final_df, data_model, daily_cube, start_date, end_date)
+# dan mengembalikan dict berisi hasil agregasi yang siap divisualisasikan.
+# Nilai uang (payment_value, price) diambil dari data_model agar tidak terhitung berulang karena fan-out merge.
+
+
+# ===== METRIK DISTRIBUSI =====
+def distribution(final_df, data_model, daily_cube, start_date, end_date, distinct='exact'):
+    if 'seller_distinct' in daily_cube:
+        # Backend SQL (sql_backend.py) sudah menghitung jumlah unik exact untuk rentang tanggal ini
+        sellers, customers = daily_cube['seller_distinct'], daily_cube['customer_distinct']
+    # Mode out-of-core (final_df tidak dimuat) selalu memakai sketch
+    elif distinct == 'approx' or final_df is None:
+        # Jumlah unik per kota dari gabungan sketch HyperLogLog harian
+        precision = daily_cube['hll_precision']
+        sellers = hll.estimate(cube.slice_sketches(daily_cube, 'seller_hll', start_date, end_date), precision, 'seller_city')
+        customers = hll.estimate(cube.slice_sketches(daily_cube, 'customer_hll', start_date, end_date), precision, 'customer_city')
+        sellers, customers = sellers.round().astype('int64'), customers.round().astype('int64')
+    else:
+        filtered_df = time_index.slice_range(final_df, start_date, end_date)
+        # ID kosong dikodekan -1 oleh storage.encode_ids dan tidak dihitung sebagai penjual/pelanggan
+        seller_rows = filtered_df[filtered_df['seller_id'] >= 0]
+        customer_rows = filtered_df[filtered_df['customer_unique_id'] >= 0]
+        sellers = seller_rows.groupby(by="seller_city", observed=True).seller_id.nunique()
+        customers = customer_rows.groupby(by="customer_city", observed=True).customer_unique_id.nunique()
+    return {
+        'sellers_by_city': sellers.sort_values(ascending=False).head(10),
+        'customers_by_city': customers.sort_values(ascending=False).head(10),
+        'payment_types': cube.query(daily_cube, 'payment', start_date, end_date, by='payment_type')['rows'].sort_values(ascending=False),
+        'review_scores': cube.query(daily_cube, 'review', start_date, end_date, by='review_score')['rows'].sort_index(ascending=False),
+    }
+
+
+# ===== KATEGORI PRODUK DENGAN PENJUALAN TERTINGGI =====
+def category_sales(final_df, data_model, daily_cube, start_date, end_date):
+    # Mengelompokkan data berdasarkan kategori produk dari cube harian
+    sales_by_category = cube.query(
+        daily_cube, 'category', start_date, end_date, by='product_category_name_english'
+    )[['payment_value']].reset_index()
+
+    # Mengurutkan berdasarkan total penjualan
+    sales_by_category = sales_by_category.sort_values('payment_value', ascending=False)
+
+    return {
+        'sales_by_category': sales_by_category,
+        # Mengambil 15 kategori teratas
+        'top_categories': sales_by_category.head(15),
+    }
+
+
+# ===== TREN PENJUALAN BULANAN =====
+# granularity: 'day', 'week', 'month' atau 'quarter' (lihat time_buckets.py)
+def monthly_trend(final_df, data_model, daily_cube, start_date, end_date, granularity='month'):
+    # Mengambil penjualan harian per kategori dari cube
+    category_daily = cube.slice_days(daily_cube['category'], start_date, end_date)
+
+    # Menghitung total penjualan per kategori
+    total_sales_by_category = category_daily.groupby('product_category_name_english', observed=True)['price'].sum().sort_values(ascending=False)
+
+    # Mengambil 5 kategori teratas
+    top_5_categories = total_sales_by_category.head(5).index.tolist()
+
+    # Penjualan per bucket waktu untuk 5 kategori teratas langsung sebagai pivot (terurut berdasarkan tanggal)
+    pivot_data = time_buckets.pivot(
+        category_daily, 'product_category_name_english', 'price', top_5_categories, granularity
+    )
+
+    return {'top_5_categories': top_5_categories, 'pivot_data': pivot_data, 'granularity': granularity}
+
+
+# ===== BERAT PRODUK VS WAKTU PENGIRIMAN =====
+def weight_delivery(final_df, data_model, daily_cube, start_date, end_date, quantile_mode='sketch'):
+    # Mengambil rollup waktu pengiriman (hari) per kategori berat dari cube
+    weight_daily = cube.slice_days(daily_cube['weight'], start_date, end_date)
+
+    # Memfilter data yang valid (waktu pengiriman masuk akal dan memiliki data berat produk)
+    if quantile_mode == 'sketch':
+        max_delivery_days = quantiles.quantile(
+            cube.slice_days(daily_cube['delivery_sketch'], start_date, end_date), 0.99
+        )
+    else:
+        delivery_hist = weight_daily.groupby('delivery_days')['rows'].sum()
+        max_delivery_days = cube.weighted_quantile(delivery_hist.index, delivery_hist.values, 0.99)
+    valid_data = weight_daily[
+        (weight_daily['delivery_days'] > 0) &
+        (weight_daily['delivery_days'] <= max_delivery_days) &
+        (weight_daily['weight_bucket'] >= 0)
+    ]
+
+    # Menghitung statistik untuk setiap kategori berat dari histogram waktu pengiriman
+    stats = binstats.binned_stats(
+        valid_data['weight_bucket'], valid_data['delivery_days'], valid_data['rows'], n_bins=len(cube.WEIGHT_LABELS)
+    )
+    stats = stats[stats['count'] > 0]
+    medians = [
+        cube.weighted_quantile(bucket_data['delivery_days'], bucket_data['rows'], 0.5)
+        for _, bucket_data in valid_data.groupby('weight_bucket')
+    ]
+    weight_stats = pd.DataFrame({
+        'weight_category': [cube.WEIGHT_LABELS[bucket] for bucket in stats.index],
+        'mean_days': stats['mean'].to_numpy(),
+        'median_days': medians,
+        'count': stats['count'].to_numpy(),
+        'std_days': stats['std'].to_numpy(),
+    }, columns=['weight_category', 'mean_days', 'median_days', 'count', 'std_days'])
+
+    # Rata-rata keseluruhan dan jumlah pesanan yang dianalisis
+    overall_mean, _, valid_count = cube.weighted_stats(valid_data['delivery_days'], valid_data['rows'])
+
+    # Menghitung korelasi antara berat produk dan waktu pengiriman dari momen harian dengan filter yang sama
+    weight_moments = cube.slice_days(daily_cube['weight_moments'], start_date, end_date)
+    weight_moments = moments.combine(weight_moments[
+        (weight_moments['delivery_days'] > 0) & (weight_moments['delivery_days'] <= max_delivery_days)
+    ])
+
+    return {
+        'weight_stats': weight_stats,
+        'overall_mean': overall_mean,
+        'valid_count': valid_count,
+        'correlation': moments.correlation(weight_moments),
+        # Tambahan waktu pengiriman (hari) untuk setiap tambahan 1 kg berat produk
+        'days_per_kg': moments.slope(weight_moments) * 1000,
+    }
+
+
+# ===== WAKTU PENGIRIMAN VS SKOR REVIEW =====
+def delivery_review(final_df, data_model, daily_cube, start_date, end_date, quantile_mode='sketch'):
+    # Mengambil histogram (waktu pengiriman, skor review) dari cube untuk pesanan yang
+    # memiliki tanggal pengiriman ke pelanggan dan skor review
+    delivery_review = cube.slice_days(daily_cube['delivery_review'], start_date, end_date)
+
+    # Memfilter data untuk hanya mengambil waktu pengiriman yang positif
+    mask = (delivery_review['delivery_days'] > 0)
+    valid_review_data = delivery_review[mask].groupby(['delivery_days', 'review_score'])['rows'].sum().reset_index()
+    if valid_review_data.empty:
+        return None
+
+    # Mengatasi outlier dengan hanya mengambil data sampai persentil ke-99
+    if quantile_mode == 'sketch':
+        max_delivery_time = quantiles.quantile(
+            cube.slice_days(daily_cube['delivery_review_sketch'], start_date, end_date), 0.99
+        )
+    else:
+        delivery_hist = valid_review_data.groupby('delivery_days')['rows'].sum()
+        max_delivery_time = cube.weighted_quantile(delivery_hist.index, delivery_hist.values, 0.99)
+    valid_review_data = valid_review_data[valid_review_data['delivery_days'] <= max_delivery_time].copy()
+
+    # Membuat kategori waktu pengiriman untuk mempermudah analisis dan visualisasi
+    valid_review_data['delivery_time_category'] = cube.bucket_codes(valid_review_data['delivery_days'], cube.DELIVERY_BINS)
+
+    # Menghitung statistik boxplot untuk setiap kategori waktu pengiriman
+    box_data = [
+        cube.box_stats(group['review_score'], group['rows'], cube.DELIVERY_LABELS[code])
+        for code, group in valid_review_data.groupby('delivery_time_category')
+        if code >= 0
+    ]
+
+    # Rata-rata review score untuk setiap kategori waktu pengiriman
+    category_stats = binstats.binned_stats(
+        valid_review_data['delivery_time_category'], valid_review_data['review_score'], valid_review_data['rows'],
+        n_bins=len(cube.DELIVERY_LABELS)
+    )
+    category_stats = category_stats[category_stats['count'] > 0]
+    category_avg = pd.Series(
+        category_stats['mean'].to_numpy(), index=[cube.DELIVERY_LABELS[code] for code in category_stats.index], dtype='float64'
+    )
+
+    # Membuat bins untuk waktu pengiriman dengan interval 2 hari untuk analisis tren yang lebih halus
+    delivery_bins = list(range(0, int(max_delivery_time) + 1, 2))
+
+    # Menghitung rata-rata, jumlah dan standard error setiap bin waktu pengiriman dalam satu kali akumulasi
+    bin_stats = binstats.binned_stats(
+        cube.bucket_codes(valid_review_data['delivery_days'], delivery_bins),
+        valid_review_data['review_score'], valid_review_data['rows'], n_bins=max(len(delivery_bins) - 1, 0)
+    )
+    # Mengambil nilai tengah dari setiap bin untuk digunakan sebagai nilai x dalam plot
+    bin_stats['delivery_time_mid'] = binstats.bin_midpoints(delivery_bins)
+    review_by_delivery = bin_stats.loc[bin_stats['count'] > 0, ['delivery_time_mid', 'mean', 'count', 'se']].reset_index(drop=True)
+
+    # Memfilter hanya bin dengan minimal 10 data untuk hasil yang lebih reliabel
+    review_by_delivery = review_by_delivery[review_by_delivery['count'] >= 10]
+
+    # Momen harian (waktu pengiriman, skor review) dengan filter yang sama
+    review_moments = cube.slice_days(daily_cube['delivery_review_moments'], start_date, end_date)
+    review_moments = moments.combine(review_moments[
+        (review_moments['delivery_days'] > 0) & (review_moments['delivery_days'] <= max_delivery_time)
+    ])
+
+    return {
+        'box_data': box_data,
+        'category_avg': category_avg,
+        'review_by_delivery': review_by_delivery,
+        'overall_mean': np.average(valid_review_data['review_score'], weights=valid_review_data['rows']),
+        # Korelasi antara waktu pengiriman dan review score
+        'correlation': moments.correlation(review_moments),
+        # Perubahan review score untuk setiap tambahan satu minggu waktu pengiriman
+        'score_per_week': moments.slope(review_moments) * 7,
+    }
+
+
+# ===== PENGARUH TARIF PENGIRIMAN TERHADAP KEPUASAN PELANGGAN =====
+def freight_review(final_df, data_model, daily_cube, start_date, end_date):
+    # Mengambil rollup (kategori tarif pengiriman, skor review) dari cube untuk baris yang
+    # memiliki nilai freight_value dan review_score
+    clean_df = cube.slice_days(daily_cube['freight'], start_date, end_date)
+    if clean_df.empty:
+        return None
+
+    labels = cube.FREIGHT_LABELS
+
+    # Jumlah pesanan dan rata-rata skor review untuk setiap kategori tarif pengiriman
+    review_score = clean_df['review_score'].to_numpy(dtype='float64')
+    freight_stats = binstats.binned_stats(clean_df['freight_bucket'], review_score, clean_df['rows'], n_bins=len(labels))
+
+    freight_moments = moments.combine(cube.slice_days(daily_cube['freight_moments'], start_date, end_date))
+
+    return {
+        # Rata-rata review score untuk setiap kategori tarif pengiriman
+        'avg_ratings': pd.Series(freight_stats['mean'].to_numpy(), index=labels),
+        # Jumlah pesanan untuk setiap kategori tarif pengiriman
+        'order_counts': pd.Series(freight_stats['count'].to_numpy(), index=labels),
+        # Korelasi Pearson antara nilai tarif pengiriman dan review score dari momen harian
+        'correlation': moments.correlation(freight_moments),
+        # Perubahan review score untuk setiap tambahan 10 tarif pengiriman
+        'score_per_10_freight': moments.slope(freight_moments) * 10,
+    }
+
+
+# ===== RFM ANALYSIS =====
+def rfm(final_df, data_model, daily_cube, start_date, end_date):
+    # Satu baris per pesanan dengan total pembayarannya, terurut berdasarkan waktu pembelian
+    orders = time_index.slice_range(data_model['orders'], start_date, end_date)
+    # Recency, frequency dan monetary per pelanggan beserta skor kuantil dan segmennya
+    rfm_df = rfm_engine.score_rfm(rfm_engine.compute_rfm(orders))
+    return {'rfm_df': rfm_df, 'segments': rfm_engine.segment_summary(rfm_df)}
+
+
+# Urutan bagian dashboard beserta fungsi perhitungannya
+SECTIONS = {
+    'distribution': distribution,
+    'category_sales': category_sales,
+    'monthly_trend': monthly_trend,
+    'weight_delivery': weight_delivery,
+    'delivery_review': delivery_review,
+    'freight_review': freight_review,
+    'rfm': rfm,
+}
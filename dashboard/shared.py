@@ -0,0 +1,183 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import chunked
+import storage
+import time_index
+
+# Dataset dashboard (ID sudah dikodekan dan terurut berdasarkan waktu) sebagai file Arrow IPC tanpa kompresi
+# yang dibuka dengan memory map. Kolom DataFrame langsung menunjuk ke halaman file tersebut (zero-copy),
+# sehingga semua sesi dan semua proses Streamlit di satu host memakai halaman page cache yang sama dan
+# tidak ada proses yang menyimpan salinan dataset sendiri. File ditulis sekali per versi dataset.
+
+SHARED_DIR = os.path.join(storage.CURRENT_DIR, 'build', 'shared')
+
+DATASET_FILE = 'dataset.arrow'
+# Metadata skema: kolom tanggal disimpan sebagai int64 (NaT = nilai minimum) agar tetap zero-copy
+DATETIME_METADATA = b'datetime_columns'
+# Umur minimum (detik) direktori sementara sebelum dianggap sisa penulisan yang gagal dan dihapus
+STALE_TEMP_SECONDS = 3600
+
+
+# Direktori file bersama untuk satu versi dataset
+def shared_dir(version, root=SHARED_DIR):
+    return os.path.join(root, version)
+
+
+def _write_table(table, path):
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+# Mengubah DataFrame menjadi tabel Arrow tanpa nilai null: NaN float tetap NaN dan tanggal disimpan sebagai int64
+def to_table(df):
+    arrays, datetime_columns = {}, []
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            arrays[col] = pa.DictionaryArray.from_arrays(
+                pa.array(codes, mask=codes < 0), pa.array(series.cat.categories.to_numpy(dtype=object))
+            )
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            arrays[col] = pa.array(series.to_numpy().astype('datetime64[ns]').view('int64'))
+            datetime_columns.append(col)
+        else:
+            arrays[col] = pa.array(series.to_numpy())
+    table = pa.table(arrays)
+    return table.replace_schema_metadata({DATETIME_METADATA: ','.join(datetime_columns).encode()})
+
+
+# Membaca tabel hasil to_table kembali sebagai DataFrame yang kolomnya menunjuk ke buffer Arrow
+def from_table(table):
+    metadata = table.schema.metadata or {}
+    datetime_columns = set(filter(None, metadata.get(DATETIME_METADATA, b'').decode().split(',')))
+    frame = table.to_pandas(split_blocks=True)
+    columns = {}
+    for col in frame.columns:
+        if col in datetime_columns:
+            columns[col] = pd.Series(frame[col].to_numpy().view('datetime64[ns]'), name=col, copy=False)
+        else:
+            columns[col] = frame[col]
+    # Dibangun dari dict Series tanpa konsolidasi blok agar tidak ada kolom yang disalin
+    return pd.DataFrame(columns, copy=False)
+
+
+# Menulis dataset dan tabel lookup ID ke direktori versi secara atomik (direktori sementara lalu rename),
+# sehingga proses lain tidak pernah membuka file yang belum selesai ditulis
+def write_shared(df, id_lookup, directory):
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+    try:
+        _write_table(to_table(df), os.path.join(temp_dir, DATASET_FILE))
+        for col, values in id_lookup.items():
+            _write_table(pa.table({col: pa.array(values, type=pa.string())}), os.path.join(temp_dir, f"ids_{col}.arrow"))
+        try:
+            os.rename(temp_dir, directory)
+        except OSError:
+            # Proses lain sudah menulis versi yang sama lebih dulu
+            if not os.path.exists(os.path.join(directory, DATASET_FILE)):
+                raise
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return directory
+
+
+def _open_table(path):
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+
+# Membuka dataset bersama dengan memory map. Tabel lookup ID tetap berupa array string Arrow (juga di-memory map);
+# storage.decode_ids menerimanya secara langsung.
+def open_shared(directory):
+    df = from_table(_open_table(os.path.join(directory, DATASET_FILE)))
+    id_lookup = {}
+    for name in sorted(os.listdir(directory)):
+        if name.startswith('ids_') and name.endswith('.arrow'):
+            col = name[len('ids_'):-len('.arrow')]
+            id_lookup[col] = _open_table(os.path.join(directory, name)).column(col).combine_chunks()
+    return df, id_lookup
+
+
+# Memuat dataset seperti dashboard (kolom dashboard, ID dikodekan, terurut berdasarkan waktu)
+def build_dataset(path, columns=storage.DASHBOARD_COLUMNS):
+    if path.endswith('.parquet'):
+        df = storage.read_dataset(path, columns=columns)
+    else:
+        df = storage.read_csv_dataset(path, columns=columns)
+    df, id_lookup = storage.encode_ids(df)
+    return time_index.sort_by_time(df), id_lookup
+
+
+# Dataset bersama untuk versi dataset: dibuat dari file dataset jika belum ada, lalu selalu dibuka dari file
+# Arrow sehingga proses yang membuatnya pun tidak menyimpan salinan pribadi
+def load_dataset(path, version, columns=storage.DASHBOARD_COLUMNS, root=SHARED_DIR):
+    directory = shared_dir(version, root)
+    if not os.path.exists(os.path.join(directory, DATASET_FILE)):
+        df, id_lookup = build_dataset(path, columns)
+        write_shared(df, id_lookup, directory)
+        del df, id_lookup
+    return open_shared(directory)
+
+
+# Menghapus file bersama versi lama (proses yang masih membukanya tetap dapat membaca sampai selesai) dan
+# direktori sementara yang lebih tua dari stale_seconds (sisa proses yang berhenti saat menulis); direktori
+# sementara yang lebih baru mungkin masih ditulis proses lain
+def remove_old_versions(version, root=SHARED_DIR, stale_seconds=STALE_TEMP_SECONDS):
+    if not os.path.isdir(root):
+        return
+    now = time.time()
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name.startswith('.tmp-'):
+            try:
+                stale = now - os.path.getmtime(path) > stale_seconds
+            except OSError:
+                continue
+            if stale:
+                shutil.rmtree(path, ignore_errors=True)
+        elif name != version:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+# Jumlah kolom DataFrame yang datanya berada di memory map (bukan salinan di heap proses)
+def zero_copy_columns(df, table):
+    shared = 0
+    for col in df.columns:
+        series = df[col]
+        values = series.cat.codes.to_numpy() if isinstance(series.dtype, pd.CategoricalDtype) else series.to_numpy()
+        buffer = table.column(col).chunk(0).buffers()[1]
+        shared += buffer is not None and np.asarray(values).__array_interface__['data'][0] == buffer.address
+    return shared
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Membuat dataset bersama (Arrow IPC, memory map) untuk dashboard")
+    parser.add_argument('--data', default=None, help="Path dataset (default: dataset dashboard)")
+    parser.add_argument('--root', default=SHARED_DIR)
+    args = parser.parse_args(argv)
+
+    path = args.data or storage.dataset_path()
+    version = storage.dataset_version(path)
+    before = chunked.current_memory_mb()
+    load_dataset(path, version, root=args.root)
+    remove_old_versions(version, args.root)
+    directory = shared_dir(version, args.root)
+    table = _open_table(os.path.join(directory, DATASET_FILE))
+    df = from_table(table)
+    print(f"Dataset bersama di {directory}: {len(df):,} baris, "
+          f"{zero_copy_columns(df, table)}/{len(df.columns)} kolom zero-copy, "
+          f"RSS bertambah {chunked.current_memory_mb() - before:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
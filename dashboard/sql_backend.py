@@ -0,0 +1,288 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import cube
+import hll
+import model
+import quantiles
+import sections
+import storage
+import time_index
+
+# Backend query SQL (DuckDB): rollup yang sama dengan cube.build_cube dan tabel pesanan model.build_model
+# dihitung langsung dari file dataset, hanya untuk rentang tanggal yang diminta. Filter waktu pembelian
+# di-push-down ke pembaca Parquet sehingga row group di luar rentang tidak dibaca, dan agregasi dijalankan
+# secara vektorisasi di semua core tanpa memuat dataset ke DataFrame pandas.
+# Fungsi perhitungan di sections.py dipakai apa adanya di atas rollup hasil SQL.
+
+# Filter rentang tanggal [start, end) pada waktu pembelian
+TIME_FILTER = "order_purchase_timestamp >= $start AND order_purchase_timestamp < $end"
+
+# Waktu pengiriman dalam hari, dibulatkan ke bawah seperti cube.delivery_days
+DELIVERY_DAYS = (
+    "CAST(floor((epoch_us(order_delivered_customer_date) - epoch_us(order_purchase_timestamp)) / 86400e6) AS INTEGER)"
+)
+
+# Rollup dan tabel yang dibutuhkan setiap bagian dashboard
+SECTION_ROLLUPS = {
+    'distribution': ['payment', 'review', 'seller_distinct', 'customer_distinct'],
+    'category_sales': ['category'],
+    'monthly_trend': ['category'],
+    'weight_delivery': ['weight', 'weight_moments', 'delivery_sketch'],
+    'delivery_review': ['delivery_review', 'delivery_review_moments', 'delivery_review_sketch'],
+    'freight_review': ['freight', 'freight_moments'],
+    'rfm': ['orders'],
+}
+
+
+# Membuka koneksi DuckDB (dependensi opsional, hanya dibutuhkan untuk backend ini)
+def connect(threads=None):
+    try:
+        import duckdb
+    except ImportError as error:
+        raise ImportError("Backend query duckdb membutuhkan paket duckdb (pip install duckdb)") from error
+    con = duckdb.connect()
+    if threads:
+        con.execute(f"SET threads = {int(threads)}")
+    return con
+
+
+# Sumber tabel SQL untuk file dataset (Parquet atau clean_data.csv)
+def _source(path):
+    if path.endswith('.parquet'):
+        return "read_parquet($path)"
+    return "read_csv_auto($path)"
+
+
+# Ekspresi CASE untuk kode bucket, sama dengan cube.bucket_codes (bucket tertutup di kanan, -1 di luar bin)
+def _bucket_sql(column, bins):
+    cases = [f"WHEN {column} IS NULL OR {column} <= {bins[0]} THEN -1"]
+    for code, upper in enumerate(bins[1:]):
+        if upper != float('inf'):
+            cases.append(f"WHEN {column} <= {upper} THEN {code}")
+        else:
+            cases.append(f"WHEN isfinite({column}) THEN {code}")
+    return f"CAST(CASE {' '.join(cases)} ELSE -1 END AS SMALLINT)"
+
+
+# Ekspresi kunci bucket sketch kuantil, sama dengan quantiles.sketch_keys
+def _sketch_key_sql(column, accuracy):
+    log_gamma = np.log(quantiles.gamma_for(accuracy))
+    return f"CASE WHEN {column} > 0 THEN CAST(ceil(ln({column}) / {log_gamma!r}) AS INTEGER) ELSE {quantiles.ZERO_KEY} END"
+
+
+def _sketch_query(values, where, accuracy):
+    return f"""
+        SELECT day, {_sketch_key_sql('v', accuracy)} AS key, count(*) AS rows, sum(v) AS value_sum
+        FROM (SELECT day, CAST({values} AS DOUBLE) AS v FROM base WHERE {where})
+        GROUP BY ALL ORDER BY day, key
+    """
+
+
+# Record momen (x, y) per hari (dan delivery_days) seperti moments.rollup; regr_sxx/regr_syy/regr_sxy DuckDB
+# menghitung jumlah kuadrat simpangan dan co-moment secara stabil
+def _moments_query(x, y, where, delivery_days=None):
+    keys = f"day, {delivery_days} AS delivery_days" if delivery_days else "day"
+    return f"""
+        SELECT {keys}, count(*) AS n, avg({x}) AS mean_x, avg({y}) AS mean_y,
+               regr_sxx({y}, {x}) AS m2_x, regr_syy({y}, {x}) AS m2_y, regr_sxy({y}, {x}) AS c_xy
+        FROM base WHERE {where} GROUP BY ALL ORDER BY ALL
+    """
+
+
+# Query SQL untuk setiap rollup; tabel base berisi baris dataset dalam rentang tanggal beserta kolom day.
+# Kolom hasil mengikuti rollup dengan nama yang sama di cube.build_cube.
+def _rollup_queries(accuracy):
+    delivered = "order_delivered_customer_date IS NOT NULL"
+    reviewed = f"{delivered} AND review_score IS NOT NULL"
+    rated = "freight_value IS NOT NULL AND review_score IS NOT NULL"
+    weight_valid = f"{_bucket_sql('product_weight_g', cube.WEIGHT_BINS)} >= 0"
+    return {
+        'payment': "SELECT day, payment_type, count(*) AS rows FROM base WHERE payment_type IS NOT NULL GROUP BY ALL ORDER BY ALL",
+        'review': "SELECT day, review_score, count(*) AS rows FROM base WHERE review_score IS NOT NULL GROUP BY ALL ORDER BY ALL",
+        'seller_distinct': """
+            SELECT seller_city, count(DISTINCT seller_id) AS sellers FROM base
+            WHERE seller_city IS NOT NULL GROUP BY ALL ORDER BY ALL
+        """,
+        'customer_distinct': """
+            SELECT customer_city, count(DISTINCT customer_unique_id) AS customers FROM base
+            WHERE customer_city IS NOT NULL GROUP BY ALL ORDER BY ALL
+        """,
+        'category': """
+            SELECT day, product_category_name_english,
+                   sum(payment_value) AS payment_value, sum(price) AS price
+            FROM items WHERE product_category_name_english IS NOT NULL GROUP BY ALL ORDER BY ALL
+        """,
+        'weight': f"""
+            SELECT day, {DELIVERY_DAYS} AS delivery_days, {_bucket_sql('product_weight_g', cube.WEIGHT_BINS)} AS weight_bucket,
+                   count(*) AS rows
+            FROM base WHERE {delivered} GROUP BY ALL ORDER BY ALL
+        """,
+        'weight_moments': _moments_query(
+            'CAST(product_weight_g AS DOUBLE)', DELIVERY_DAYS, f"{delivered} AND {weight_valid}", DELIVERY_DAYS
+        ),
+        'delivery_review': f"""
+            SELECT day, {DELIVERY_DAYS} AS delivery_days, review_score, count(*) AS rows
+            FROM base WHERE {reviewed} GROUP BY ALL ORDER BY ALL
+        """,
+        'delivery_review_moments': _moments_query(DELIVERY_DAYS, 'review_score', reviewed, DELIVERY_DAYS),
+        'freight': f"""
+            SELECT day, {_bucket_sql('freight_value', cube.FREIGHT_BINS)} AS freight_bucket, review_score,
+                   count(*) AS rows
+            FROM base WHERE {rated} GROUP BY ALL ORDER BY ALL
+        """,
+        'freight_moments': _moments_query('freight_value', 'review_score', rated),
+        'delivery_sketch': _sketch_query(DELIVERY_DAYS, delivered, accuracy),
+        'delivery_review_sketch': _sketch_query(DELIVERY_DAYS, f"{reviewed} AND {DELIVERY_DAYS} > 0", accuracy),
+        'orders': """
+            SELECT o.order_id, o.customer_unique_id, o.order_purchase_timestamp, p.payment_value
+            FROM orders o LEFT JOIN payment_totals p USING (order_id)
+            ORDER BY o.order_purchase_timestamp, o.order_id
+        """,
+    }
+
+
+# Tabel bantu (CTE) yang memecah dataset hasil merge menjadi pesanan, pembayaran dan item seperti model.build_model
+def _common_tables(path):
+    payment_key = "payment_sequential, payment_type, payment_installments, payment_value"
+    review_key = "review_score, review_creation_date, review_answer_timestamp"
+    item_key = "product_id, seller_id, shipping_limit_date, price, freight_value"
+    return f"""
+        base AS (
+            SELECT *, date_trunc('day', order_purchase_timestamp) AS day
+            FROM {_source(path)} WHERE {TIME_FILTER}
+        ),
+        orders AS (
+            SELECT order_id, first(customer_unique_id) AS customer_unique_id,
+                   first(order_purchase_timestamp) AS order_purchase_timestamp, first(day) AS day
+            FROM base GROUP BY order_id
+        ),
+        payments AS (SELECT DISTINCT order_id, {payment_key} FROM base),
+        payment_totals AS (
+            SELECT order_id, count(*) AS payment_count, sum(payment_value) AS payment_value
+            FROM payments GROUP BY order_id
+        ),
+        review_counts AS (
+            SELECT order_id, count(*) AS review_count
+            FROM (SELECT DISTINCT order_id, {review_key} FROM base) GROUP BY order_id
+        ),
+        item_rows AS (
+            SELECT order_id, {item_key}, first(product_category_name_english) AS product_category_name_english,
+                   count(*) AS rows
+            FROM base WHERE price IS NOT NULL GROUP BY order_id, {item_key}
+        ),
+        item_quantity AS (
+            SELECT i.*, o.day, coalesce(t.payment_value, 0) AS order_payment,
+                   greatest(i.rows // (greatest(t.payment_count, 1) * greatest(r.review_count, 1)), 1) AS quantity
+            FROM item_rows i JOIN orders o USING (order_id)
+            JOIN payment_totals t USING (order_id) JOIN review_counts r USING (order_id)
+        ),
+        items AS (
+            SELECT day, product_category_name_english, price * quantity AS price,
+                   CASE WHEN sum(value) OVER (PARTITION BY order_id) > 0
+                        THEN value / sum(value) OVER (PARTITION BY order_id) * order_payment ELSE 0 END AS payment_value
+            FROM (SELECT *, (coalesce(price, 0) + coalesce(freight_value, 0)) * quantity AS value FROM item_quantity)
+        )
+    """
+
+
+def _params(path, start_date, end_date):
+    return {
+        'path': path,
+        'start': pd.Timestamp(start_date).normalize(),
+        # Tanggal akhir bersifat inklusif sehingga batasnya adalah awal hari berikutnya
+        'end': pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1),
+    }
+
+
+# Menjalankan query rollup dan menyamakan tipe kolomnya dengan rollup cube
+def _fetch(con, path, query, start_date, end_date):
+    result = con.execute(f"WITH {_common_tables(path)} {query}", _params(path, start_date, end_date)).df()
+    for col in result.columns:
+        if pd.api.types.is_datetime64_any_dtype(result[col]):
+            result[col] = result[col].astype('datetime64[ns]')
+    for col in storage.CATEGORY_COLUMNS:
+        if col in result.columns:
+            result[col] = result[col].astype('category')
+    for col in ['review_score', 'delivery_days']:
+        if col in result.columns:
+            result[col] = result[col].astype('float32' if col == 'review_score' else 'int32')
+    return result
+
+
+# Cube (dan model) untuk rentang tanggal: berisi rollup yang dibutuhkan bagian dashboard tertentu.
+# Jumlah penjual/pembeli unik per kota dihitung exact oleh SQL untuk rentang tanggal tersebut.
+def range_inputs(con, path, name, start_date, end_date, quantile_accuracy=0.01):
+    queries = _rollup_queries(quantile_accuracy)
+    range_cube, range_model = {}, {}
+    for rollup in SECTION_ROLLUPS[name]:
+        result = _fetch(con, path, queries[rollup], start_date, end_date)
+        if rollup == 'orders':
+            range_model['orders'] = result
+        elif rollup.endswith('_distinct'):
+            range_cube[rollup] = result.set_index(result.columns[0])[result.columns[1]].astype('int64')
+        else:
+            range_cube[rollup] = result
+    return range_cube, range_model
+
+
+# Menghitung satu bagian dashboard dengan backend SQL
+def compute_section(con, path, name, start_date, end_date, quantile_accuracy=0.01, **options):
+    range_cube, range_model = range_inputs(con, path, name, start_date, end_date, quantile_accuracy)
+    return sections.SECTIONS[name](None, range_model, range_cube, start_date, end_date, **options)
+
+
+# Jumlah baris dataset per hari untuk seluruh dataset (filter tanggal di sidebar)
+def daily_rows(con, path):
+    rows = con.execute(f"""
+        SELECT date_trunc('day', order_purchase_timestamp) AS day, count(*) AS rows
+        FROM {_source(path)} GROUP BY day ORDER BY day
+    """, {'path': path}).df()
+    return rows.astype({'day': 'datetime64[ns]'})
+
+
+# Membandingkan waktu perhitungan setiap bagian antara backend pandas (cube di memori) dan backend SQL
+def benchmark(path, start_date=None, end_date=None, repeat=3):
+    start = time.perf_counter()
+    df = storage.read_columns(path, storage.BUILD_COLUMNS)
+    df, _ = storage.encode_ids(df)
+    df = time_index.sort_by_time(df)
+    data_model = model.build_model(df)
+    daily_cube = cube.build_cube(df, data_model, hll_precision=hll.precision_for_error(0.01))
+    results = {'pandas_load': time.perf_counter() - start}
+
+    start_date = start_date or df['order_purchase_timestamp'].min().date()
+    end_date = end_date or df['order_purchase_timestamp'].max().date()
+    con = connect()
+    for name, section in sections.SECTIONS.items():
+        pandas_times, sql_times = [], []
+        for _ in range(repeat):
+            begin = time.perf_counter()
+            section(df, data_model, daily_cube, start_date, end_date)
+            pandas_times.append(time.perf_counter() - begin)
+            begin = time.perf_counter()
+            compute_section(con, path, name, start_date, end_date)
+            sql_times.append(time.perf_counter() - begin)
+        results[name] = {'pandas': min(pandas_times), 'duckdb': min(sql_times)}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark backend query pandas vs DuckDB per bagian dashboard")
+    parser.add_argument('--data', default=None, help="Path dataset (default: dataset dashboard)")
+    parser.add_argument('--start', default=None, help="Tanggal awal (YYYY-MM-DD)")
+    parser.add_argument('--end', default=None, help="Tanggal akhir (YYYY-MM-DD)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.data or storage.dataset_path(), args.start, args.end, args.repeat)
+    print(f"load pandas (dataset + model + cube) {results.pop('pandas_load'):.2f} s")
+    for name, timing in results.items():
+        print(f"{name:16s} pandas {timing['pandas'] * 1000:8.1f} ms, duckdb {timing['duckdb'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import time_index
+
+# Lokasi default file data (berada di direktori yang sama dengan script ini)
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CSV_PATH = os.path.join(CURRENT_DIR, "clean_data.csv")
+PARQUET_PATH = os.path.join(CURRENT_DIR, "clean_data.parquet")
+
+# ===== SKEMA DATASET =====
+# Kolom tanggal disimpan langsung sebagai timestamp sehingga tidak perlu pd.to_datetime saat load
+DATE_COLUMNS = [
+    'order_purchase_timestamp',
+    'order_approved_at',
+    'order_delivered_carrier_date',
+    'order_delivered_customer_date',
+    'order_estimated_delivery_date',
+    'shipping_limit_date',
+    'review_creation_date',
+    'review_answer_timestamp',
+]
+
+# Kolom teks berulang disimpan sebagai dictionary (categorical)
+CATEGORY_COLUMNS = [
+    'order_status',
+    'customer_city',
+    'customer_state',
+    'product_category_name',
+    'product_category_name_english',
+    'seller_city',
+    'seller_state',
+    'payment_type',
+]
+
+# Kolom numerik yang cukup disimpan dengan presisi lebih kecil
+FLOAT32_COLUMNS = [
+    'product_name_lenght',
+    'product_description_lenght',
+    'product_photos_qty',
+    'product_weight_g',
+    'product_length_cm',
+    'product_height_cm',
+    'product_width_cm',
+    'review_score',
+    'payment_sequential',
+    'payment_installments',
+]
+INT32_COLUMNS = [
+    'customer_zip_code_prefix',
+    'seller_zip_code_prefix',
+]
+
+# Kolom nilai uang tetap float64 agar penjumlahan sampai sen tidak bergeser
+MONEY_COLUMNS = ['price', 'freight_value', 'payment_value']
+
+# Kolom ID heksadesimal 32 karakter yang di memori diganti dengan kode integer
+ID_COLUMNS = ['order_id', 'customer_unique_id', 'seller_id', 'product_id']
+
+# Path dataset yang dipakai dashboard: Parquet jika tersedia, jika tidak CSV
+def dataset_path():
+    return PARQUET_PATH if os.path.exists(PARQUET_PATH) else CSV_PATH
+
+
+# Nama kolom yang tersedia di file dataset (tanpa membaca isinya)
+def available_columns(path=None):
+    path = path or dataset_path()
+    if path.endswith('.parquet'):
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+# Versi dataset berdasarkan waktu modifikasi dan ukuran file, berubah setiap kali dataset dibangun ulang
+def dataset_version(path=None):
+    stat = os.stat(path or dataset_path())
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+# Kolom yang dibutuhkan oleh masing-masing bagian dashboard
+SECTION_COLUMNS = {
+    'filter': ['order_purchase_timestamp'],
+    'distribution': ['seller_city', 'seller_id', 'customer_city', 'customer_unique_id', 'payment_type', 'review_score'],
+    'category_sales': ['product_category_name_english', 'payment_value', 'order_id'],
+    'monthly_trend': ['product_category_name_english', 'price'],
+    'weight_delivery': ['order_delivered_customer_date', 'product_weight_g'],
+    'delivery_review': ['order_delivered_customer_date', 'review_score'],
+    'freight_review': ['freight_value', 'review_score'],
+    'rfm': ['customer_unique_id', 'order_id', 'payment_value'],
+    # Tabel pesanan, item dan pembayaran (model.py) untuk agregasi nilai uang tanpa duplikasi
+    'model': ['order_id', 'customer_unique_id', 'product_id', 'seller_id', 'shipping_limit_date', 'price',
+              'freight_value', 'product_category_name_english', 'payment_sequential', 'payment_type',
+              'payment_installments', 'payment_value', 'review_score', 'review_creation_date',
+              'review_answer_timestamp'],
+}
+
+
+# Menggabungkan kolom dari beberapa bagian tanpa duplikasi dengan urutan yang tetap
+def columns_for(*sections):
+    columns = []
+    for section in sections:
+        for column in SECTION_COLUMNS[section]:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+# Kolom dataset dashboard yang selalu dimuat; kolom model hanya dibaca saat model dibangun (model.load_model)
+DASHBOARD_COLUMNS = columns_for(*(section for section in SECTION_COLUMNS if section != 'model'))
+# Kolom dashboard dan model sekaligus, untuk membangun model dan cube dari satu DataFrame
+# (per potongan pada mode out-of-core, atau script benchmark)
+BUILD_COLUMNS = columns_for(*SECTION_COLUMNS)
+
+
+# Menerapkan skema eksplisit pada DataFrame hasil merge
+def apply_schema(df):
+    df = df.copy()
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col])
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('float32')
+    for col in INT32_COLUMNS:
+        if col in df.columns and not df[col].isna().any():
+            df[col] = df[col].astype('int32')
+    for col in MONEY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('float64')
+    return df
+
+
+# Mengganti kolom ID dengan kode integer padat (int32, -1 untuk nilai kosong).
+# Kode mengikuti urutan ID aslinya sehingga sort/groupby berdasarkan kode sama dengan berdasarkan string.
+# Mengembalikan DataFrame baru dan tabel lookup {kolom: array ID} untuk menampilkan ID asli.
+def encode_ids(df, columns=ID_COLUMNS):
+    df = df.copy(deep=False)
+    id_lookup = {}
+    for col in columns:
+        if col in df.columns:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            df[col] = codes.astype('int32')
+            id_lookup[col] = np.asarray(uniques, dtype=object)
+    return df, id_lookup
+
+
+# Mengubah kode integer kembali menjadi ID asli
+def decode_ids(codes, values):
+    codes = np.asarray(codes, dtype='int64')
+    if isinstance(values, pa.Array):
+        # Tabel lookup dari dataset bersama (array string Arrow yang di-memory map)
+        values = values.take(pa.array(np.maximum(codes, 0))).to_numpy(zero_copy_only=False) if len(values) else None
+    elif len(values):
+        values = values[np.maximum(codes, 0)]
+    else:
+        values = None
+    return np.where(codes >= 0, values, None)
+
+
+# Membaca clean_data.csv hasil notebook (kolom pertama adalah index dari to_csv)
+def read_csv_dataset(path=CSV_PATH, columns=None):
+    if columns is None:
+        df = pd.read_csv(path, index_col=0)
+    else:
+        df = pd.read_csv(path, usecols=lambda col: col in columns)
+    return apply_schema(df)
+
+
+# Menyimpan dataset ke format Parquet dengan skema yang sudah diterapkan, terurut berdasarkan waktu pembelian
+def write_dataset(df, path=PARQUET_PATH, row_group_size=256_000):
+    df = time_index.sort_by_time(apply_schema(df))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, path, compression='zstd', row_group_size=row_group_size)
+    return path
+
+
+# Membaca dataset Parquet, hanya kolom yang diminta
+def read_dataset(path=PARQUET_PATH, columns=None):
+    if columns is not None:
+        available = pq.read_schema(path).names
+        columns = [col for col in columns if col in available]
+    return pq.read_table(path, columns=columns).to_pandas()
+
+
+# Membaca kolom tertentu dari dataset Parquet atau CSV sesuai ekstensi path
+def read_columns(path, columns):
+    if path.endswith('.parquet'):
+        return read_dataset(path, columns=columns)
+    return read_csv_dataset(path, columns=columns)
+
+
+# Mengubah clean_data.csv menjadi clean_data.parquet
+def convert_csv(csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    return write_dataset(read_csv_dataset(csv_path), parquet_path)
+
+
+# Membandingkan waktu load dan penggunaan memori antara CSV dan Parquet
+def measure(csv_path=CSV_PATH, parquet_path=PARQUET_PATH, columns=DASHBOARD_COLUMNS):
+    results = {}
+
+    start = time.perf_counter()
+    csv_df = pd.read_csv(csv_path)
+    for col in ['order_purchase_timestamp', 'order_delivered_customer_date', 'order_estimated_delivery_date']:
+        csv_df[col] = pd.to_datetime(csv_df[col])
+    results['csv'] = {
+        'seconds': time.perf_counter() - start,
+        'memory_mb': csv_df.memory_usage(deep=True).sum() / 1e6,
+        'file_mb': os.path.getsize(csv_path) / 1e6,
+    }
+    del csv_df
+
+    start = time.perf_counter()
+    parquet_df = read_dataset(parquet_path, columns=columns)
+    results['parquet'] = {
+        'seconds': time.perf_counter() - start,
+        'memory_mb': parquet_df.memory_usage(deep=True).sum() / 1e6,
+        'file_mb': os.path.getsize(parquet_path) / 1e6,
+    }
+
+    start = time.perf_counter()
+    encoded_df, id_lookup = encode_ids(parquet_df)
+    results['parquet+ids'] = {
+        'seconds': results['parquet']['seconds'] + time.perf_counter() - start,
+        'memory_mb': (encoded_df.memory_usage(deep=True).sum()
+                      + sum(pd.Series(values).memory_usage(deep=True) for values in id_lookup.values())) / 1e6,
+        'file_mb': results['parquet']['file_mb'],
+    }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Konversi clean_data.csv ke format Parquet bertipe")
+    parser.add_argument('--csv', default=CSV_PATH, help="Path clean_data.csv sumber")
+    parser.add_argument('--out', default=PARQUET_PATH, help="Path file Parquet tujuan")
+    parser.add_argument('--measure', action='store_true', help="Tampilkan perbandingan waktu load dan memori")
+    args = parser.parse_args(argv)
+
+    convert_csv(args.csv, args.out)
+    print(f"Dataset tersimpan di {args.out}")
+
+    if args.measure:
+        for fmt, result in measure(args.csv, args.out).items():
+            print(f"{fmt:12s} load {result['seconds']:.2f} s, memori {result['memory_mb']:.1f} MB, file {result['file_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
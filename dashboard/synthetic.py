@@ -0,0 +1,261 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import build
+import hll
+import storage
+import time_index
+
+# Generator dataset sintetis dengan skema Olist untuk benchmark. Tabel pesanan, pelanggan, item, pembayaran dan
+# review dibangkitkan per potongan (pesanan dalam satu jendela waktu), sedangkan produk, penjual dan terjemahan
+# kategori diambil dari data/. Setiap potongan di-merge dengan build.merge_tables dan build.impute seperti
+# dataset asli lalu ditulis ke Parquet, sehingga ukuran dataset (10^5 - 10^8 baris) tidak dibatasi memori.
+
+# Rentang waktu pembelian (sama dengan dataset Olist)
+START_TIME = pd.Timestamp('2016-09-04')
+END_TIME = pd.Timestamp('2018-09-03')
+
+# Distribusi jumlah item, pembayaran dan review per pesanan serta jenis pembayaran dan status pesanan
+ITEM_COUNTS = ([1, 2, 3, 4], [0.90, 0.075, 0.015, 0.01])
+PAYMENT_COUNTS = ([1, 2, 3], [0.96, 0.03, 0.01])
+REVIEW_COUNTS = ([1, 2], [0.99, 0.01])
+PAYMENT_TYPES = (['credit_card', 'boleto', 'voucher', 'debit_card'], [0.74, 0.19, 0.055, 0.015])
+ORDER_STATUSES = (['delivered', 'shipped', 'canceled', 'unavailable', 'invoiced', 'processing'],
+                  [0.97, 0.011, 0.006, 0.006, 0.004, 0.003])
+
+# Distribusi skor review untuk pengiriman tepat waktu dan terlambat (> 20 hari)
+REVIEW_SCORES = [1, 2, 3, 4, 5]
+ON_TIME_SCORES = [0.07, 0.03, 0.08, 0.20, 0.62]
+LATE_SCORES = [0.40, 0.10, 0.15, 0.15, 0.20]
+
+# Porsi pesanan dari pelanggan yang sudah pernah membeli
+REPEAT_CUSTOMER_RATE = 0.03
+
+# Rata-rata baris dataset hasil merge per pesanan (item x pembayaran x review)
+ROWS_PER_ORDER = (
+    np.dot(*ITEM_COUNTS) * np.dot(*PAYMENT_COUNTS) * np.dot(*REVIEW_COUNTS)
+)
+
+# Salt untuk setiap jenis ID agar ID yang dibangkitkan dari nomor urut yang sama tidak bertabrakan
+ID_SALTS = {'order': 1, 'customer': 2, 'customer_unique': 3, 'review': 4}
+
+_HEX_BYTES = np.array([f"{i:02x}" for i in range(256)], dtype='S2')
+
+
+# ID heksadesimal 32 karakter (seperti ID Olist) yang deterministik untuk setiap nomor urut
+def hex_ids(keys, kind):
+    keys = np.asarray(keys, dtype='uint64') + np.uint64(ID_SALTS[kind] << 48)
+    high = hll.hash64(keys)
+    low = hll.hash64(high)
+    parts = np.stack([high, low], axis=1).astype('>u8').view('u1').reshape(len(keys), 16)
+    return _HEX_BYTES[parts].view('S32').ravel().astype(str)
+
+
+# Nilai seragam [0, 1) yang deterministik untuk setiap kunci (atribut tetap per produk/pelanggan)
+def _unit(keys, salt):
+    return (hll.hash64(np.asarray(keys, dtype='uint64') + np.uint64(salt << 52)) >> np.uint64(11)) / float(1 << 53)
+
+
+# Tabel dimensi dari data/ (produk, penjual, terjemahan kategori) dan atribut tetap per produk
+def load_dimensions(rng, data_dir=build.DATA_DIR):
+    tables = {name: build.read_raw_table(name, os.path.join(data_dir, build.RAW_TABLES[name]['file']))
+              for name in ['products', 'category_translation', 'sellers']}
+    products = tables['products']
+    # Harga dan penjual tetap untuk setiap produk
+    products_info = {
+        'price': np.round(rng.lognormal(4.2, 0.9, len(products)), 2),
+        'seller': rng.integers(0, len(tables['sellers']), len(products)),
+        'weight_kg': np.nan_to_num(products['product_weight_g'].to_numpy(dtype='float64'), nan=500) / 1000,
+    }
+    # Kota pelanggan diambil dari kota penjual, diurutkan dari yang paling banyak
+    sellers = tables['sellers']
+    cities = sellers.groupby('seller_city', observed=True)['seller_state'].agg(lambda s: s.iloc[0])
+    cities = cities.loc[sellers['seller_city'].value_counts().index.intersection(cities.index, sort=False)]
+    return tables, products_info, cities
+
+
+# Membangkitkan tabel mentah untuk pesanan dengan nomor urut [first_order, first_order + n_orders)
+# yang dibeli dalam jendela waktu [start, end)
+def generate_tables(rng, dimensions, first_order, n_orders, start, end):
+    tables, products_info, cities = dimensions
+    products, sellers = tables['products'], tables['sellers']
+    order_keys = np.arange(first_order, first_order + n_orders, dtype='int64')
+
+    # ===== PESANAN DAN PELANGGAN =====
+    span = (end - start).value
+    purchase = start + pd.to_timedelta(np.sort(rng.integers(0, span, n_orders)) // 10**9 * 10**9)
+    status = rng.choice(ORDER_STATUSES[0], n_orders, p=ORDER_STATUSES[1])
+    # Sebagian pesanan berasal dari pelanggan lama (nomor urut pesanan sebelumnya)
+    repeat = (rng.random(n_orders) < REPEAT_CUSTOMER_RATE) & (order_keys > 0)
+    customer_keys = np.where(repeat, (rng.random(n_orders) * np.maximum(order_keys, 1)).astype('int64'), order_keys)
+    city_index = (_unit(customer_keys, 1) ** 3 * len(cities)).astype('int64')
+
+    # ===== ITEM =====
+    n_items = rng.choice(ITEM_COUNTS[0], n_orders, p=ITEM_COUNTS[1])
+    item_order = np.repeat(np.arange(n_orders), n_items)
+    item_seq = np.arange(len(item_order)) - np.repeat(np.cumsum(n_items) - n_items, n_items)
+    # Produk populer lebih sering dibeli; item berikutnya dalam pesanan sering produk yang sama
+    product = (rng.random(len(item_order)) ** 2 * len(products)).astype('int64')
+    same = (item_seq > 0) & (rng.random(len(item_order)) < 0.5)
+    first_item = np.repeat(np.cumsum(n_items) - n_items, n_items)
+    product = np.where(same, product[first_item], product)
+    weight_kg = products_info['weight_kg'][product]
+    price = products_info['price'][product]
+    freight = np.round(8 + 3 * weight_kg + rng.gamma(2, 3, len(item_order)), 2)
+
+    # Waktu pengiriman bertambah dengan berat pesanan
+    order_weight = np.bincount(item_order, weights=weight_kg, minlength=n_orders)
+    delivery_days = rng.gamma(2.2, 5.5, n_orders) + 0.5 * order_weight
+    delivered = (purchase + pd.to_timedelta(delivery_days * 86400, unit='s')).floor('s').to_numpy()
+    delivered[status != 'delivered'] = np.datetime64('NaT')
+
+    orders = pd.DataFrame({
+        'order_id': hex_ids(order_keys, 'order'),
+        'customer_id': hex_ids(order_keys, 'customer'),
+        'order_status': pd.Categorical(status),
+        'order_purchase_timestamp': purchase,
+        'order_approved_at': purchase + pd.Timedelta(hours=10),
+        'order_delivered_carrier_date': purchase + pd.to_timedelta(rng.gamma(2, 1.5, n_orders) * 86400 // 1, unit='s'),
+        'order_delivered_customer_date': delivered,
+        'order_estimated_delivery_date': (purchase + pd.Timedelta(days=24)).normalize(),
+    })
+    customers = pd.DataFrame({
+        'customer_id': orders['customer_id'],
+        'customer_unique_id': hex_ids(customer_keys, 'customer_unique'),
+        'customer_zip_code_prefix': (_unit(customer_keys, 2) * 99000 + 1000).astype('int32'),
+        'customer_city': pd.Categorical(cities.index.to_numpy()[city_index]),
+        'customer_state': pd.Categorical(cities.to_numpy()[city_index]),
+    })
+    order_items = pd.DataFrame({
+        'order_id': orders['order_id'].to_numpy()[item_order],
+        'order_item_id': (item_seq + 1).astype('int16'),
+        'product_id': products['product_id'].to_numpy()[product],
+        'seller_id': sellers['seller_id'].to_numpy()[products_info['seller'][product]],
+        'shipping_limit_date': purchase[item_order] + pd.Timedelta(days=6),
+        'price': price,
+        'freight_value': freight,
+    })
+
+    # ===== PEMBAYARAN =====
+    # Total pesanan dibagi ke beberapa pembayaran
+    order_total = np.bincount(item_order, weights=price + freight, minlength=n_orders)
+    n_payments = rng.choice(PAYMENT_COUNTS[0], n_orders, p=PAYMENT_COUNTS[1])
+    payment_order = np.repeat(np.arange(n_orders), n_payments)
+    payment_seq = np.arange(len(payment_order)) - np.repeat(np.cumsum(n_payments) - n_payments, n_payments)
+    share = rng.random(len(payment_order)) + 0.1
+    share = share / np.bincount(payment_order, weights=share)[payment_order]
+    payments = pd.DataFrame({
+        'order_id': orders['order_id'].to_numpy()[payment_order],
+        'payment_sequential': (payment_seq + 1).astype('int16'),
+        'payment_type': pd.Categorical(rng.choice(PAYMENT_TYPES[0], len(payment_order), p=PAYMENT_TYPES[1])),
+        'payment_installments': rng.integers(1, 11, len(payment_order)).astype('int16'),
+        'payment_value': np.round(order_total[payment_order] * share, 2),
+    })
+
+    # ===== REVIEW =====
+    n_reviews = rng.choice(REVIEW_COUNTS[0], n_orders, p=REVIEW_COUNTS[1])
+    review_order = np.repeat(np.arange(n_orders), n_reviews)
+    late = delivery_days[review_order] > 20
+    scores = np.where(
+        late,
+        rng.choice(REVIEW_SCORES, len(review_order), p=LATE_SCORES),
+        rng.choice(REVIEW_SCORES, len(review_order), p=ON_TIME_SCORES),
+    )
+    review_created = (purchase[review_order] + pd.to_timedelta(np.ceil(delivery_days[review_order]), unit='D')).normalize()
+    reviews = pd.DataFrame({
+        'review_id': hex_ids(first_order * 2 + np.arange(len(review_order)), 'review'),
+        'order_id': orders['order_id'].to_numpy()[review_order],
+        'review_score': scores.astype('float32'),
+        'review_comment_title': pd.Series(None, index=range(len(review_order)), dtype=object),
+        'review_comment_message': pd.Series(None, index=range(len(review_order)), dtype=object),
+        'review_creation_date': review_created,
+        'review_answer_timestamp': review_created + pd.to_timedelta(rng.integers(3600, 3 * 86400, len(review_order)), unit='s'),
+    })
+
+    return {
+        **tables,
+        'orders': orders,
+        'customers': customers,
+        'order_items': order_items,
+        'payments': payments,
+        'reviews': reviews,
+    }
+
+
+# Menyimpan tabel mentah satu potongan sebagai CSV Olist (ditambahkan ke file yang sudah ada)
+def _append_raw(tables, raw_dir, first):
+    for name in build.ORDER_TABLES:
+        path = os.path.join(raw_dir, build.RAW_TABLES[name]['file'])
+        tables[name].to_csv(path, index=False, mode='w' if first else 'a', header=first)
+
+
+# Membangkitkan dataset dashboard sintetis dengan sekitar `rows` baris dan menyimpannya ke Parquet.
+# raw_dir (opsional) juga menyimpan tabel mentah dalam format CSV Olist agar build.py dapat di-benchmark.
+# Mengembalikan jumlah baris dan pesanan yang dibangkitkan.
+def generate(rows, out_path, chunk_rows=1_000_000, seed=0, data_dir=build.DATA_DIR, raw_dir=None,
+             row_group_size=256_000):
+    rng = np.random.default_rng(seed)
+    dimensions = load_dimensions(rng, data_dir)
+    total_orders = max(int(np.ceil(rows / ROWS_PER_ORDER)), 1)
+    n_chunks = max(int(np.ceil(rows / chunk_rows)), 1)
+    boundaries = np.linspace(0, total_orders, n_chunks + 1).astype('int64')
+    window = (END_TIME - START_TIME) / n_chunks
+
+    if raw_dir:
+        os.makedirs(raw_dir, exist_ok=True)
+        for name in ['products', 'sellers', 'category_translation']:
+            file = build.RAW_TABLES[name]['file']
+            pd.read_csv(os.path.join(data_dir, file)).to_csv(os.path.join(raw_dir, file), index=False)
+
+    writer, schema, params = None, None, None
+    written = 0
+    try:
+        for i in range(n_chunks):
+            tables = generate_tables(
+                rng, dimensions, boundaries[i], boundaries[i + 1] - boundaries[i],
+                START_TIME + window * i, START_TIME + window * (i + 1)
+            )
+            if raw_dir:
+                _append_raw(tables, raw_dir, i == 0)
+
+            merged = build.merge_tables(tables)
+            # Parameter imputasi dihitung dari potongan pertama dan dipakai untuk semua potongan (seperti build.update)
+            if params is None:
+                params = build.imputation_params(merged)
+            chunk = time_index.sort_by_time(storage.apply_schema(build.impute(merged, params)))
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(out_path, schema, compression='zstd')
+            writer.write_table(table.cast(schema), row_group_size=row_group_size)
+            written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written, total_orders
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Membangkitkan dataset sintetis dengan skema Olist")
+    parser.add_argument('--rows', type=float, default=1e5, help="Perkiraan jumlah baris dataset (mis. 1e6)")
+    parser.add_argument('--out', default=storage.PARQUET_PATH, help="Path file Parquet tujuan")
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000, help="Jumlah baris per potongan")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=build.DATA_DIR, help="Direktori products/sellers/translation CSV")
+    parser.add_argument('--raw-dir', default=None, help="Juga menyimpan tabel mentah sebagai CSV Olist")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows, orders = generate(int(args.rows), args.out, args.chunk_rows, args.seed, args.data_dir, args.raw_dir)
+    print(f"{rows:,} baris ({orders:,} pesanan) tersimpan di {args.out} dalam {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
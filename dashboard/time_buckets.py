@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+# Pengelompokan waktu (hari, minggu, bulan, kuartal) dengan kode integer numpy, tanpa string per baris.
+# Setiap bucket diwakili tanggal awalnya; minggu dimulai hari Senin.
+
+GRANULARITIES = ['day', 'week', 'month', 'quarter']
+
+# Judul grafik dan label sumbu untuk setiap granularitas
+TITLES = {
+    'day': ('Daily', 'Day'),
+    'week': ('Weekly', 'Week'),
+    'month': ('Monthly', 'Month'),
+    'quarter': ('Quarterly', 'Quarter'),
+}
+
+# 1970-01-01 (hari ke-0) adalah hari Kamis, sehingga Senin pertama adalah hari ke-4
+_MONDAY = 4
+
+
+# Kode integer bucket untuk setiap tanggal: hari, minggu atau bulan sejak 1970, kuartal dalam satuan bulan
+def bucket_codes(days, granularity='month'):
+    days = np.asarray(days, dtype='datetime64[ns]')
+    if granularity == 'day':
+        return days.astype('datetime64[D]').astype('int64')
+    if granularity == 'week':
+        day_codes = days.astype('datetime64[D]').astype('int64')
+        return (day_codes - _MONDAY) // 7
+    month_codes = days.astype('datetime64[M]').astype('int64')
+    if granularity == 'month':
+        return month_codes
+    if granularity == 'quarter':
+        return month_codes - month_codes % 3
+    raise ValueError(f"Granularitas tidak dikenal: {granularity}")
+
+
+# Tanggal awal bucket dari kode integer-nya
+def bucket_starts(codes, granularity='month'):
+    codes = np.asarray(codes, dtype='int64')
+    if granularity == 'day':
+        return codes.astype('datetime64[D]').astype('datetime64[ns]')
+    if granularity == 'week':
+        return (codes * 7 + _MONDAY).astype('datetime64[D]').astype('datetime64[ns]')
+    return codes.astype('datetime64[M]').astype('datetime64[ns]')
+
+
+# Jumlah nilai per (bucket waktu, kategori) langsung sebagai tabel pivot: baris bucket yang memiliki data
+# (terurut), kolom kategori sesuai urutan `categories`, NaN untuk kombinasi tanpa baris
+def pivot_sum(days, category_codes, values, n_categories, granularity='month'):
+    codes = bucket_codes(days, granularity)
+    if len(codes) == 0:
+        return np.empty(0, dtype='datetime64[ns]'), np.empty((0, n_categories))
+    buckets, bucket_index = np.unique(codes, return_inverse=True)
+    cells = bucket_index * n_categories + np.asarray(category_codes, dtype='int64')
+    size = len(buckets) * n_categories
+    sums = np.bincount(cells, weights=values, minlength=size)
+    present = np.bincount(cells, minlength=size) > 0
+    table = np.where(present, sums, np.nan).reshape(len(buckets), n_categories)
+    return bucket_starts(buckets, granularity), table
+
+
+# Pivot jumlah `value` per bucket waktu untuk kategori terpilih dari tabel harian (kolom `day`)
+def pivot(frame, by, value, categories, granularity='month', index_name='year_month'):
+    categories = list(categories)
+    positions = pd.Index(categories).get_indexer(frame[by])
+    selected = positions >= 0
+    starts, table = pivot_sum(
+        frame['day'].to_numpy()[selected], positions[selected], frame[value].to_numpy()[selected],
+        len(categories), granularity
+    )
+    return pd.DataFrame(
+        table, index=pd.DatetimeIndex(starts, name=index_name), columns=pd.Index(categories, name=by)
+    )
+
+
+# Label satu bucket untuk teks insight
+def label(timestamp, granularity='month'):
+    timestamp = pd.Timestamp(timestamp)
+    if granularity == 'day':
+        return timestamp.strftime('%d %B %Y')
+    if granularity == 'week':
+        return f"minggu {timestamp.strftime('%d %B %Y')}"
+    if granularity == 'quarter':
+        return f"Q{timestamp.quarter} {timestamp.year}"
+    return timestamp.strftime('%B %Y')
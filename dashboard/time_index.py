@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+# Kolom waktu yang menjadi kunci urutan dataset
+TIME_COLUMN = 'order_purchase_timestamp'
+
+
+# Mengurutkan dataset berdasarkan kolom waktu (dilewati jika sudah terurut)
+def sort_by_time(df, column=TIME_COLUMN):
+    if df[column].is_monotonic_increasing:
+        return df
+    return df.sort_values(column, kind='stable').reset_index(drop=True)
+
+
+# Posisi awal dan akhir baris untuk rentang tanggal [start_date, end_date] dengan binary search
+def range_bounds(timestamps, start_date, end_date):
+    start = np.datetime64(pd.Timestamp(start_date), 'ns')
+    # Tanggal akhir bersifat inklusif sehingga batasnya adalah awal hari berikutnya
+    end = np.datetime64(pd.Timestamp(end_date) + pd.Timedelta(days=1), 'ns')
+    lo = int(np.searchsorted(timestamps, start, side='left'))
+    hi = int(np.searchsorted(timestamps, end, side='left'))
+    return lo, max(lo, hi)
+
+
+# Mengambil baris dalam rentang tanggal sebagai view (tanpa menyalin data)
+def slice_range(df, start_date, end_date, column=TIME_COLUMN):
+    lo, hi = range_bounds(df[column].to_numpy(), start_date, end_date)
+    return df.iloc[lo:hi]
@@ -0,0 +1,116 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+
+import config
+
+# Warm-up dashboard sebelum server menerima trafik. Dashboard sendiri hanya mengimpor library berat
+# (matplotlib, seaborn/scipy, Plotly) saat grafik pertama dirender; warm-up mengimpornya lebih dulu, menyiapkan
+# file dataset bersama beserta page cache-nya, lalu menjalankan script dashboard sekali di proses yang sama
+# sehingga cache Streamlit (dataset, model, cube, hasil bagian awal dan grafiknya) sudah terisi.
+# `python warmup.py serve` menjalankan server Streamlit di proses tersebut setelah warm-up selesai,
+# sehingga port baru dibuka (dan health check baru berhasil) ketika halaman pertama sudah siap.
+# Modul dashboard lainnya baru diimpor di dalam fungsi agar waktu impornya ikut terukur.
+
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard.py')
+
+# Library berat sesuai urutan dipakai: dataset, grafik PNG, grafik interaktif, server
+HEAVY_MODULES = ['pandas', 'pyarrow', 'matplotlib.figure', 'seaborn', 'plotly.graph_objects', 'streamlit']
+DASHBOARD_MODULES = ['storage', 'shared', 'model', 'cube', 'sections', 'charts', 'interactive', 'insights', 'instrumentation']
+
+
+# Waktu impor setiap modul (detik) sesuai urutan; modul yang sudah dimuat oleh modul sebelumnya bernilai ~0
+def import_modules(modules):
+    timings = {}
+    for module in modules:
+        start = time.perf_counter()
+        importlib.import_module(module)
+        timings[module] = time.perf_counter() - start
+    return timings
+
+
+# Membaca seluruh file dataset bersama agar halamannya berada di page cache sebelum sesi pertama
+def warm_dataset(path=None):
+    import shared
+    import storage
+
+    path = path or storage.dataset_path()
+    version = storage.dataset_version(path)
+    shared.load_dataset(path, version)
+    shared.remove_old_versions(version)
+    directory = shared.shared_dir(version)
+    size = 0
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name), 'rb') as f:
+            while chunk := f.read(1 << 24):
+                size += len(chunk)
+    return size
+
+
+# Menjalankan script dashboard seperti sesi pertama (rentang tanggal dan bagian default) di proses ini.
+# AppTest adalah satu-satunya cara menjalankan script Streamlit tanpa browser; cache st.cache_resource dan
+# st.cache_data bersifat global per proses sehingga sesi sungguhan setelahnya memakai hasil yang sama.
+def first_paint(script=SCRIPT_PATH, timeout=600):
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    app = AppTest.from_file(script, default_timeout=timeout).run()
+    errors = [str(e.value) for e in app.exception] + [str(e.value) for e in app.error]
+    return time.perf_counter() - start, errors
+
+
+def warm_up(script=SCRIPT_PATH, paint=True):
+    report = {'imports': import_modules(HEAVY_MODULES + DASHBOARD_MODULES)}
+    if config.SHARED_DATASET:
+        start = time.perf_counter()
+        report['dataset_mb'] = warm_dataset() / 1e6
+        report['dataset_seconds'] = time.perf_counter() - start
+    if paint:
+        report['first_paint_seconds'], report['errors'] = first_paint(script)
+        # Rerun dengan cache yang sudah terisi, mendekati waktu halaman pertama bagi pengguna setelah warm-up
+        report['warm_paint_seconds'], _ = first_paint(script)
+    return report
+
+
+def print_report(report, file=sys.stderr):
+    for module, seconds in report['imports'].items():
+        print(f"import {module:22s} {seconds * 1000:8.1f} ms", file=file)
+    print(f"import total {sum(report['imports'].values()) * 1000:19.1f} ms", file=file)
+    if 'dataset_seconds' in report:
+        print(f"dataset bersama ({report['dataset_mb']:.1f} MB) {report['dataset_seconds'] * 1000:8.1f} ms", file=file)
+    if 'first_paint_seconds' in report:
+        print(f"halaman pertama (cache kosong) {report['first_paint_seconds']:8.2f} s", file=file)
+        print(f"halaman pertama (setelah warm-up) {report['warm_paint_seconds']:5.2f} s", file=file)
+        for error in report['errors']:
+            print(f"error: {error}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Warm-up dashboard (impor, dataset dan cache halaman pertama) dengan laporan waktunya"
+    )
+    parser.add_argument('command', nargs='?', choices=['report', 'serve'], default='report',
+                        help="report: hanya warm-up dan laporan waktu; serve: warm-up lalu menjalankan server Streamlit")
+    parser.add_argument('--no-paint', action='store_true', help="Tanpa menjalankan script dashboard")
+    parser.add_argument('--json', default=None, help="Menyimpan hasil pengukuran sebagai JSON")
+    args, streamlit_args = parser.parse_known_args(argv)
+
+    report = warm_up(paint=not args.no_paint)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.command == 'serve':
+        # Argumen lain diteruskan ke `streamlit run`, mis. --server.port 8501
+        from streamlit.web import cli
+
+        sys.argv = ['streamlit', 'run', SCRIPT_PATH, *streamlit_args]
+        sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul dashboard diimpor sebagai modul tingkat atas (seperti saat streamlit dijalankan dari folder dashboard)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dashboard'))
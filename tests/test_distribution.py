@@ -0,0 +1,32 @@
+import numpy as np
+
+import cube
+import model
+import sections
+import storage
+import synthetic
+import time_index
+
+
+def test_exact_distribution_ignores_missing_ids(tmp_path):
+    path = tmp_path / 'orders.parquet'
+    synthetic.generate(5000, str(path), chunk_rows=5000)
+    df = time_index.sort_by_time(storage.read_columns(str(path), storage.BUILD_COLUMNS))
+    rng = np.random.default_rng(0)
+    df.loc[rng.random(len(df)) < 0.1, 'seller_id'] = None
+    df.loc[rng.random(len(df)) < 0.1, 'customer_unique_id'] = None
+
+    encoded = storage.encode_ids(df)[0]
+    daily_cube = cube.build_cube(encoded, model.build_model(encoded))
+    start_date, end_date = df['order_purchase_timestamp'].iloc[[0, -1]].dt.date
+    result = sections.distribution(encoded, None, daily_cube, start_date, end_date, distinct='exact')
+
+    expected = {
+        'sellers_by_city': df.groupby('seller_city', observed=True).seller_id.nunique(),
+        'customers_by_city': df.groupby('customer_city', observed=True).customer_unique_id.nunique(),
+    }
+    for key, counts in expected.items():
+        # Urutan kota dengan jumlah sama tidak ditentukan, sehingga dibandingkan per kota
+        top = result[key]
+        assert top.tolist() == counts.sort_values(ascending=False).head(10).tolist()
+        assert (top == counts[top.index]).all()
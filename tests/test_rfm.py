@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+import rfm
+
+
+def test_quantile_score_gives_tied_values_the_same_score():
+    frequency = np.array([1] * 95 + [2] * 4 + [5])
+    for order in (np.arange(len(frequency)), np.random.default_rng(0).permutation(len(frequency))):
+        scores = rfm.quantile_score(frequency[order])
+        for value in np.unique(frequency):
+            assert len(np.unique(scores[frequency[order] == value])) == 1
+        assert (scores[frequency[order] == 1] == 1).all()
+
+
+def test_quantile_score_matches_rank_quintiles_for_distinct_values():
+    for count in [1, 2, 3, 7, 10, 23, 101]:
+        values = np.random.default_rng(count).permutation(count).astype(float)
+        bins = min(len(rfm.SCORE_LABELS), count)
+        ranks = pd.Series(values).rank(method='first')
+        expected = pd.qcut(ranks, bins, labels=rfm.SCORE_LABELS[-bins:]).to_numpy().astype('int8')
+        assert (rfm.quantile_score(values) == expected).all()
+
+
+def test_one_time_customers_are_not_champions():
+    rfm_df = pd.DataFrame({
+        'customer_id': np.arange(100),
+        'recency': np.arange(100),
+        'frequency': [1] * 90 + [2] * 6 + [3] * 4,
+        'monetary': np.linspace(10.0, 500.0, 100),
+    })
+    scored = rfm.score_rfm(rfm_df)
+    one_time = scored[scored['frequency'] == 1]
+    assert one_time['f_score'].nunique() == 1
+    assert not (one_time['segment'] == 'Champions').any()